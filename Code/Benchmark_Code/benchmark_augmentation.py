@@ -0,0 +1,92 @@
+# benchmark_augmentation.py
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from landmark_utils import LAYOUT_SIZES, HANDS_LAYOUT, POSE_HANDS_LAYOUT
+from augmentation import BatchAugmenter
+
+# --- Configuration ---
+NUM_SAMPLES = 5000
+SEQUENCE_LENGTH = 30
+BATCH_SIZE = 32
+
+
+# --- Original per-sample versions (copied from the trainers) ---
+def legacy_augment_flip(landmarks):
+    flipped_landmarks = landmarks.copy()
+    num_coords = len(flipped_landmarks)
+    if num_coords == 126:
+        for i in range(0, num_coords, 3): flipped_landmarks[i] = 1.0 - flipped_landmarks[i]
+        lh_data, rh_data = flipped_landmarks[:63].copy(), flipped_landmarks[63:].copy()
+        flipped_landmarks[:63], flipped_landmarks[63:] = rh_data, lh_data
+    elif num_coords == 258:
+        pose_coords = 132
+        for i in range(0, pose_coords, 4): flipped_landmarks[i] = 1.0 - flipped_landmarks[i]
+        for i in range(pose_coords, num_coords, 3): flipped_landmarks[i] = 1.0 - flipped_landmarks[i]
+        lh_data = flipped_landmarks[pose_coords:pose_coords+63].copy()
+        rh_data = flipped_landmarks[pose_coords+63:].copy()
+        flipped_landmarks[pose_coords:pose_coords+63] = rh_data
+        flipped_landmarks[pose_coords+63:] = lh_data
+    return flipped_landmarks
+
+def legacy_augment_noise(landmarks, scale=0.003):
+    return landmarks + np.random.normal(0, scale, landmarks.shape)
+
+
+def legacy_training_set(X):
+    """
+    Original + flipped + noisy copy of every sample, stacked like the
+    trainers' load_and_prepare_data + np.array.
+    """
+    samples = []
+    for x in X:
+        samples.extend([x, legacy_augment_flip(x), legacy_augment_noise(x)])
+    return np.array(samples)
+
+
+def batch_epoch(augmenter, X):
+    for start in range(0, len(X), BATCH_SIZE):
+        augmenter(X[start:start + BATCH_SIZE])
+
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-sample augmentation copies vs vectorized batch augmentation.")
+    parser.add_argument('--samples', type=int, default=NUM_SAMPLES)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    cases = [
+        ('static', HANDS_LAYOUT, rng.random((args.samples, LAYOUT_SIZES[HANDS_LAYOUT]))),
+        ('static', POSE_HANDS_LAYOUT, rng.random((args.samples, LAYOUT_SIZES[POSE_HANDS_LAYOUT]))),
+        ('dynamic', POSE_HANDS_LAYOUT, rng.random((args.samples // 10, SEQUENCE_LENGTH, LAYOUT_SIZES[POSE_HANDS_LAYOUT]))),
+    ]
+
+    print(f"{'data':<9}{'layout':<12}{'method':<9}{'samples/s':>12}{'train set MB':>14}")
+    for kind, layout, X in cases:
+        # The flip masks have to reproduce the original per-sample flip exactly
+        if X.ndim == 2:
+            vectorized = BatchAugmenter(X.shape[-1], 'flip=1')(X[:256])
+            assert np.array_equal(vectorized, np.array([legacy_augment_flip(x) for x in X[:256]]))
+
+        start = time.perf_counter()
+        legacy = legacy_training_set(X)
+        legacy_s = time.perf_counter() - start
+        legacy_mb = legacy.nbytes / 1e6
+        del legacy
+
+        augmenter = BatchAugmenter(X.shape[-1], seed=0)
+        start = time.perf_counter()
+        batch_epoch(augmenter, X)
+        batch_s = time.perf_counter() - start
+        # Stored data is the original set; the augmented batch is transient
+        batch_mb = (X.nbytes + X[:BATCH_SIZE].nbytes) / 1e6
+
+        # Legacy produces 3 samples per input; batch mode one per input per epoch
+        print(f"{kind:<9}{layout:<12}{'copies':<9}{3 * len(X) / legacy_s:>12.0f}{legacy_mb:>14.1f}")
+        print(f"{kind:<9}{layout:<12}{'batch':<9}{len(X) / batch_s:>12.0f}{batch_mb:>14.1f}")
@@ -0,0 +1,76 @@
+# benchmark_backends.py
+
+import os
+import sys
+import time
+import argparse
+import cv2
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from landmark_utils import extract_landmarks, HANDS_LAYOUT, POSE_HANDS_LAYOUT
+from landmark_backends import create_backend, HOLISTIC_BACKEND, POSE_HANDS_BACKEND, HANDS_BACKEND
+
+# --- Configuration ---
+NUM_FRAMES = 300
+WARMUP_FRAMES = 10
+
+# (backend, layout it is benchmarked for)
+CASES = [
+    (HOLISTIC_BACKEND, POSE_HANDS_LAYOUT),
+    (POSE_HANDS_BACKEND, POSE_HANDS_LAYOUT),
+    (HANDS_BACKEND, HANDS_LAYOUT),
+]
+
+
+def load_frames(video_path, num_frames):
+    """
+    Reads up to num_frames RGB frames from a video file (or camera index) so
+    every backend is timed on exactly the same images.
+    """
+    cap = cv2.VideoCapture(int(video_path) if video_path.isdigit() else video_path)
+    frames = []
+    while cap.isOpened() and len(frames) < num_frames:
+        ret, frame = cap.read()
+        if not ret: break
+        frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    cap.release()
+    return frames
+
+
+def time_backend(backend_name, layout, frames):
+    """
+    Returns per-frame latencies (ms) of backend.process + extract_landmarks,
+    and the fraction of frames where at least one hand was found.
+    """
+    latencies, hand_frames = [], 0
+    with create_backend(layout, backend_name, min_detection_confidence=0.5, min_tracking_confidence=0.5) as backend:
+        for image in frames[:WARMUP_FRAMES]:
+            backend.process(image)
+        for image in frames:
+            start = time.perf_counter()
+            results = backend.process(image)
+            extract_landmarks(results, layout)
+            latencies.append((time.perf_counter() - start) * 1000)
+            hand_frames += bool(results.left_hand_landmarks or results.right_hand_landmarks)
+    return np.array(latencies), hand_frames / max(len(frames), 1)
+
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-frame CPU latency of each MediaPipe landmark backend.")
+    parser.add_argument('--video', default='0', help="Video file to replay, or a camera index (default: 0).")
+    parser.add_argument('--frames', type=int, default=NUM_FRAMES, help="Number of frames to time per backend.")
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.frames)
+    if not frames:
+        print(f"Error: Could not read any frames from '{args.video}'.")
+        sys.exit(1)
+    print(f"Timing {len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]} per backend (CPU)\n")
+
+    print(f"{'backend':<12}{'layout':<12}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'fps':>8}{'hands found':>14}")
+    for backend_name, layout in CASES:
+        latencies, hand_rate = time_backend(backend_name, layout, frames)
+        print(f"{backend_name:<12}{layout:<12}{latencies.mean():>10.2f}{np.percentile(latencies, 50):>10.2f}"
+              f"{np.percentile(latencies, 95):>10.2f}{1000 / latencies.mean():>8.1f}{hand_rate:>13.0%}")
@@ -0,0 +1,103 @@
+# benchmark_inference.py
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+from tensorflow.keras.models import Sequential, load_model
+from tensorflow.keras.layers import Dense, LSTM, Dropout
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from landmark_utils import LAYOUT_SIZES, HANDS_LAYOUT, POSE_HANDS_LAYOUT
+from inference_engine import KerasEngine, CompiledEngine, TFLiteEngine, convert_to_tflite
+
+# --- Configuration ---
+NUM_CALLS = 300
+WARMUP_CALLS = 20
+SEQUENCE_LENGTH = 30
+NUM_CLASSES = 10
+
+
+# --- Untrained stand-ins with the trainers' architectures ---
+def build_static_model(num_features, num_classes):
+    return Sequential([Dense(128, activation='relu', input_shape=(num_features,)), Dense(64, activation='relu'),
+                       Dense(32, activation='relu'), Dense(num_classes, activation='softmax')])
+
+
+def build_dynamic_model(sequence_length, num_features, num_classes):
+    return Sequential([
+        LSTM(64, return_sequences=True, input_shape=(sequence_length, num_features)), Dropout(0.5),
+        LSTM(128, return_sequences=True), Dropout(0.5),
+        LSTM(64, return_sequences=False), Dropout(0.5),
+        Dense(64, activation='relu'), Dense(32, activation='relu'), Dense(num_classes, activation='softmax')
+    ])
+
+
+class DirectCallEngine(KerasEngine):
+    """
+    Eager model(x) call - no predict overhead, but no graph either.
+    """
+    name = 'direct'
+
+    def predict(self, batch):
+        return self.model(batch, training=False).numpy()
+
+
+def time_engine(engine, samples):
+    """
+    Returns per-call latencies (ms) of engine.predict_one over the samples.
+    """
+    for sample in samples[:WARMUP_CALLS]:
+        engine.predict_one(sample)
+    latencies = []
+    for sample in samples:
+        start = time.perf_counter()
+        engine.predict_one(sample)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(latencies)
+
+
+def benchmark_model(title, model, samples):
+    engines = [KerasEngine(model), DirectCallEngine(model), CompiledEngine(model)]
+    try:
+        engines.append(TFLiteEngine(model_content=convert_to_tflite(model)))
+    except Exception as e:
+        print(f"TFLite conversion failed for the {title} model, skipping it: {e}")
+
+    reference = KerasEngine(model).predict(samples[:WARMUP_CALLS])
+    print(f"\n{title} model, input {tuple(model.input_shape[1:])}, {len(samples)} single-sample calls")
+    print(f"{'engine':<10}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'calls/s':>10}{'speedup':>10}{'max |diff|':>12}")
+    baseline = None
+    for engine in engines:
+        latencies = time_engine(engine, samples)
+        baseline = baseline or latencies.mean()
+        diff = np.abs(np.stack([engine.predict_one(s) for s in samples[:WARMUP_CALLS]]) - reference).max()
+        print(f"{engine.name:<10}{latencies.mean():>10.3f}{np.percentile(latencies, 50):>10.3f}"
+              f"{np.percentile(latencies, 95):>10.3f}{1000 / latencies.mean():>10.0f}"
+              f"{baseline / latencies.mean():>9.1f}x{diff:>12.2e}")
+
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Single-sample inference latency: model.predict vs direct call vs tf.function vs TFLite.")
+    parser.add_argument('--static-model', default=None, help="Trained static .h5 (default: untrained MLP with the trainer's architecture).")
+    parser.add_argument('--dynamic-model', default=None, help="Trained dynamic .h5 (default: untrained LSTM with the trainer's architecture).")
+    parser.add_argument('--calls', type=int, default=NUM_CALLS, help="Timed calls per engine.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    if args.static_model:
+        static_model = load_model(args.static_model, compile=False)
+    else:
+        static_model = build_static_model(LAYOUT_SIZES[HANDS_LAYOUT], NUM_CLASSES)
+    static_samples = rng.standard_normal((args.calls,) + tuple(static_model.input_shape[1:])).astype(np.float32)
+    benchmark_model('Static MLP', static_model, static_samples)
+
+    if args.dynamic_model:
+        dynamic_model = load_model(args.dynamic_model, compile=False)
+    else:
+        dynamic_model = build_dynamic_model(SEQUENCE_LENGTH, LAYOUT_SIZES[POSE_HANDS_LAYOUT], NUM_CLASSES)
+    dynamic_samples = rng.standard_normal((args.calls,) + tuple(dynamic_model.input_shape[1:])).astype(np.float32)
+    benchmark_model('Dynamic LSTM', dynamic_model, dynamic_samples)
@@ -0,0 +1,130 @@
+# benchmark_input_pipeline.py
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from landmark_utils import LAYOUT_SIZES, HANDS_LAYOUT, POSE_HANDS_LAYOUT
+
+# --- Configuration ---
+SAMPLES_PER_CLASS = 200
+NUM_CLASSES = 10
+SEQUENCE_LENGTHS = (20, 40)  # synthetic dynamic samples get a random length in this range
+EPOCHS = 1
+
+
+def write_synthetic_tree(data_path, kind, samples_per_class, seed=0):
+    """
+    Writes a <split>/<action>/*.npy tree shaped like the extractors' output
+    (70/15/15 split). Returns the action names.
+    """
+    rng = np.random.default_rng(seed)
+    actions = [f'action_{i}' for i in range(NUM_CLASSES)]
+    for action in actions:
+        for n in range(samples_per_class):
+            split = 'train' if n < samples_per_class * 0.7 else 'val' if n < samples_per_class * 0.85 else 'test'
+            os.makedirs(os.path.join(data_path, split, action), exist_ok=True)
+            if kind == 'static':
+                features = rng.random(LAYOUT_SIZES[HANDS_LAYOUT])
+            else:
+                features = rng.random((rng.integers(*SEQUENCE_LENGTHS, endpoint=True), LAYOUT_SIZES[POSE_HANDS_LAYOUT]))
+            np.save(os.path.join(data_path, split, action, f'{n}.npy'), features)
+    return actions
+
+
+def augment(x):
+    # Two extra copies per training sample, like the trainers' flip + noise
+    return [x[::-1].copy() if x.ndim == 2 else 1.0 - x, x + np.random.normal(0, 0.003, x.shape)]
+
+
+def run_child(loader, kind, data_path, actions, epochs):
+    """
+    Runs in a fresh process: loads the data with one loader, trains the
+    trainer's architecture and prints one JSON line.
+    """
+    start = time.perf_counter()
+    import tensorflow as tf
+    from tensorflow.keras.utils import to_categorical
+    from feature_store import iter_npy_samples
+    from training_pipeline import SampleIndex, make_dataset, FirstStepTimer, peak_rss_mb
+    from benchmark_inference import build_static_model, build_dynamic_model
+
+    if loader == 'memory':
+        # Same steps as the trainers' load_and_prepare_data + np.array / pad_sequences
+        X, y = {'train': [], 'val': []}, {'train': [], 'val': []}
+        for split, action, _, res in iter_npy_samples(data_path, actions, ['train', 'val']):
+            variants = [res] + augment(res) if split == 'train' else [res]
+            X[split].extend(variants)
+            y[split].extend([actions.index(action)] * len(variants))
+        if kind == 'static':
+            X_train, X_val = np.array(X['train']), np.array(X['val'])
+        else:
+            max_len = max(len(seq) for seq_list in X.values() for seq in seq_list)
+            X_train = tf.keras.preprocessing.sequence.pad_sequences(X['train'], maxlen=max_len, padding='post', dtype='float32')
+            X_val = tf.keras.preprocessing.sequence.pad_sequences(X['val'], maxlen=max_len, padding='post', dtype='float32')
+        train_data, fit_kwargs = X_train, {'y': to_categorical(y['train'], len(actions)), 'batch_size': 32}
+        val_data = (X_val, to_categorical(y['val'], len(actions)))
+    else:
+        indexes = {split: SampleIndex.open(data_path, actions, split) for split in ['train', 'val']}
+        max_len = max(index.max_length() for index in indexes.values())
+        train_data = make_dataset(indexes['train'], len(actions), augment=augment, max_len=max_len)
+        val_data = make_dataset(indexes['val'], len(actions), training=False, max_len=max_len)
+        fit_kwargs = {}
+
+    num_features = LAYOUT_SIZES[HANDS_LAYOUT if kind == 'static' else POSE_HANDS_LAYOUT]
+    if kind == 'static':
+        model = build_static_model(num_features, len(actions))
+    else:
+        model = build_dynamic_model(max_len, num_features, len(actions))
+    model.compile(optimizer='adam', loss='categorical_crossentropy', metrics=['categorical_accuracy'])
+
+    timer = FirstStepTimer(start)
+    fit_start = time.perf_counter()
+    model.fit(train_data, epochs=epochs, validation_data=val_data, callbacks=[timer], verbose=0, **fit_kwargs)
+    print(json.dumps({
+        'loader': loader, 'first_step_s': timer.elapsed,
+        'epoch_s': (time.perf_counter() - fit_start) / epochs, 'peak_rss_mb': peak_rss_mb(),
+    }))
+
+
+def spawn(loader, kind, data_path, actions, epochs):
+    command = [sys.executable, os.path.abspath(__file__), '--child', loader, '--kind', kind,
+               '--data', data_path, '--actions', ','.join(actions), '--epochs', str(epochs)]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trainer input: in-memory lists vs streaming tf.data (time to first step, epoch time, peak RSS).")
+    parser.add_argument('--kind', choices=['static', 'dynamic'], default='dynamic')
+    parser.add_argument('--data', default=None, help="Existing <split>/<action>/*.npy tree (default: synthetic).")
+    parser.add_argument('--actions', default=None, help="Comma-separated action names for --data (default: its train folders).")
+    parser.add_argument('--samples-per-class', type=int, default=SAMPLES_PER_CLASS, help="Size of the synthetic tree.")
+    parser.add_argument('--epochs', type=int, default=EPOCHS)
+    parser.add_argument('--child', choices=['memory', 'streaming'], default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.kind, args.data, args.actions.split(','), args.epochs)
+        sys.exit(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.data:
+            data_path = args.data
+            actions = args.actions.split(',') if args.actions else sorted(os.listdir(os.path.join(args.data, 'train')))
+        else:
+            data_path = tmp
+            actions = write_synthetic_tree(tmp, args.kind, args.samples_per_class)
+        results = [spawn(loader, args.kind, data_path, actions, args.epochs) for loader in ['memory', 'streaming']]
+
+    print(f"\n{args.kind} data, {len(actions)} classes")
+    print(f"{'loader':<11}{'first step s':>14}{'epoch s':>10}{'peak RSS MB':>13}")
+    for stats in results:
+        print(f"{stats['loader']:<11}{stats['first_step_s']:>14.2f}{stats['epoch_s']:>10.2f}{stats['peak_rss_mb']:>13.1f}")
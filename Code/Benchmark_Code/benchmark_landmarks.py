@@ -0,0 +1,75 @@
+# benchmark_landmarks.py
+
+import os
+import sys
+import timeit
+import random
+from types import SimpleNamespace
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from landmark_utils import extract_landmarks, new_landmark_buffer, HANDS_LAYOUT, POSE_HANDS_LAYOUT
+
+# --- Configuration ---
+NUM_CALLS = 20000
+REPEATS = 5
+
+
+# --- Fake MediaPipe results (same attribute shape as a Holistic result) ---
+def fake_landmark_list(num_points):
+    points = [SimpleNamespace(x=random.random(), y=random.random(), z=random.random(), visibility=random.random())
+              for _ in range(num_points)]
+    return SimpleNamespace(landmark=points)
+
+def fake_results(with_left=True, with_right=True):
+    return SimpleNamespace(
+        pose_landmarks=fake_landmark_list(33),
+        left_hand_landmarks=fake_landmark_list(21) if with_left else None,
+        right_hand_landmarks=fake_landmark_list(21) if with_right else None,
+    )
+
+
+# --- Original list-comprehension versions (copied from the scripts before the refactor) ---
+def legacy_extract_landmarks_static(results):
+    lh = np.array([[res.x, res.y, res.z] for res in results.left_hand_landmarks.landmark]).flatten() if results.left_hand_landmarks else np.zeros(21*3)
+    rh = np.array([[res.x, res.y, res.z] for res in results.right_hand_landmarks.landmark]).flatten() if results.right_hand_landmarks else np.zeros(21*3)
+    return np.concatenate([lh, rh])
+
+def legacy_extract_landmarks_dynamic(results):
+    pose = np.array([[res.x, res.y, res.z, res.visibility] for res in results.pose_landmarks.landmark]).flatten() if results.pose_landmarks else np.zeros(33*4)
+    lh = np.array([[res.x, res.y, res.z] for res in results.left_hand_landmarks.landmark]).flatten() if results.left_hand_landmarks else np.zeros(21*3)
+    rh = np.array([[res.x, res.y, res.z] for res in results.right_hand_landmarks.landmark]).flatten() if results.right_hand_landmarks else np.zeros(21*3)
+    return np.concatenate([pose, lh, rh])
+
+
+def per_call_us(fn):
+    """
+    Best-of-REPEATS time per call in microseconds.
+    """
+    return min(timeit.repeat(fn, number=NUM_CALLS, repeat=REPEATS)) / NUM_CALLS * 1e6
+
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    cases = [
+        ("both hands", fake_results()),
+        ("left hand only", fake_results(with_right=False)),
+        ("no hands", fake_results(with_left=False, with_right=False)),
+    ]
+    layouts = [
+        (HANDS_LAYOUT, legacy_extract_landmarks_static),
+        (POSE_HANDS_LAYOUT, legacy_extract_landmarks_dynamic),
+    ]
+
+    print(f"Landmark extraction micro-benchmark ({NUM_CALLS} calls, best of {REPEATS})\n")
+    print(f"{'layout':<12}{'case':<18}{'legacy (us)':>14}{'new (us)':>12}{'reused buf (us)':>18}{'speedup':>10}")
+    for layout, legacy_fn in layouts:
+        buffer = new_landmark_buffer(layout)
+        for case_name, results in cases:
+            # Both versions must produce the same values before we compare speed
+            assert np.allclose(legacy_fn(results), extract_landmarks(results, layout), atol=1e-6)
+
+            legacy_us = per_call_us(lambda: legacy_fn(results))
+            new_us = per_call_us(lambda: extract_landmarks(results, layout))
+            reused_us = per_call_us(lambda: extract_landmarks(results, layout, out=buffer))
+            print(f"{layout:<12}{case_name:<18}{legacy_us:>14.2f}{new_us:>12.2f}{reused_us:>18.2f}{legacy_us / reused_us:>9.2f}x")
@@ -0,0 +1,51 @@
+# benchmark_npy_loading.py
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from feature_store import iter_npy_samples
+from npy_loader import load_npy_tree
+from benchmark_input_pipeline import write_synthetic_tree
+
+# --- Configuration ---
+SAMPLES_PER_CLASS = 300
+WORKER_COUNTS = [1, 4, 8, 16]
+
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sequential np.load loop vs the threaded .npy loader (files/s).")
+    parser.add_argument('--kind', choices=['static', 'dynamic'], default='dynamic')
+    parser.add_argument('--data', default=None, help="Existing <split>/<action>/*.npy tree (default: synthetic).")
+    parser.add_argument('--samples-per-class', type=int, default=SAMPLES_PER_CLASS, help="Size of the synthetic tree.")
+    args = parser.parse_args()
+    print("Note: run on a cold cache (e.g. a fresh network mount) to see the I/O latency the threads hide.")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.data:
+            data_path = args.data
+            actions = sorted(os.listdir(os.path.join(args.data, 'train')))
+        else:
+            data_path = tmp
+            actions = write_synthetic_tree(tmp, args.kind, args.samples_per_class)
+
+        start = time.perf_counter()
+        reference = {(split, action, name): array for split, action, name, array in iter_npy_samples(data_path, actions)}
+        sequential_s = time.perf_counter() - start
+
+        rows = [('sequential', len(reference) / sequential_s)]
+        for workers in WORKER_COUNTS:
+            start = time.perf_counter()
+            samples = load_npy_tree(data_path, actions, workers=workers)
+            rows.append((f'{workers} threads', len(samples) / (time.perf_counter() - start)))
+            assert all(np.array_equal(array, reference[(split, action, name)]) for split, action, name, array in samples)
+
+    print(f"\n{len(reference)} files")
+    print(f"{'loader':<14}{'files/s':>10}{'speed-up':>10}")
+    for name, files_per_s in rows:
+        print(f"{name:<14}{files_per_s:>10.0f}{files_per_s / rows[0][1]:>9.1f}x")
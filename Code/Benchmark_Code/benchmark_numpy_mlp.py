@@ -0,0 +1,125 @@
+# benchmark_numpy_mlp.py
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+import tempfile
+import numpy as np
+
+COMMON_CODE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code')
+sys.path.append(COMMON_CODE)
+
+# --- Configuration ---
+NUM_CALLS = 2000
+WARMUP_CALLS = 50
+NUM_CHECK_SAMPLES = 512
+
+
+def run_child(runtime, model_path, inputs_path, outputs_path, calls):
+    """
+    Runs in a fresh process: imports the runtime, loads the model, times
+    single-sample calls and saves its outputs. Prints one JSON line.
+    """
+    start = time.perf_counter()
+    if runtime == 'keras':
+        from tensorflow.keras.models import load_model
+        model = load_model(model_path, compile=False)
+        predict_one = lambda x: model.predict(x[np.newaxis], verbose=0)[0]
+        predict_batch = lambda batch: model.predict(batch, verbose=0)
+    else:
+        from numpy_mlp import NumpyMLP
+        model = NumpyMLP.load(model_path)
+        predict_one = model.predict_one
+        predict_batch = model.predict
+    startup_s = time.perf_counter() - start
+
+    inputs = np.load(inputs_path)
+    first_call = time.perf_counter()
+    predict_one(inputs[0])
+    first_call_ms = (time.perf_counter() - first_call) * 1000
+    for x in inputs[:WARMUP_CALLS]:
+        predict_one(x)
+    latencies = []
+    for i in range(calls):
+        x = inputs[i % len(inputs)]
+        call_start = time.perf_counter()
+        predict_one(x)
+        latencies.append((time.perf_counter() - call_start) * 1000)
+    np.save(outputs_path, np.asarray(predict_batch(inputs), dtype=np.float32))
+    latencies = np.array(latencies)
+    print(json.dumps({
+        'runtime': runtime, 'startup_s': startup_s, 'first_call_ms': first_call_ms,
+        'mean_ms': float(latencies.mean()), 'p95_ms': float(np.percentile(latencies, 95)),
+        # ru_maxrss is in KB on Linux, bytes on macOS
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024.0 * 1024.0 if sys.platform == 'darwin' else 1024.0),
+        'tensorflow_imported': 'tensorflow' in sys.modules,
+    }))
+
+
+def spawn(runtime, model_path, inputs_path, outputs_path, calls):
+    command = [sys.executable, os.path.abspath(__file__), '--child', runtime, '--model', model_path,
+               '--inputs', inputs_path, '--outputs', outputs_path, '--calls', str(calls)]
+    start = time.perf_counter()
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    stats = json.loads(output.strip().splitlines()[-1])
+    stats['process_s'] = time.perf_counter() - start
+    return stats
+
+
+def build_untrained_model(directory):
+    """
+    Untrained stand-in with the static trainer's architecture, saved as .h5
+    and exported to .npz.
+    """
+    from tensorflow.keras.models import Sequential
+    from tensorflow.keras.layers import Dense
+    from numpy_mlp import export_mlp_npz
+    model = Sequential([Dense(128, activation='relu', input_shape=(126,)), Dense(64, activation='relu'),
+                        Dense(32, activation='relu'), Dense(10, activation='softmax')])
+    h5_path, npz_path = os.path.join(directory, 'static_model.h5'), os.path.join(directory, 'static_model.npz')
+    model.save(h5_path)
+    export_mlp_npz(model, npz_path)
+    return h5_path, npz_path
+
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Static MLP: Keras vs NumPy runtime startup time, peak RSS, latency and output parity.")
+    parser.add_argument('--h5', default=None, help="Trained static .h5 (default: untrained stand-in).")
+    parser.add_argument('--npz', default=None, help="Its NumPy export (numpy_mlp.py); required with --h5.")
+    parser.add_argument('--calls', type=int, default=NUM_CALLS, help="Timed single-sample calls per runtime.")
+    parser.add_argument('--child', choices=['keras', 'numpy'], default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--model', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--inputs', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--outputs', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.model, args.inputs, args.outputs, args.calls)
+        sys.exit(0)
+    if bool(args.h5) != bool(args.npz):
+        parser.error("--h5 and --npz go together")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        h5_path, npz_path = (args.h5, args.npz) if args.h5 else build_untrained_model(tmp)
+        inputs_path = os.path.join(tmp, 'inputs.npy')
+        np.save(inputs_path, np.random.default_rng(0).random((NUM_CHECK_SAMPLES, 126), dtype=np.float32))
+
+        results = {}
+        for runtime, model_path in [('keras', h5_path), ('numpy', npz_path)]:
+            outputs_path = os.path.join(tmp, f'{runtime}_outputs.npy')
+            results[runtime] = spawn(runtime, model_path, inputs_path, outputs_path, args.calls)
+            results[runtime]['outputs'] = np.load(outputs_path)
+
+    print(f"\n{'runtime':<8}{'process s':>11}{'load s':>9}{'1st call ms':>13}{'mean ms':>10}{'p95 ms':>10}{'peak RSS MB':>13}{'TF loaded':>11}")
+    for runtime, stats in results.items():
+        print(f"{runtime:<8}{stats['process_s']:>11.2f}{stats['startup_s']:>9.2f}{stats['first_call_ms']:>13.2f}"
+              f"{stats['mean_ms']:>10.4f}{stats['p95_ms']:>10.4f}{stats['peak_rss_mb']:>13.1f}{str(stats['tensorflow_imported']):>11}")
+    keras_out, numpy_out = results['keras']['outputs'], results['numpy']['outputs']
+    print(f"\nOutputs on {len(keras_out)} samples: max |diff| {np.abs(keras_out - numpy_out).max():.2e}, "
+          f"same class {np.mean(np.argmax(keras_out, 1) == np.argmax(numpy_out, 1)):.1%}, "
+          f"bit-identical {np.mean(np.all(keras_out == numpy_out, axis=1)):.1%}")
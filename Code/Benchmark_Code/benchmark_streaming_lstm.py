@@ -0,0 +1,133 @@
+# benchmark_streaming_lstm.py
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+from tensorflow.keras.models import load_model
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from landmark_utils import LAYOUT_SIZES, POSE_HANDS_LAYOUT
+from feature_store import iter_npy_samples, iter_store_samples
+from inference_engine import CompiledEngine
+from sequence_window import SlidingWindow
+from streaming_lstm import StreamingLSTM
+from benchmark_inference import build_dynamic_model, SEQUENCE_LENGTH, NUM_CLASSES
+
+# --- Configuration ---
+STREAM_COUNTS = [1, 4]
+MAX_SEQUENCES = 50
+
+
+def load_sequences(args, window, num_features):
+    """
+    Returns [(label_index or None, (frames, features) array)] from the test
+    split, or random-walk stand-ins when no data is given.
+    """
+    if args.data or args.store:
+        actions = sorted(d for d in os.listdir(args.actions_path) if os.path.isdir(os.path.join(args.actions_path, d)))
+        label_map = {action: i for i, action in enumerate(actions)}
+        samples = iter_store_samples(args.store, actions, ['test']) if args.store \
+            else iter_npy_samples(args.data, actions, ['test'])
+        return [(label_map[action], np.asarray(seq, dtype=np.float32)) for _, action, _, seq in samples][:args.sequences]
+    rng = np.random.default_rng(0)
+    return [(None, np.cumsum(rng.normal(0, 0.02, (window, num_features)), axis=0).astype(np.float32) + 0.5)
+            for _ in range(args.sequences)]
+
+
+def pad_post(seq, window):
+    # Same as the trainer's pad_sequences(..., padding='post') for one sequence
+    padded = np.zeros((window, seq.shape[1]), dtype=np.float32)
+    padded[:min(len(seq), window)] = seq[:window]
+    return padded
+
+
+def check_sequence_parity(model, sequences, window):
+    """
+    Each recorded sequence on its own (padded like in training): windowed
+    model vs a single streaming state stepped through the same T frames.
+    """
+    windowed = CompiledEngine(model)
+    streaming = StreamingLSTM(model, streams=1)
+    agree, correct_windowed, correct_streaming, labelled, max_diff = 0, 0, 0, 0, 0.0
+    for label, seq in sequences:
+        padded = pad_post(seq, window)
+        expected = windowed.predict_one(padded)
+        streaming.reset()
+        for keypoints in padded:
+            res = streaming.step(keypoints)
+        agree += np.argmax(res) == np.argmax(expected)
+        max_diff = max(max_diff, float(np.abs(res - expected).max()))
+        if label is not None:
+            labelled += 1
+            correct_windowed += np.argmax(expected) == label
+            correct_streaming += np.argmax(res) == label
+    print(f"Per-sequence parity over {len(sequences)} sequences: {agree / len(sequences):.1%} same class, max |diff| {max_diff:.2e}")
+    if labelled:
+        print(f"  accuracy: windowed {correct_windowed / labelled:.1%}, streaming {correct_streaming / labelled:.1%}")
+
+
+def compare_continuous(model, frames, window, stream_counts):
+    """
+    All sequences back to back as one live stream: the windowed detector
+    (SlidingWindow + compiled model every frame) vs StreamingLSTM.
+    """
+    windowed = CompiledEngine(model)
+    sliding = SlidingWindow(window, frames.shape[1])
+    reference, latencies = [], []
+    for keypoints in frames:
+        sliding.append(keypoints)
+        if sliding.is_full():
+            start = time.perf_counter()
+            reference.append(windowed.predict(sliding.view())[0])
+            latencies.append((time.perf_counter() - start) * 1000)
+    reference = np.array(reference)
+    latencies = np.array(latencies[window:] or latencies)
+
+    print(f"\nContinuous stream of {len(frames)} frames, window {window}")
+    print(f"{'mode':<16}{'mean ms':>10}{'p95 ms':>10}{'speedup':>10}{'same class':>12}{'mean |diff|':>13}")
+    print(f"{'windowed':<16}{latencies.mean():>10.3f}{np.percentile(latencies, 95):>10.3f}{1.0:>9.1f}x{1.0:>12.1%}{0.0:>13.2e}")
+    for streams in stream_counts:
+        streaming = StreamingLSTM(model, streams)
+        outputs, step_latencies = [], []
+        for keypoints in frames:
+            start = time.perf_counter()
+            res = streaming.step(keypoints)
+            step_latencies.append((time.perf_counter() - start) * 1000)
+            if streaming.is_ready():
+                outputs.append(res)
+        outputs = np.array(outputs)
+        step_latencies = np.array(step_latencies[window:] or step_latencies)
+        same = np.mean(np.argmax(outputs, axis=1) == np.argmax(reference, axis=1))
+        diff = np.abs(outputs - reference).mean()
+        print(f"{f'streaming x{streaming.streams}':<16}{step_latencies.mean():>10.3f}{np.percentile(step_latencies, 95):>10.3f}"
+              f"{latencies.mean() / step_latencies.mean():>9.1f}x{same:>12.1%}{diff:>13.2e}")
+
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Windowed vs stateful streaming LSTM: parity and per-frame latency.")
+    parser.add_argument('--model', default=None, help="Trained dynamic .h5 (default: untrained stand-in with the trainer's architecture).")
+    parser.add_argument('--data', default=None, help="Processed <split>/<action>/*.npy tree; the test split is replayed.")
+    parser.add_argument('--store', default=None, help="Packed feature store to read the test split from instead of --data.")
+    parser.add_argument('--actions-path', default=None, help="Original dataset folder the trainer listed the actions from (needed with --data/--store).")
+    parser.add_argument('--streams', type=int, nargs='+', default=STREAM_COUNTS, help="Staggered state counts to compare.")
+    parser.add_argument('--sequences', type=int, default=MAX_SEQUENCES, help="Maximum number of test sequences.")
+    args = parser.parse_args()
+    if (args.data or args.store) and not args.actions_path:
+        parser.error("--actions-path is required with --data or --store")
+
+    if args.model:
+        model = load_model(args.model, compile=False)
+    else:
+        model = build_dynamic_model(SEQUENCE_LENGTH, LAYOUT_SIZES[POSE_HANDS_LAYOUT], NUM_CLASSES)
+    window, num_features = model.input_shape[1], model.input_shape[2]
+
+    sequences = load_sequences(args, window, num_features)
+    if not sequences:
+        print("Error: No test sequences found.")
+        sys.exit(1)
+
+    check_sequence_parity(model, sequences, window)
+    compare_continuous(model, np.concatenate([seq for _, seq in sequences]), window, args.streams + [window])
@@ -0,0 +1,121 @@
+# load_generator.py
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import numpy as np
+
+# --- Configuration ---
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+NUM_STREAMS = 8
+STREAM_FPS = 30.0
+DURATION_S = 20.0
+MAX_FILES = 200
+
+
+def load_recordings(data_path, model_name, max_files):
+    """
+    Loads recorded .npy features. Dynamic files are (frames, features)
+    sequences; static files are single (features,) vectors, which are
+    replayed as one long sequence.
+    """
+    arrays = []
+    for root, _, files in os.walk(data_path):
+        for file_name in sorted(files):
+            if file_name.endswith('.npy'):
+                arrays.append(np.load(os.path.join(root, file_name)).astype(np.float32))
+            if len(arrays) >= max_files: break
+        if len(arrays) >= max_files: break
+    if model_name == 'static':
+        return [np.stack([a for a in arrays if a.ndim == 1])] if arrays else []
+    return [a for a in arrays if a.ndim == 2 and len(a)]
+
+
+async def run_stream(stream_id, host, port, model_name, recordings, fps, stop_time, latencies, counts):
+    """
+    One simulated kiosk: sends one frame per request at `fps` (0 = as fast as
+    the server answers), cycling through the recordings from a different start.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    interval = 1.0 / fps if fps > 0 else 0.0
+    recording_index = stream_id % len(recordings)
+    next_send = time.perf_counter()
+    try:
+        while time.perf_counter() < stop_time:
+            frames = recordings[recording_index]
+            recording_index = (recording_index + 1) % len(recordings)
+            for frame in frames:
+                if time.perf_counter() >= stop_time: break
+                if interval:
+                    delay = next_send - time.perf_counter()
+                    if delay > 0: await asyncio.sleep(delay)
+                    next_send += interval
+                request = {'stream': f'stream-{stream_id}', 'model': model_name, 'frame': frame.tolist()}
+                start = time.perf_counter()
+                writer.write((json.dumps(request) + '\n').encode())
+                await writer.drain()
+                response = json.loads(await reader.readline())
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                if 'error' in response:
+                    counts['errors'] += 1
+                elif response.get('ready'):
+                    latencies.append(elapsed_ms)
+                    counts['predictions'] += 1
+                counts['frames'] += 1
+    finally:
+        writer.close()
+
+
+async def fetch_stats(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b'{"type": "stats"}\n')
+    await writer.drain()
+    stats = json.loads(await reader.readline())
+    writer.close()
+    return stats
+
+
+async def main(args, recordings):
+    latencies, counts = [], {'frames': 0, 'predictions': 0, 'errors': 0}
+    start = time.perf_counter()
+    stop_time = start + args.duration
+    await asyncio.gather(*[run_stream(i, args.host, args.port, args.model, recordings, args.fps, stop_time, latencies, counts)
+                           for i in range(args.streams)])
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{args.streams} streams x {args.fps or 'max'} fps for {elapsed:.1f}s ({args.model} model)")
+    print(f"Frames sent: {counts['frames']} ({counts['frames'] / elapsed:.1f}/s), "
+          f"predictions: {counts['predictions']} ({counts['predictions'] / elapsed:.1f}/s), errors: {counts['errors']}")
+    if latencies:
+        latencies = np.array(latencies)
+        print(f"Prediction latency (ms): mean {latencies.mean():.2f}, p50 {np.percentile(latencies, 50):.2f}, "
+              f"p95 {np.percentile(latencies, 95):.2f}, p99 {np.percentile(latencies, 99):.2f}, max {latencies.max():.2f}")
+    stats = await fetch_stats(args.host, args.port)
+    for name, model_stats in stats.get('models', {}).items():
+        print(f"Server {name}: {model_stats['samples']} samples in {model_stats['batches']} batches "
+              f"(mean batch {model_stats['mean_batch']})")
+
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replays recorded .npy features against inference_server.py from many concurrent streams.")
+    parser.add_argument('data', help="Folder of recorded .npy features (searched recursively), e.g. a processed test split.")
+    parser.add_argument('--model', choices=['dynamic', 'static'], default='dynamic')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--streams', type=int, default=NUM_STREAMS, help="Concurrent simulated kiosks.")
+    parser.add_argument('--fps', type=float, default=STREAM_FPS, help="Frames per second per stream (0 = closed loop, as fast as possible).")
+    parser.add_argument('--duration', type=float, default=DURATION_S, help="Seconds to run.")
+    parser.add_argument('--max-files', type=int, default=MAX_FILES, help="Maximum number of .npy files to load.")
+    args = parser.parse_args()
+
+    recordings = load_recordings(args.data, args.model, args.max_files)
+    if not recordings:
+        print(f"Error: No {args.model} .npy recordings found in '{args.data}'.")
+        sys.exit(1)
+    print(f"Loaded {len(recordings)} recording(s), {sum(len(r) for r in recordings)} frames")
+    asyncio.run(main(args, recordings))
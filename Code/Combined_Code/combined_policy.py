@@ -0,0 +1,56 @@
+# combined_policy.py
+
+import numpy as np
+
+from landmark_utils import HAND_SIZE
+
+# --- Selection Policy ---
+# 'motion'     -> hands moving: prefer the dynamic sign, hands still: prefer the static sign
+# 'confidence' -> whichever confident model is more confident
+# 'static' / 'dynamic' -> always prefer that model, fall back to the other
+POLICY_CHOICES = ['motion', 'confidence', 'static', 'dynamic']
+SELECTION_POLICY = 'motion'
+CONFIDENCE_THRESHOLD = 0.8
+# Smoothed mean per-coordinate hand movement (normalized units per frame) that counts as "moving"
+HAND_MOTION_THRESHOLD = 0.004
+MOTION_SMOOTHING = 0.3
+
+
+def confident(res):
+    return res is not None and np.max(res) > CONFIDENCE_THRESHOLD
+
+
+def choose_prediction(policy, static_res, dynamic_res, hand_motion):
+    """
+    Returns ('static' | 'dynamic' | None, probabilities) for display. A model
+    is only eligible when its top class clears CONFIDENCE_THRESHOLD.
+    """
+    candidates = {name: res for name, res in (('static', static_res), ('dynamic', dynamic_res)) if confident(res)}
+    if not candidates:
+        return None, None
+    if len(candidates) == 1:
+        return next(iter(candidates.items()))
+    if policy == 'confidence':
+        name = max(candidates, key=lambda n: np.max(candidates[n]))
+    elif policy == 'motion':
+        name = 'dynamic' if hand_motion > HAND_MOTION_THRESHOLD else 'static'
+    else:
+        name = policy
+    return name, candidates[name]
+
+
+def update_hand_motion(hand_motion, keypoints, previous, present, previous_present):
+    """
+    Smoothed hand motion after one frame. keypoints / previous are hands-layout
+    vectors (left hand, then right hand); present / previous_present say which
+    of the two hands was detected. Only hands visible in both frames count, so
+    a hand appearing or disappearing (its coordinates jumping to or from
+    zero) is not motion. Motion resets to 0 once no hand is visible.
+    """
+    both = np.repeat(np.logical_and(present, previous_present), HAND_SIZE)
+    if both.any():
+        step_motion = float(np.mean(np.abs(keypoints[both] - previous[both])))
+        return hand_motion + MOTION_SMOOTHING * (step_motion - hand_motion)
+    if not np.any(present):
+        return 0.0
+    return hand_motion
@@ -0,0 +1,215 @@
+# combined_real_time_detector.py
+
+import cv2
+import numpy as np
+import os
+import sys
+import argparse
+import mediapipe as mp
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from landmark_utils import extract_landmarks, new_landmark_buffer, layout_for_size, LAYOUT_SIZES, HANDS_LAYOUT
+from latency_profiler import LatencyProfiler, COMBINED_DETECTOR_STAGES
+from inference_engine import ENGINE_CHOICES
+from model_bundle import load_model_and_labels, dynamic_window
+from landmark_backends import HOLISTIC_BACKEND
+from inference_scheduler import InferenceScheduler
+from sequence_window import SlidingWindow
+from sequence_batching import resample_sequence
+from camera_capture import LatestFrameCapture
+from startup import StartupTimeline, run_startup, warm_up_engine, warm_up_holistic
+from combined_policy import choose_prediction, update_hand_motion, POLICY_CHOICES, SELECTION_POLICY
+
+# --- Configuration ---
+MODEL_PATH = "models"
+# Written by the trainers; they carry their own label lists, so the dataset folders are only needed for bare model files
+STATIC_MODEL_BUNDLE = os.path.join(MODEL_PATH, 'static_model_final.bundle')
+DYNAMIC_MODEL_BUNDLE = os.path.join(MODEL_PATH, 'dynamic_model_final.bundle')
+ORIGINAL_STATIC_PATH = "Static_Data"
+ORIGINAL_DYNAMIC_PATH = "Dynamic_Data"
+INFERENCE_ENGINE = 'compiled'
+PREDICTION_STRIDE = 2
+STATIC_MOTION_THRESHOLD = 0.01
+# (the static / dynamic selection policy lives in combined_policy.py)
+
+
+# --- Main Program ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Real-time static + dynamic sign detection from one Holistic pass.")
+    parser.add_argument('--static-model', default=STATIC_MODEL_BUNDLE if os.path.isdir(STATIC_MODEL_BUNDLE) else os.path.join(MODEL_PATH, 'static_model_final.h5'),
+                        help="Static hands-only model: a model bundle, the trained .h5 or an exported .tflite.")
+    parser.add_argument('--dynamic-model', default=DYNAMIC_MODEL_BUNDLE if os.path.isdir(DYNAMIC_MODEL_BUNDLE) else os.path.join(MODEL_PATH, 'dynamic_model.h5'),
+                        help="Dynamic model: a model bundle, the trained .h5 or an exported .tflite.")
+    parser.add_argument('--policy', choices=POLICY_CHOICES, default=SELECTION_POLICY, help="How to choose between the two models.")
+    parser.add_argument('--engine', choices=ENGINE_CHOICES, default=INFERENCE_ENGINE,
+                        help="Inference engine (a '.tflite' model path always uses the TFLite interpreter).")
+    parser.add_argument('--no-hand-gating', action='store_true', help="Run the models even when no hand is visible.")
+    parser.add_argument('--stride', type=int, default=PREDICTION_STRIDE, help="Run the dynamic model every N frames.")
+    parser.add_argument('--direct-capture', action='store_true',
+                        help="Read the camera in the processing loop instead of a latest-frame capture thread.")
+    parser.add_argument('--sequential-startup', action='store_true',
+                        help="Load the models, Holistic and the camera one after another instead of in parallel.")
+    parser.add_argument('--no-warmup', action='store_true', help="Skip the warm-up inference before the loop.")
+    parser.add_argument('--startup-report', default=None, help="Write the startup timeline to this JSON file.")
+    parser.add_argument('--overlay', action='store_true', help="Show rolling per-stage latency on the video.")
+    parser.add_argument('--report', default=None, help="Also write the latency report to <REPORT>.json and <REPORT>.csv.")
+    args = parser.parse_args()
+
+    mp_holistic = mp.solutions.holistic
+    mp_drawing = mp.solutions.drawing_utils
+
+    # --- Startup: both models, Holistic and the camera load in parallel, each warmed up ---
+    timeline = StartupTimeline()
+
+    def model_loader(name, model_path, actions_path):
+        def load():
+            model, labels, manifest = load_model_and_labels(model_path, args.engine, actions_path, HOLISTIC_BACKEND)
+            # The static vector is cut from the same Holistic result as the hands layout
+            if name == 'static' and tuple(model.input_shape[1:]) != (LAYOUT_SIZES[HANDS_LAYOUT],):
+                raise ValueError(f"static model expects input {tuple(model.input_shape[1:])}, this detector extracts {LAYOUT_SIZES[HANDS_LAYOUT]} hand features")
+            if name == 'dynamic' and len(model.input_shape) != 3:
+                raise ValueError(f"dynamic model expects input {tuple(model.input_shape[1:])}, not a (frames, features) window")
+            if not args.no_warmup:
+                with timeline.phase(f'{name} warm-up'):
+                    warm_up_engine(model)
+            return model, labels, manifest
+        return load
+
+    def create_holistic():
+        holistic = mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5)
+        if not args.no_warmup:
+            with timeline.phase('holistic warm-up'):
+                warm_up_holistic(holistic)
+        return holistic
+
+    def open_camera():
+        return LatestFrameCapture(0, threaded=not args.direct_capture)
+
+    try:
+        started = run_startup([('static model', model_loader('static', args.static_model, ORIGINAL_STATIC_PATH)),
+                               ('dynamic model', model_loader('dynamic', args.dynamic_model, ORIGINAL_DYNAMIC_PATH)),
+                               ('holistic', create_holistic), ('camera', open_camera)],
+                              timeline, parallel=not args.sequential_startup, main_thread=['camera'])
+        static_model, static_labels, _ = started['static model']
+        dynamic_model, dynamic_labels, dynamic_manifest = started['dynamic model']
+        STATIC_ACTIONS = np.array(static_labels)
+        DYNAMIC_ACTIONS = np.array(dynamic_labels)
+        dynamic_layout = layout_for_size(dynamic_model.input_shape[2])
+        # A model trained on resampled sequences sees each window resampled to its input length
+        dynamic_sequence_length, resample_length = dynamic_window(dynamic_model, dynamic_manifest)
+        print(f"Static actions: {STATIC_ACTIONS}")
+        print(f"Dynamic actions: {DYNAMIC_ACTIONS} ({dynamic_layout} features, {dynamic_sequence_length} frames"
+              + (f" resampled to {resample_length})" if resample_length is not None else ")"))
+    except Exception as e:
+        print(f"\nError: Startup failed. Reason: {e}")
+        print(f"Please ensure both models are in the '{MODEL_PATH}' directory. Exiting.")
+        exit()
+
+    # --- Initialize Real-time Variables ---
+    # One Holistic result feeds both models: the static vector is the hands
+    # part, the dynamic window gets the model's own layout.
+    static_keypoints = new_landmark_buffer(HANDS_LAYOUT)
+    previous_hands = new_landmark_buffer(HANDS_LAYOUT)
+    hands_seen = np.zeros(2, dtype=bool)           # left, right hand detected this frame
+    previous_hands_seen = np.zeros(2, dtype=bool)
+    dynamic_keypoints = new_landmark_buffer(dynamic_layout)
+    sequence = SlidingWindow(dynamic_sequence_length, LAYOUT_SIZES[dynamic_layout])
+    static_scheduler = InferenceScheduler(hand_gating=not args.no_hand_gating, motion_threshold=STATIC_MOTION_THRESHOLD)
+    dynamic_scheduler = InferenceScheduler(hand_gating=not args.no_hand_gating, hand_memory=dynamic_sequence_length, stride=args.stride)
+    hand_motion = 0.0
+    prediction_text = "..."
+
+    # --- Start Real-time Detection Loop ---
+    cap = started['camera']
+    camera_fps = cap.get(cv2.CAP_PROP_FPS)
+    # Always on here: the per-model latency report is part of this detector's output
+    profiler = LatencyProfiler(COMBINED_DETECTOR_STAGES,
+                               frame_interval_ms=1000.0 / camera_fps if args.direct_capture and camera_fps > 0 else None)
+    with started['holistic'] as holistic:
+        while cap.isOpened():
+            profiler.start_frame()
+            with profiler.stage('capture'):
+                ret, frame = cap.read()
+            if not ret:
+                profiler.count_dropped()
+                break
+            profiler.count_dropped(cap.take_dropped())
+            timeline.mark('first frame')
+
+            with profiler.stage('convert'):
+                image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            with profiler.stage('holistic'):
+                results = holistic.process(image)
+            with profiler.stage('convert'):
+                image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
+
+            with profiler.stage('draw'):
+                mp_drawing.draw_landmarks(image, results.pose_landmarks, mp_holistic.POSE_CONNECTIONS)
+                mp_drawing.draw_landmarks(image, results.left_hand_landmarks, mp_holistic.HAND_CONNECTIONS)
+                mp_drawing.draw_landmarks(image, results.right_hand_landmarks, mp_holistic.HAND_CONNECTIONS)
+
+            # --- Shared Landmark Extraction ---
+            previous_hands_seen[:] = hands_seen
+            hands_seen[:] = (results.left_hand_landmarks is not None, results.right_hand_landmarks is not None)
+            hands_present = bool(hands_seen.any())
+            with profiler.stage('extract'):
+                previous_hands[:] = static_keypoints
+                static_keypoints = extract_landmarks(results, HANDS_LAYOUT, out=static_keypoints)
+                dynamic_keypoints = extract_landmarks(results, dynamic_layout, out=dynamic_keypoints)
+                sequence.append(dynamic_keypoints)
+                # Only hands visible in this frame and the last one move; one appearing or vanishing does not
+                hand_motion = update_hand_motion(hand_motion, static_keypoints, previous_hands, hands_seen, previous_hands_seen)
+            dynamic_scheduler.observe(hands_present)
+
+            # --- Both Models ---
+            if static_scheduler.step(hands_present, static_keypoints):
+                with profiler.stage('static'):
+                    static_scheduler.record(static_model.predict_one(static_keypoints))
+            if sequence.is_full() and dynamic_scheduler.step():
+                with profiler.stage('dynamic'):
+                    window = sequence.view()
+                    if resample_length is not None:
+                        window = resample_sequence(window, resample_length)
+                    dynamic_scheduler.record(dynamic_model.predict(window)[0])
+            dynamic_res = dynamic_scheduler.result if sequence.is_full() else None
+
+            if static_scheduler.result is not None or dynamic_res is not None:
+                timeline.mark('first prediction')
+
+            source, res = choose_prediction(args.policy, static_scheduler.result, dynamic_res, hand_motion)
+            if source == 'static':
+                prediction_text = f"{STATIC_ACTIONS[np.argmax(res)]} (static)"
+            elif source == 'dynamic':
+                prediction_text = f"{DYNAMIC_ACTIONS[np.argmax(res)]} (dynamic)"
+            else:
+                prediction_text = "..."
+
+            # Display the result
+            with profiler.stage('draw'):
+                (text_width, text_height), baseline = cv2.getTextSize(prediction_text, cv2.FONT_HERSHEY_SIMPLEX, 1, 2)
+                cv2.rectangle(image, (0, 0), (text_width + 20, text_height + 20), (0, 0, 0), -1)
+                cv2.putText(image, prediction_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2, cv2.LINE_AA)
+                if args.overlay:
+                    profiler.draw_overlay(image)
+
+            with profiler.stage('display'):
+                cv2.imshow('Combined Sign Language Detection', image)
+                key = cv2.waitKey(10)
+            profiler.end_frame()
+
+            if key & 0xFF == ord('q'):
+                break
+
+        cap.release()
+        cv2.destroyAllWindows()
+        cap.print_stats()
+        static_scheduler.print_stats('Static model')
+        dynamic_scheduler.print_stats('Dynamic model')
+        timeline.print_timeline()
+        if args.startup_report:
+            timeline.save(args.startup_report)
+
+    profiler.print_summary()
+    if args.report:
+        profiler.save_report(args.report)
+        print(f"Latency report saved to '{args.report}.json' and '{args.report}.csv'")
@@ -0,0 +1,110 @@
+# augmentation.py
+
+import numpy as np
+
+from landmark_utils import LAYOUT_SIZES, HANDS_LAYOUT, POSE_HANDS_LAYOUT, POSE_SIZE, HAND_SIZE, layout_for_size
+
+# --- Configuration ---
+NOISE_SCALE = 0.003
+# Each sample gets at most one transform; the rest stay as they are. 1/3 flip + 1/3 noise
+# keeps the mix of the old "original + flipped copy + noisy copy" training set.
+DEFAULT_POLICY = 'flip=0.33,noise=0.33'
+
+
+# --- Index Masks (computed once per layout) ---
+def _flip_indices(layout):
+    """
+    Returns (permutation, x_columns) for a horizontal mirror: the left and
+    right hand blocks swap places and every x coordinate becomes 1 - x.
+    Same result as the trainers' original augment_flip.
+    """
+    size = LAYOUT_SIZES[layout]
+    permutation = np.arange(size)
+    if layout == HANDS_LAYOUT:
+        hands_start, x_columns = 0, np.arange(0, size, 3)
+    elif layout == POSE_HANDS_LAYOUT:
+        hands_start = POSE_SIZE
+        x_columns = np.concatenate([np.arange(0, POSE_SIZE, 4), np.arange(POSE_SIZE, size, 3)])
+    else:
+        raise ValueError(f"No flip defined for layout '{layout}'")
+    left = np.arange(hands_start, hands_start + HAND_SIZE)
+    permutation[left], permutation[left + HAND_SIZE] = left + HAND_SIZE, left
+    return permutation, x_columns
+
+
+FLIP_INDICES = {layout: _flip_indices(layout) for layout in (HANDS_LAYOUT, POSE_HANDS_LAYOUT)}
+
+
+def parse_policy(policy):
+    """
+    'flip=0.33,noise=0.33' -> {'flip': 0.33, 'noise': 0.33}. An empty string
+    or 'none' disables augmentation.
+    """
+    if not policy or policy == 'none':
+        return {}
+    parsed = {}
+    for item in policy.split(','):
+        name, _, probability = item.partition('=')
+        name = name.strip()
+        if name not in TRANSFORMS:
+            raise ValueError(f"Unknown augmentation '{name}' (known: {', '.join(TRANSFORMS)})")
+        parsed[name] = float(probability) if probability else 1.0
+    if sum(parsed.values()) > 1.0 + 1e-9:
+        raise ValueError(f"Augmentation probabilities in '{policy}' add up to more than 1")
+    return parsed
+
+
+# --- Transforms: rows of a (N, F) or (N, T, F) batch, in place ---
+def flip_rows(augmenter, X):
+    permutation, x_columns = FLIP_INDICES[augmenter.layout]
+    X[:] = X[..., permutation]
+    X[..., x_columns] = 1.0 - X[..., x_columns]
+
+
+def noise_rows(augmenter, X):
+    X += augmenter.rng.normal(0.0, augmenter.noise_scale, X.shape).astype(X.dtype)
+
+
+TRANSFORMS = {'flip': flip_rows, 'noise': noise_rows}
+
+
+class BatchAugmenter:
+    """
+    Augments whole batches at once, so training can draw fresh augmented
+    samples every step instead of storing flipped / noisy copies. Each row
+    gets at most one transform from the policy, picked at random with the
+    policy's probabilities.
+
+    For sequences, all-zero frames (padding) are left untouched.
+
+        augmenter = BatchAugmenter(126)
+        X_batch = augmenter(X_batch)  # new array, input unchanged
+    """
+
+    def __init__(self, num_features, policy=DEFAULT_POLICY, noise_scale=NOISE_SCALE, seed=None):
+        self.layout = layout_for_size(num_features)
+        self.policy = parse_policy(policy) if isinstance(policy, str) else dict(policy)
+        if 'flip' in self.policy and self.layout not in FLIP_INDICES:
+            raise ValueError(f"No flip defined for layout '{self.layout}'")
+        self.noise_scale = noise_scale
+        self.rng = np.random.default_rng(seed)
+        self.names = list(self.policy)
+        self.thresholds = np.cumsum([self.policy[name] for name in self.names])
+
+    def __call__(self, X):
+        out = np.array(X, copy=True)
+        if not self.names or not len(out):
+            return out
+        choice = np.searchsorted(self.thresholds, self.rng.random(len(out)), side='right')
+        for t, name in enumerate(self.names):
+            rows = np.flatnonzero(choice == t)
+            if not len(rows):
+                continue
+            selected = out[rows]
+            TRANSFORMS[name](self, selected)
+            if out.ndim == 3:
+                # Keep padding frames at zero
+                padding = ~np.any(out[rows] != 0, axis=-1)
+                selected[padding] = 0.0
+            out[rows] = selected
+        return out
@@ -0,0 +1,113 @@
+# camera_capture.py
+
+import threading
+import cv2
+
+
+class LatestFrameCapture:
+    """
+    Drop-in replacement for cv2.VideoCapture in the real-time loops
+    (isOpened / read / get / release).
+
+    With threaded=True a background thread keeps reading the camera and only
+    the newest frame is kept, so read() never returns a frame that queued up
+    in the driver while the loop was busy with Holistic or the model. Frames
+    that were overwritten before the loop asked for them are counted in
+    dropped_frames. With threaded=False it reads synchronously, like
+    cv2.VideoCapture.
+    """
+
+    def __init__(self, source=0, threaded=True):
+        self._cap = cv2.VideoCapture(source)
+        self.threaded = threaded
+        self.frames_captured = 0
+        self.frames_read = 0
+        self.dropped_frames = 0
+        self._dropped_reported = 0
+        self._frame = None
+        self._frame_id = 0
+        self._last_read_id = 0
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._thread = None
+        if not self._cap.isOpened():
+            # Nothing will ever be read, so isOpened() must report it in threaded mode too
+            self._stopped = True
+        elif threaded:
+            self._thread = threading.Thread(target=self._capture_loop, name='camera-capture', daemon=True)
+            self._thread.start()
+
+    # --- Capture thread ---
+    def _capture_loop(self):
+        while True:
+            ret, frame = self._cap.read()
+            with self._condition:
+                if self._stopped:
+                    return
+                if not ret:
+                    self._stopped = True
+                    self._condition.notify_all()
+                    return
+                # The previous frame was never handed out: it is stale now
+                if self._frame_id > self._last_read_id:
+                    self.dropped_frames += 1
+                self._frame = frame
+                self._frame_id += 1
+                self.frames_captured += 1
+                self._condition.notify_all()
+
+    # --- cv2.VideoCapture interface ---
+    def isOpened(self):
+        if not self.threaded:
+            return self._cap.isOpened()
+        with self._condition:
+            return not self._stopped or self._frame_id > self._last_read_id
+
+    def read(self, poll_interval=1.0):
+        """
+        Returns (True, newest_frame), waiting for a frame that has not been
+        returned before. A slow frame is not the end of the stream: the wait
+        goes on while the capture thread is alive (checked every
+        poll_interval seconds). Returns (False, None) once it has stopped.
+        """
+        if not self.threaded:
+            ret, frame = self._cap.read()
+            if ret:
+                self.frames_captured += 1
+                self.frames_read += 1
+            return ret, frame
+        with self._condition:
+            while not self._condition.wait_for(lambda: self._frame_id > self._last_read_id or self._stopped, poll_interval):
+                if not self._thread.is_alive():
+                    self._stopped = True
+            if self._frame_id == self._last_read_id:
+                return False, None
+            self._last_read_id = self._frame_id
+            self.frames_read += 1
+            return True, self._frame
+
+    def get(self, prop_id):
+        return self._cap.get(prop_id)
+
+    def release(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        # Let the capture thread finish its current cap.read() before releasing
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        self._cap.release()
+
+    # --- Stats ---
+    def take_dropped(self):
+        """
+        Returns the frames dropped since the previous call.
+        """
+        with self._condition:
+            dropped = self.dropped_frames - self._dropped_reported
+            self._dropped_reported = self.dropped_frames
+        return dropped
+
+    def print_stats(self):
+        print(f"Camera: {self.frames_captured} frames captured, {self.frames_read} processed, "
+              f"{self.dropped_frames} stale frames dropped")
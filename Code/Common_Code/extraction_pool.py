@@ -0,0 +1,128 @@
+# extraction_pool.py
+
+import os
+import multiprocessing
+import multiprocessing.util
+import cv2
+import numpy as np
+
+from landmark_utils import extract_landmarks, new_landmark_buffer, HANDS_LAYOUT
+from landmark_backends import create_backend, HOLISTIC_BACKEND
+
+# --- Configuration ---
+# Images handed to a worker at a time. Small enough for even load balancing,
+# large enough that the pool's pickling overhead stays negligible.
+DEFAULT_CHUNK_SIZE = 64
+
+# One landmark backend (e.g. Holistic) per worker process, created once by _init_worker
+_worker_holistic = None
+
+
+def extract_image_file(holistic, image_path, npy_path, layout=HANDS_LAYOUT, out=None):
+    """
+    Runs Holistic on one image file and returns its feature vector, also
+    saving it to npy_path unless npy_path is None. Returns None if the image
+    could not be read.
+    """
+    frame = cv2.imread(image_path)
+    if frame is None:
+        return None
+    image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    results = holistic.process(image_rgb)
+    keypoints = extract_landmarks(results, layout, out=out)
+    if npy_path is not None:
+        np.save(npy_path, keypoints)
+    return keypoints
+
+
+# --- Serial Mode ---
+def extract_images_serial(jobs, holistic_kwargs, layout=HANDS_LAYOUT, backend=HOLISTIC_BACKEND, report_every=500):
+    """
+    Processes every (image_path, npy_path) job in this process with a single
+    landmark backend instance (see landmark_backends.py). Returns (processed_count, failed_paths, features), where
+    features maps image_path -> vector for jobs whose npy_path is None.
+    """
+    processed, failed, features = 0, [], {}
+    buffer = new_landmark_buffer(layout)
+    with create_backend(layout, backend, **holistic_kwargs) as holistic:
+        for done, (image_path, npy_path) in enumerate(jobs, start=1):
+            keypoints = extract_image_file(holistic, image_path, npy_path, layout, out=buffer)
+            if keypoints is None:
+                failed.append(image_path)
+                continue
+            processed += 1
+            if npy_path is None:
+                features[image_path] = keypoints.copy()
+            if done % report_every == 0:
+                print(f"  Processed {done}/{len(jobs)} images")
+    return processed, failed, features
+
+
+# --- Worker-Pool Mode ---
+def _init_worker(holistic_kwargs, layout, backend):
+    global _worker_holistic
+    _worker_holistic = create_backend(layout, backend, **holistic_kwargs)
+    # Pool workers leave through os._exit, which skips atexit; multiprocessing
+    # finalizers still run when the worker shuts down cleanly (pool.close + join)
+    multiprocessing.util.Finalize(None, _close_worker, exitpriority=10)
+
+
+def _close_worker():
+    global _worker_holistic
+    if _worker_holistic is not None:
+        _worker_holistic.close()
+        _worker_holistic = None
+
+
+def _process_chunk(task):
+    chunk, layout = task
+    buffer = new_landmark_buffer(layout)
+    processed, failed, features = 0, [], {}
+    for image_path, npy_path in chunk:
+        keypoints = extract_image_file(_worker_holistic, image_path, npy_path, layout, out=buffer)
+        if keypoints is None:
+            failed.append(image_path)
+            continue
+        processed += 1
+        if npy_path is None:
+            features[image_path] = keypoints.copy()
+    return os.getpid(), processed, failed, features
+
+
+def extract_images_parallel(jobs, workers, holistic_kwargs, layout=HANDS_LAYOUT, backend=HOLISTIC_BACKEND, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Spreads the (image_path, npy_path) jobs over a pool of worker processes.
+    Each worker creates its own landmark backend once, handles chunks of the
+    job list and closes the backend when the pool shuts down. Returns the same (processed_count, failed_paths, features)
+    as extract_images_serial.
+    """
+    tasks = [(jobs[i:i + chunk_size], layout) for i in range(0, len(jobs), chunk_size)]
+    worker_ids, worker_counts = {}, {}
+    processed, failed, features = 0, [], {}
+
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(holistic_kwargs, layout, backend)) as pool:
+        for pid, chunk_processed, chunk_failed, chunk_features in pool.imap_unordered(_process_chunk, tasks):
+            worker = worker_ids.setdefault(pid, len(worker_ids) + 1)
+            worker_counts[worker] = worker_counts.get(worker, 0) + chunk_processed
+            processed += chunk_processed
+            failed.extend(chunk_failed)
+            features.update(chunk_features)
+            print(f"  [worker {worker}] +{chunk_processed} images "
+                  f"(worker total {worker_counts[worker]}, overall {processed + len(failed)}/{len(jobs)})")
+        # Let the workers exit on their own so they release their MediaPipe graphs
+        # (leaving the with block alone would terminate them)
+        pool.close()
+        pool.join()
+
+    for worker in sorted(worker_counts):
+        print(f"  Worker {worker} processed {worker_counts[worker]} images.")
+    return processed, failed, features
+
+
+def extract_images(jobs, workers, holistic_kwargs, layout=HANDS_LAYOUT, backend=HOLISTIC_BACKEND):
+    """
+    Runs the serial path for workers <= 1, the worker pool otherwise.
+    """
+    if workers <= 1:
+        return extract_images_serial(jobs, holistic_kwargs, layout, backend)
+    return extract_images_parallel(jobs, workers, holistic_kwargs, layout, backend)
@@ -0,0 +1,250 @@
+# feature_store.py
+
+import os
+import sys
+import argparse
+import numpy as np
+
+# --- Packed Feature Store Layout ---
+# One store directory holds, per split ('train', 'val', 'test'):
+#   <split>.features.f32  -> every frame of every sample back to back, raw float32, shape (num_rows, num_features)
+#   <split>.index.npz     -> labels, source file names, row offsets and lengths (1 for static samples)
+# A sample is features[offset:offset + length], a zero-copy slice of the memory map.
+SPLITS = ['train', 'val', 'test']
+FEATURES_SUFFIX = '.features.f32'
+INDEX_SUFFIX = '.index.npz'
+STORE_VERSION = 1
+
+
+def _split_paths(store_path, split):
+    return (os.path.join(store_path, split + FEATURES_SUFFIX),
+            os.path.join(store_path, split + INDEX_SUFFIX))
+
+
+def has_split(store_path, split):
+    return all(os.path.exists(p) for p in _split_paths(store_path, split))
+
+
+# --- Landmark Backend Record ---
+# A feature tree or store names the MediaPipe backend that produced it in
+# <data_path>/landmark_backend.txt. Data without the file predates the
+# pluggable backends and came from Holistic.
+BACKEND_FILE = 'landmark_backend.txt'
+LEGACY_BACKEND = 'holistic'
+
+
+def _has_features(data_path):
+    for _, _, file_names in os.walk(data_path):
+        if any(name != BACKEND_FILE for name in file_names):
+            return True
+    return False
+
+
+def read_backend(data_path):
+    """
+    Backend name recorded for a feature tree or store ('holistic' if none).
+    """
+    path = os.path.join(data_path, BACKEND_FILE)
+    if not os.path.isfile(path):
+        return LEGACY_BACKEND
+    with open(path) as f:
+        return f.read().strip()
+
+
+def record_backend(data_path, backend):
+    """
+    Records which backend writes into a feature tree or store. Raises
+    ValueError instead of mixing its features with another backend's.
+    """
+    if os.path.isdir(data_path) and _has_features(data_path):
+        existing = read_backend(data_path)
+        if existing != backend:
+            raise ValueError(f"'{data_path}' already holds '{existing}' features; "
+                             f"write '{backend}' features to another directory")
+    os.makedirs(data_path, exist_ok=True)
+    with open(os.path.join(data_path, BACKEND_FILE), 'w') as f:
+        f.write(backend + '\n')
+
+
+# --- Writer ---
+class FeatureStoreWriter:
+    """
+    Appends samples for one split to a packed store. Static samples are 1-D
+    (num_features,), dynamic samples are 2-D (num_frames, num_features).
+    Call close() (or use 'with') to write the index.
+    """
+
+    def __init__(self, store_path, split):
+        os.makedirs(store_path, exist_ok=True)
+        self.features_path, self.index_path = _split_paths(store_path, split)
+        self._file = open(self.features_path, 'wb')
+        self.num_features = None
+        self.num_rows = 0
+        self.labels, self.sources, self.offsets, self.lengths = [], [], [], []
+        self.is_sequence = None
+
+    def append(self, features, label, source):
+        features = np.asarray(features, dtype=np.float32)
+        if features.ndim == 1 and features.size:
+            rows, is_sequence = features[np.newaxis], False
+        elif features.size:
+            rows, is_sequence = features.reshape(-1, features.shape[-1]), True
+        else:
+            rows, is_sequence = None, True  # video with no decodable frames
+
+        if rows is not None:
+            if self.num_features is None:
+                self.num_features = rows.shape[1]
+            elif rows.shape[1] != self.num_features:
+                raise ValueError(f"'{source}' has {rows.shape[1]} features, store expects {self.num_features}")
+            self._file.write(np.ascontiguousarray(rows).tobytes())
+        if self.is_sequence is None:
+            self.is_sequence = is_sequence
+
+        length = 0 if rows is None else rows.shape[0]
+        self.labels.append(label)
+        self.sources.append(source)
+        self.offsets.append(self.num_rows)
+        self.lengths.append(length)
+        self.num_rows += length
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._file.close()
+        np.savez(self.index_path,
+                 version=STORE_VERSION,
+                 num_features=self.num_features or 0,
+                 num_rows=self.num_rows,
+                 is_sequence=bool(self.is_sequence),
+                 labels=np.array(self.labels, dtype=str),
+                 sources=np.array(self.sources, dtype=str),
+                 offsets=np.array(self.offsets, dtype=np.int64),
+                 lengths=np.array(self.lengths, dtype=np.int64))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# --- Reader ---
+class FeatureStore:
+    """
+    Read-only view of one split of a packed store. 'features' is a float32
+    memory map; sample(i) slices it without copying.
+    """
+
+    def __init__(self, store_path, split):
+        features_path, index_path = _split_paths(store_path, split)
+        with np.load(index_path) as index:
+            if int(index['version']) != STORE_VERSION:
+                raise ValueError(f"Unsupported feature store version in '{index_path}'")
+            self.num_features = int(index['num_features'])
+            self.num_rows = int(index['num_rows'])
+            self.is_sequence = bool(index['is_sequence'])
+            self.labels = index['labels']
+            self.sources = index['sources']
+            self.offsets = index['offsets']
+            self.lengths = index['lengths']
+        if self.num_rows:
+            self.features = np.memmap(features_path, dtype=np.float32, mode='r', shape=(self.num_rows, self.num_features))
+        else:
+            self.features = np.zeros((0, self.num_features), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def sample(self, i):
+        start = self.offsets[i]
+        if self.is_sequence:
+            return self.features[start:start + self.lengths[i]]
+        return self.features[start]
+
+
+def write_store(store_path, samples):
+    """
+    Writes (split, label, source, features) samples into a store, opening one
+    writer per split as it first appears. Returns the sample count per split.
+    """
+    writers = {}
+    try:
+        for split, label, source, features in samples:
+            if split not in writers:
+                writers[split] = FeatureStoreWriter(store_path, split)
+            writers[split].append(features, label, source)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    for split, writer in writers.items():
+        print(f"Packed '{split}': {len(writer.labels)} samples, {writer.num_rows} rows x {writer.num_features} features")
+    return {split: len(writer.labels) for split, writer in writers.items()}
+
+
+# --- Sample Iterators (shared by the trainers and the converter) ---
+def iter_npy_samples(data_path, actions, splits=SPLITS):
+    """
+    Yields (split, action, file_name, array) from a <split>/<action>/*.npy tree,
+    action by action, in the same order the trainers always used.
+    """
+    for action in actions:
+        for split in splits:
+            action_path = os.path.join(data_path, split, action)
+            if not os.path.exists(action_path): continue
+            for file_name in os.listdir(action_path):
+                if file_name.endswith('.npy'):
+                    yield split, action, file_name, np.load(os.path.join(action_path, file_name))
+
+
+def iter_store_samples(store_path, actions, splits=SPLITS):
+    """
+    Yields (split, action, source, view) from a packed store, skipping labels
+    that are not in 'actions'. Views are zero-copy slices of the memory map.
+    """
+    wanted = set(actions)
+    for split in splits:
+        if not has_split(store_path, split): continue
+        store = FeatureStore(store_path, split)
+        for i in range(len(store)):
+            action = str(store.labels[i])
+            if action in wanted:
+                yield split, action, str(store.sources[i]), store.sample(i)
+
+
+# --- Converter for existing .npy trees ---
+def convert_npy_tree(tree_path, store_path):
+    """
+    Packs an existing <split>/<action>/*.npy feature tree into a store.
+    Returns the number of samples written per split.
+    """
+    def samples():
+        for split in SPLITS:
+            split_path = os.path.join(tree_path, split)
+            if not os.path.isdir(split_path):
+                print(f"Warning: Directory '{split_path}' not found. Skipping.")
+                continue
+            actions = sorted(d for d in os.listdir(split_path) if os.path.isdir(os.path.join(split_path, d)))
+            for _, action, file_name, res in iter_npy_samples(tree_path, actions, splits=[split]):
+                yield split, action, os.path.splitext(file_name)[0], res
+
+    record_backend(store_path, read_backend(tree_path))
+    return write_store(store_path, samples())
+
+
+# --- Main Execution (converter CLI) ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack a <split>/<class>/*.npy feature tree into a memory-mapped feature store.")
+    parser.add_argument('tree_path', help="Existing feature tree (e.g. Dynamic_Processed_Data)")
+    parser.add_argument('store_path', help="Output store directory")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.tree_path):
+        print(f"Error: Feature tree '{args.tree_path}' not found.")
+        sys.exit(1)
+    try:
+        convert_npy_tree(args.tree_path, args.store_path)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"\nFeature store written to '{args.store_path}'.")
@@ -0,0 +1,162 @@
+# inference_engine.py
+
+import numpy as np
+
+from numpy_mlp import NumpyMLP
+
+# TensorFlow is imported inside the engines that need it, so loading a NumPy
+# .npz model never pays for the TensorFlow import.
+
+# --- Backend Names ---
+# 'keras'    -> model.predict (the original path; rebuilds its data adapter on every call)
+# 'compiled' -> one tf.function traced once with a fixed input signature
+# 'tflite'   -> TFLite interpreter, converted from the .h5 at load time or loaded from a .tflite file
+# 'numpy'    -> NumPy runtime in numpy_mlp.py, for Dense-only '.npz' models
+#               ('.npz' files always run on it, whatever engine is requested)
+KERAS_ENGINE = 'keras'
+COMPILED_ENGINE = 'compiled'
+TFLITE_ENGINE = 'tflite'
+NUMPY_ENGINE = 'numpy'
+ENGINE_CHOICES = [COMPILED_ENGINE, TFLITE_ENGINE, KERAS_ENGINE, NUMPY_ENGINE]
+
+
+class KerasEngine:
+    """
+    Baseline: Keras model.predict on a batch of one.
+    """
+    name = KERAS_ENGINE
+
+    def __init__(self, model):
+        self.model = model
+        self.input_shape = tuple(model.input_shape)
+        self.num_classes = int(model.output_shape[-1])
+
+    def predict(self, batch):
+        return self.model.predict(batch, verbose=0)
+
+    def predict_one(self, sample):
+        """
+        Class probabilities for one (features,) or (frames, features) sample.
+        """
+        return self.predict(np.asarray(sample, dtype=np.float32)[np.newaxis])[0]
+
+
+class CompiledEngine(KerasEngine):
+    """
+    Calls the model through a tf.function traced once for a float32 input of
+    shape (batch, ...) - no per-call data adapters, callbacks or retracing.
+    """
+    name = COMPILED_ENGINE
+
+    def __init__(self, model):
+        import tensorflow as tf
+        super().__init__(model)
+        signature = [tf.TensorSpec(shape=(None,) + self.input_shape[1:], dtype=tf.float32)]
+        self._forward = tf.function(lambda x: model(x, training=False), input_signature=signature)
+
+    def predict(self, batch):
+        return self._forward(np.asarray(batch, dtype=np.float32)).numpy()
+
+
+class TFLiteEngine:
+    """
+    Runs a TFLite flatbuffer with the tf.lite interpreter. The input tensor is
+    allocated for a batch of one and resized only when a different batch size
+    is requested.
+    """
+    name = TFLITE_ENGINE
+
+    def __init__(self, model_content=None, model_path=None, num_threads=None):
+        import tensorflow as tf
+        self.interpreter = tf.lite.Interpreter(model_content=model_content, model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        input_details = self.interpreter.get_input_details()[0]
+        output_details = self.interpreter.get_output_details()[0]
+        self._input_index = input_details['index']
+        self._output_index = output_details['index']
+        self._input_dtype = input_details['dtype']
+        # (scale, zero_point) is (0.0, 0) for float models; int8 models need (de)quantizing
+        self._input_quant = input_details['quantization']
+        self._output_quant = output_details['quantization']
+        self.input_shape = (None,) + tuple(int(d) for d in input_details['shape'][1:])
+        self.num_classes = int(output_details['shape'][-1])
+        self._batch_size = int(input_details['shape'][0])
+
+    def predict(self, batch):
+        batch = np.asarray(batch, dtype=np.float32)
+        if batch.shape[0] != self._batch_size:
+            self.interpreter.resize_tensor_input(self._input_index, batch.shape)
+            self.interpreter.allocate_tensors()
+            self._batch_size = batch.shape[0]
+        scale, zero_point = self._input_quant
+        if scale:
+            batch = np.clip(np.round(batch / scale + zero_point), np.iinfo(self._input_dtype).min, np.iinfo(self._input_dtype).max)
+        self.interpreter.set_tensor(self._input_index, batch.astype(self._input_dtype))
+        self.interpreter.invoke()
+        output = self.interpreter.get_tensor(self._output_index)
+        scale, zero_point = self._output_quant
+        if scale:
+            output = (output.astype(np.float32) - zero_point) * scale
+        return output
+
+    def predict_one(self, sample):
+        return self.predict(np.asarray(sample, dtype=np.float32)[np.newaxis])[0]
+
+
+def convert_to_tflite(model, optimizations=None, representative_dataset=None, int8_io=False, float16=False):
+    """
+    Converts a Keras model to a TFLite flatbuffer with a fixed batch of one.
+    LSTMs that cannot be lowered to builtin ops fall back to SELECT_TF_OPS.
+    """
+    import tensorflow as tf
+    input_shape = (1,) + tuple(model.input_shape[1:])
+    forward = tf.function(lambda x: model(x, training=False))
+    concrete = forward.get_concrete_function(tf.TensorSpec(input_shape, tf.float32))
+
+    def build(select_ops):
+        converter = tf.lite.TFLiteConverter.from_concrete_functions([concrete], model)
+        if optimizations:
+            converter.optimizations = optimizations
+        if float16:
+            converter.target_spec.supported_types = [tf.float16]
+        if representative_dataset is not None:
+            converter.representative_dataset = representative_dataset
+        ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8] if int8_io else [tf.lite.OpsSet.TFLITE_BUILTINS]
+        if select_ops:
+            ops.append(tf.lite.OpsSet.SELECT_TF_OPS)
+            converter._experimental_lower_tensor_list_ops = False
+        converter.target_spec.supported_ops = ops
+        if int8_io:
+            converter.inference_input_type = tf.int8
+            converter.inference_output_type = tf.int8
+        return converter.convert()
+
+    try:
+        return build(select_ops=False)
+    except Exception as e:
+        print(f"Builtin-only TFLite conversion failed ({e}); retrying with SELECT_TF_OPS.")
+        return build(select_ops=True)
+
+
+# --- Loading ---
+def load_engine(model_path, engine=COMPILED_ENGINE, num_threads=None):
+    """
+    Loads a model once and wraps it in the requested inference engine.
+    '.tflite' files always use the TFLite interpreter and '.npz' files the
+    NumPy runtime.
+    """
+    if model_path.endswith('.npz'):
+        return NumpyMLP.load(model_path)
+    if model_path.endswith('.tflite'):
+        return TFLiteEngine(model_path=model_path, num_threads=num_threads)
+    if engine == NUMPY_ENGINE:
+        raise ValueError(f"The NumPy engine runs '.npz' models (see numpy_mlp.py), not '{model_path}'")
+    from tensorflow.keras.models import load_model
+    model = load_model(model_path, compile=False)
+    if engine == KERAS_ENGINE:
+        return KerasEngine(model)
+    if engine == COMPILED_ENGINE:
+        return CompiledEngine(model)
+    if engine == TFLITE_ENGINE:
+        return TFLiteEngine(model_content=convert_to_tflite(model), num_threads=num_threads)
+    raise ValueError(f"Unknown inference engine: '{engine}'")
@@ -0,0 +1,92 @@
+# inference_scheduler.py
+
+import numpy as np
+
+# --- Skip Reasons ---
+NO_HANDS = 'no_hands'
+STRIDE = 'stride'
+STILL = 'still'
+
+
+class InferenceScheduler:
+    """
+    Decides, frame by frame, whether the model has to run at all.
+
+    - hand gating: no model call once no hand has been seen for `hand_memory`
+      frames (1 for the static model; the window length for the dynamic model,
+      i.e. the window holds no hand at all). The prediction is cleared.
+    - stride: run at most every `stride` eligible frames.
+    - motion threshold: re-run only when some keypoint moved more than
+      `motion_threshold` (normalized coordinates) since the last call.
+
+    While a call is skipped for stride or motion, `result` keeps the last model
+    output so the displayed prediction stays put.
+
+        if scheduler.step(hands_present, keypoints):
+            scheduler.record(model.predict(...)[0])
+        res = scheduler.result  # None -> show "..."
+    """
+
+    def __init__(self, hand_gating=True, hand_memory=1, stride=1, motion_threshold=None):
+        self.hand_gating = hand_gating
+        self.hand_memory = hand_memory
+        self.stride = max(int(stride), 1)
+        self.motion_threshold = motion_threshold
+        self.result = None
+        self.eligible_frames = 0
+        self.calls = 0
+        self.skipped = {NO_HANDS: 0, STRIDE: 0, STILL: 0}
+        self._frames_without_hands = hand_memory
+        self._frames_since_call = self.stride
+        self._last_keypoints = None
+
+    def observe(self, hands_present):
+        """
+        Tracks hand presence on every frame, including frames where the model
+        is not eligible yet (e.g. the dynamic window is still filling).
+        """
+        self._frames_without_hands = 0 if hands_present else self._frames_without_hands + 1
+
+    def step(self, hands_present=None, keypoints=None):
+        """
+        Returns True when the model should run on this frame. Pass
+        hands_present here unless observe() was already called for the frame.
+        """
+        if hands_present is not None:
+            self.observe(hands_present)
+        self.eligible_frames += 1
+        self._frames_since_call += 1
+
+        if self.hand_gating and self._frames_without_hands >= self.hand_memory:
+            self.skipped[NO_HANDS] += 1
+            self.result = None
+            self._last_keypoints = None
+            return False
+        if self.result is not None and self._frames_since_call < self.stride:
+            self.skipped[STRIDE] += 1
+            return False
+        if self.result is not None and self.motion_threshold is not None and self._last_keypoints is not None \
+                and np.max(np.abs(keypoints - self._last_keypoints)) <= self.motion_threshold:
+            self.skipped[STILL] += 1
+            return False
+
+        if self.motion_threshold is not None:
+            if self._last_keypoints is None:
+                self._last_keypoints = np.array(keypoints, dtype=np.float32)
+            else:
+                self._last_keypoints[:] = keypoints
+        self._frames_since_call = 0
+        self.calls += 1
+        return True
+
+    def record(self, result):
+        self.result = result
+
+    # --- Reporting ---
+    def saved_fraction(self):
+        return 1.0 - self.calls / self.eligible_frames if self.eligible_frames else 0.0
+
+    def print_stats(self, name='Model'):
+        skipped = ", ".join(f"{count} {reason}" for reason, count in self.skipped.items())
+        print(f"{name}: {self.calls} calls for {self.eligible_frames} eligible frames "
+              f"({self.saved_fraction():.1%} saved; skipped: {skipped})")
@@ -0,0 +1,170 @@
+# landmark_backends.py
+
+import mediapipe as mp
+
+from landmark_utils import HANDS_LAYOUT, POSE_HANDS_LAYOUT, FACE_LAYOUT
+
+# --- Backend Names ---
+# 'holistic'   -> mp.solutions.holistic (pose + face mesh + both hands)
+# 'pose_hands' -> mp.solutions.pose + mp.solutions.hands (no face mesh)
+# 'hands'      -> mp.solutions.hands only
+# 'auto'       -> the lightest backend that covers the requested layout(s)
+# Holistic is the default everywhere: the other backends come from different
+# MediaPipe models, so their landmarks do not match Holistic-trained models
+# and datasets. They are opt-in, for data extracted and trained with them.
+HOLISTIC_BACKEND = 'holistic'
+POSE_HANDS_BACKEND = 'pose_hands'
+HANDS_BACKEND = 'hands'
+AUTO_BACKEND = 'auto'
+BACKEND_CHOICES = [HOLISTIC_BACKEND, POSE_HANDS_BACKEND, HANDS_BACKEND, AUTO_BACKEND]
+
+# Which landmark groups each backend can fill
+_BACKEND_GROUPS = {
+    HANDS_BACKEND: {HANDS_LAYOUT},
+    POSE_HANDS_BACKEND: {HANDS_LAYOUT, POSE_HANDS_LAYOUT},
+    HOLISTIC_BACKEND: {HANDS_LAYOUT, POSE_HANDS_LAYOUT, FACE_LAYOUT},
+}
+
+
+class LandmarkResults:
+    """
+    Holistic-shaped result: the same four attributes, None when a group was
+    not detected or not computed. extract_landmarks and the drawing code
+    accept it unchanged.
+    """
+
+    def __init__(self, pose_landmarks=None, left_hand_landmarks=None, right_hand_landmarks=None, face_landmarks=None):
+        self.pose_landmarks = pose_landmarks
+        self.left_hand_landmarks = left_hand_landmarks
+        self.right_hand_landmarks = right_hand_landmarks
+        self.face_landmarks = face_landmarks
+
+
+# --- Backends ---
+class _Backend:
+    """
+    Common close()/context-manager handling; subclasses set self._model.
+    """
+
+    def close(self):
+        self._model.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class HolisticBackend(_Backend):
+    name = HOLISTIC_BACKEND
+
+    def __init__(self, static_image_mode=False, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        self._model = mp.solutions.holistic.Holistic(static_image_mode=static_image_mode,
+                                                     min_detection_confidence=min_detection_confidence,
+                                                     min_tracking_confidence=min_tracking_confidence)
+
+    def process(self, image_rgb):
+        return self._model.process(image_rgb)
+
+
+class HandsBackend(_Backend):
+    """
+    MediaPipe Hands alone. Hands labels handedness as if the image were a
+    mirrored selfie, while Holistic names hands after the person's own
+    left/right; with the unflipped camera frames used here, Hands' 'Left' is
+    Holistic's right hand. Set mirrored_input=True if frames are flipped.
+    """
+    name = HANDS_BACKEND
+
+    def __init__(self, static_image_mode=False, min_detection_confidence=0.5, min_tracking_confidence=0.5, mirrored_input=False):
+        self._model = mp.solutions.hands.Hands(static_image_mode=static_image_mode, max_num_hands=2,
+                                               min_detection_confidence=min_detection_confidence,
+                                               min_tracking_confidence=min_tracking_confidence)
+        self._label_to_attribute = {
+            'Left': 'left_hand_landmarks' if mirrored_input else 'right_hand_landmarks',
+            'Right': 'right_hand_landmarks' if mirrored_input else 'left_hand_landmarks',
+        }
+
+    def _fill_hands(self, hand_results, results):
+        if not hand_results.multi_hand_landmarks:
+            return results
+        best_scores = {}
+        for hand_landmarks, handedness in zip(hand_results.multi_hand_landmarks, hand_results.multi_handedness):
+            classification = handedness.classification[0]
+            attribute = self._label_to_attribute[classification.label]
+            # Two detections with the same label: keep the more confident one
+            if classification.score > best_scores.get(attribute, -1.0):
+                best_scores[attribute] = classification.score
+                setattr(results, attribute, hand_landmarks)
+        return results
+
+    def process(self, image_rgb):
+        return self._fill_hands(self._model.process(image_rgb), LandmarkResults())
+
+
+class PoseHandsBackend(HandsBackend):
+    """
+    MediaPipe Pose + Hands: everything the 258-value layout needs without
+    Holistic's face mesh.
+    """
+    name = POSE_HANDS_BACKEND
+
+    def __init__(self, static_image_mode=False, min_detection_confidence=0.5, min_tracking_confidence=0.5, mirrored_input=False):
+        super().__init__(static_image_mode, min_detection_confidence, min_tracking_confidence, mirrored_input)
+        self._pose = mp.solutions.pose.Pose(static_image_mode=static_image_mode,
+                                            min_detection_confidence=min_detection_confidence,
+                                            min_tracking_confidence=min_tracking_confidence)
+
+    def process(self, image_rgb):
+        results = LandmarkResults(pose_landmarks=self._pose.process(image_rgb).pose_landmarks)
+        return self._fill_hands(self._model.process(image_rgb), results)
+
+    def close(self):
+        self._pose.close()
+        super().close()
+
+
+_BACKEND_CLASSES = {
+    HOLISTIC_BACKEND: HolisticBackend,
+    POSE_HANDS_BACKEND: PoseHandsBackend,
+    HANDS_BACKEND: HandsBackend,
+}
+
+
+# --- Backend Selection ---
+def backend_for_layouts(layouts):
+    """
+    Returns the lightest backend name that can fill every layout in 'layouts'.
+    """
+    needed = set([layouts] if isinstance(layouts, str) else layouts)
+    for name in [HANDS_BACKEND, POSE_HANDS_BACKEND, HOLISTIC_BACKEND]:
+        if needed <= _BACKEND_GROUPS[name]:
+            return name
+    raise ValueError(f"No landmark backend covers layouts {sorted(needed)}")
+
+
+def resolve_backend(layouts, backend=HOLISTIC_BACKEND):
+    """
+    The concrete backend name for `backend` ('auto' picks the lightest one),
+    checked against the layouts so a hands-only backend is never used for a
+    pose layout. This is the name recorded with extracted features.
+    """
+    needed = [layouts] if isinstance(layouts, str) else list(layouts)
+    name = backend_for_layouts(needed) if backend == AUTO_BACKEND else backend
+    if name not in _BACKEND_CLASSES:
+        raise ValueError(f"Unknown landmark backend: '{backend}'")
+    if not set(needed) <= _BACKEND_GROUPS[name]:
+        raise ValueError(f"Backend '{name}' cannot produce layouts {needed}")
+    return name
+
+
+def create_backend(layouts, backend=HOLISTIC_BACKEND, **kwargs):
+    """
+    Builds a landmark backend for the given layout (or list of layouts);
+    see resolve_backend() for how `backend` is chosen and checked.
+    """
+    name = resolve_backend(layouts, backend)
+    if name == HOLISTIC_BACKEND:
+        kwargs.pop('mirrored_input', None)
+    return _BACKEND_CLASSES[name](**kwargs)
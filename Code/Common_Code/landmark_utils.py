@@ -0,0 +1,93 @@
+# landmark_utils.py
+
+from itertools import chain
+from operator import attrgetter
+import numpy as np
+
+# --- Feature Layouts ---
+# Every extractor, trainer and detector agrees on these layouts:
+#   'hands'      -> left hand (21*3) + right hand (21*3)                  = 126 values
+#   'pose_hands' -> pose (33*4, with visibility) + left hand + right hand = 258 values
+#   'face'       -> face mesh (468*3)                                     = 1404 values
+NUM_POSE_POINTS = 33
+NUM_HAND_POINTS = 21
+NUM_FACE_POINTS = 468
+POSE_SIZE = NUM_POSE_POINTS * 4
+HAND_SIZE = NUM_HAND_POINTS * 3
+FACE_SIZE = NUM_FACE_POINTS * 3
+
+HANDS_LAYOUT = 'hands'
+POSE_HANDS_LAYOUT = 'pose_hands'
+FACE_LAYOUT = 'face'
+
+# Each layout is an ordered list of (Holistic result attribute, points, with_visibility)
+LAYOUT_GROUPS = {
+    HANDS_LAYOUT: [('left_hand_landmarks', NUM_HAND_POINTS, False),
+                   ('right_hand_landmarks', NUM_HAND_POINTS, False)],
+    POSE_HANDS_LAYOUT: [('pose_landmarks', NUM_POSE_POINTS, True),
+                        ('left_hand_landmarks', NUM_HAND_POINTS, False),
+                        ('right_hand_landmarks', NUM_HAND_POINTS, False)],
+    FACE_LAYOUT: [('face_landmarks', NUM_FACE_POINTS, False)],
+}
+
+LAYOUT_SIZES = {
+    HANDS_LAYOUT: 2 * HAND_SIZE,                   # 126
+    POSE_HANDS_LAYOUT: POSE_SIZE + 2 * HAND_SIZE,  # 258
+    FACE_LAYOUT: FACE_SIZE,                        # 1404
+}
+
+
+def layout_for_size(num_features):
+    """
+    Returns the layout name for a feature vector size (e.g. a model's input).
+    """
+    for layout, size in LAYOUT_SIZES.items():
+        if size == num_features:
+            return layout
+    raise ValueError(f"No feature layout with {num_features} values")
+
+
+def new_landmark_buffer(layout=HANDS_LAYOUT):
+    """
+    Allocates a zeroed float32 buffer sized for the given layout.
+    """
+    return np.zeros(LAYOUT_SIZES[layout], dtype=np.float32)
+
+
+# C-level getters: one (x, y, z[, visibility]) tuple per point without running Python bytecode
+_POINT_XYZ = attrgetter('x', 'y', 'z')
+_POINT_XYZV = attrgetter('x', 'y', 'z', 'visibility')
+
+
+def _write_points(out, offset, landmark_list, num_points, with_visibility=False):
+    """
+    Writes one landmark group into out[offset:] in place, or zeros it if the
+    group was not detected. Returns the offset just past the group.
+    """
+    width = 4 if with_visibility else 3
+    end = offset + num_points * width
+    if landmark_list is None:
+        out[offset:end] = 0.0
+    else:
+        # One np.fromiter over the flattened points: no per-point list or tuple unpacking
+        getter = _POINT_XYZV if with_visibility else _POINT_XYZ
+        out[offset:end] = np.fromiter(chain.from_iterable(map(getter, landmark_list.landmark)), np.float32, end - offset)
+    return end
+
+
+# --- Landmark Extraction Function (shared by every extractor and detector) ---
+def extract_landmarks(results, layout=HANDS_LAYOUT, out=None):
+    """
+    Fills a float32 feature vector from a MediaPipe Holistic result.
+    If 'out' is given it is overwritten in place and returned, so real-time
+    loops can reuse one buffer per frame. Missing landmark groups are zero-filled,
+    matching the original extract_landmarks_static/_dynamic layouts exactly.
+    """
+    if layout not in LAYOUT_GROUPS:
+        raise ValueError(f"Unknown landmark layout: '{layout}'")
+    if out is None:
+        out = new_landmark_buffer(layout)
+    offset = 0
+    for attribute, num_points, with_visibility in LAYOUT_GROUPS[layout]:
+        offset = _write_points(out, offset, getattr(results, attribute), num_points, with_visibility)
+    return out
@@ -0,0 +1,212 @@
+# latency_profiler.py
+
+import csv
+import json
+import math
+import time
+from collections import deque
+import cv2
+import numpy as np
+
+# --- Configuration ---
+# Stage names used by the real-time detectors, in pipeline order
+DETECTOR_STAGES = ['capture', 'convert', 'holistic', 'extract', 'predict', 'draw', 'display']
+# The combined detector times each model separately
+COMBINED_DETECTOR_STAGES = ['capture', 'convert', 'holistic', 'extract', 'static', 'dynamic', 'draw', 'display']
+TOTAL_STAGE = 'total'
+
+# Rolling window (frames) for the live overlay percentiles
+DEFAULT_WINDOW = 300
+
+# Whole-run histogram: log-spaced bins from 10 us to 10 s
+HISTOGRAM_EDGES_MS = np.geomspace(0.01, 10000.0, 601)
+
+PERCENTILES = (50, 95, 99)
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _StageTimer:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, (time.perf_counter() - self.start) * 1000.0)
+        return False
+
+
+class _StageStats:
+    """
+    Rolling window of recent samples plus a whole-run histogram.
+    """
+
+    def __init__(self, window):
+        self.recent = deque(maxlen=window)
+        self.histogram = np.zeros(len(HISTOGRAM_EDGES_MS) + 1, dtype=np.int64)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms):
+        self.recent.append(ms)
+        self.histogram[np.searchsorted(HISTOGRAM_EDGES_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def rolling_percentiles(self):
+        if not self.recent:
+            return {p: 0.0 for p in PERCENTILES}
+        values = np.percentile(np.fromiter(self.recent, dtype=np.float64), PERCENTILES)
+        return dict(zip(PERCENTILES, values))
+
+    def run_percentiles(self):
+        """
+        Percentiles over the whole run, read from the histogram (upper bin edge).
+        """
+        if not self.count:
+            return {p: 0.0 for p in PERCENTILES}
+        cumulative = np.cumsum(self.histogram)
+        result = {}
+        for p in PERCENTILES:
+            index = int(np.searchsorted(cumulative, math.ceil(self.count * p / 100.0)))
+            result[p] = float(HISTOGRAM_EDGES_MS[min(index, len(HISTOGRAM_EDGES_MS) - 1)])
+        return result
+
+
+class LatencyProfiler:
+    """
+    Per-stage latency instrumentation for the real-time loops.
+
+        profiler.start_frame()
+        with profiler.stage('holistic'):
+            results = holistic.process(image)
+        profiler.end_frame()
+
+    Time spent in a stage is summed per frame (so two colour conversions count
+    as one 'convert' sample). If frame_interval_ms is known (1000 / camera FPS),
+    end_frame() estimates how many camera frames were missed while the loop
+    was busy. When disabled, every call is a cheap no-op.
+    """
+
+    def __init__(self, stages=DETECTOR_STAGES, enabled=True, window=DEFAULT_WINDOW, frame_interval_ms=None):
+        self.stages = list(stages)
+        self.enabled = enabled
+        self.frame_interval_ms = frame_interval_ms if frame_interval_ms and frame_interval_ms > 0 else None
+        self.stats = {name: _StageStats(window) for name in self.stages + [TOTAL_STAGE]}
+        self.frames = 0
+        self.dropped_frames = 0
+        self._current = {}
+        self._frame_start = None
+        self._run_start = time.perf_counter()
+
+    # --- Recording ---
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, name)
+
+    def add(self, name, ms):
+        if self.enabled:
+            self._current[name] = self._current.get(name, 0.0) + ms
+
+    def start_frame(self):
+        if self.enabled:
+            self._current = {}
+            self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if not self.enabled or self._frame_start is None:
+            return
+        total_ms = (time.perf_counter() - self._frame_start) * 1000.0
+        for name, ms in self._current.items():
+            if name not in self.stats:
+                self.stats[name] = _StageStats(self.stats[TOTAL_STAGE].recent.maxlen)
+                self.stages.append(name)
+            self.stats[name].record(ms)
+        self.stats[TOTAL_STAGE].record(total_ms)
+        self.frames += 1
+        if self.frame_interval_ms:
+            self.dropped_frames += max(0, math.ceil(total_ms / self.frame_interval_ms) - 1)
+        self._frame_start = None
+
+    def count_dropped(self, count=1):
+        if self.enabled:
+            self.dropped_frames += count
+
+    # --- Reporting ---
+    def summary(self):
+        elapsed = time.perf_counter() - self._run_start
+        stages = {}
+        for name in self.stages + [TOTAL_STAGE]:
+            stats = self.stats[name]
+            if not stats.count:
+                continue
+            run = stats.run_percentiles()
+            stages[name] = {
+                'count': stats.count,
+                'mean_ms': stats.total_ms / stats.count,
+                # Histogram edges are upper bounds; never report above the observed max
+                'p50_ms': min(run[50], stats.max_ms), 'p95_ms': min(run[95], stats.max_ms), 'p99_ms': min(run[99], stats.max_ms),
+                'max_ms': stats.max_ms,
+            }
+        return {
+            'frames': self.frames,
+            'dropped_frames': self.dropped_frames,
+            'elapsed_s': elapsed,
+            'fps': self.frames / elapsed if elapsed > 0 else 0.0,
+            'stages': stages,
+        }
+
+    def save_report(self, path_prefix):
+        """
+        Writes <path_prefix>.json (full summary) and <path_prefix>.csv (one row
+        per stage). Returns the summary dict.
+        """
+        summary = self.summary()
+        with open(path_prefix + '.json', 'w') as f:
+            json.dump(summary, f, indent=2)
+        with open(path_prefix + '.csv', 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['stage', 'count', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms'])
+            for name, row in summary['stages'].items():
+                writer.writerow([name, row['count']] + [f"{row[key]:.3f}" for key in ['mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms']])
+        return summary
+
+    def print_summary(self):
+        summary = self.summary()
+        print(f"\n--- Latency report: {summary['frames']} frames, {summary['fps']:.1f} fps, "
+              f"{summary['dropped_frames']} dropped ---")
+        print(f"{'stage':<10}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}  (ms)")
+        for name, row in summary['stages'].items():
+            print(f"{name:<10}{row['mean_ms']:>9.2f}{row['p50_ms']:>9.2f}{row['p95_ms']:>9.2f}{row['p99_ms']:>9.2f}{row['max_ms']:>9.2f}")
+
+    def draw_overlay(self, image, origin=(10, 60)):
+        """
+        Draws rolling p50/p95/p99 per stage onto a BGR image.
+        """
+        if not self.enabled:
+            return image
+        x, y = origin
+        lines = [f"frames {self.frames}  dropped {self.dropped_frames}"]
+        for name in self.stages + [TOTAL_STAGE]:
+            if self.stats[name].count:
+                p = self.stats[name].rolling_percentiles()
+                lines.append(f"{name:<9} p50 {p[50]:6.1f}  p95 {p[95]:6.1f}  p99 {p[99]:6.1f} ms")
+        for i, line in enumerate(lines):
+            cv2.putText(image, line, (x, y + i * 18), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 255, 255), 1, cv2.LINE_AA)
+        return image
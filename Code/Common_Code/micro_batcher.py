@@ -0,0 +1,97 @@
+# micro_batcher.py
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+# --- Configuration ---
+DEFAULT_MAX_BATCH = 32
+DEFAULT_MAX_DELAY_MS = 5.0
+
+
+class MicroBatcher:
+    """
+    Pools single-sample requests from many asyncio tasks into one model call.
+
+    The first queued request opens a batch; it is sent to the engine once
+    max_batch samples have arrived or max_delay_ms has passed, whichever comes
+    first. The engine runs on its own thread so the event loop keeps accepting
+    requests (TensorFlow releases the GIL while it computes).
+    """
+
+    def __init__(self, engine, max_batch=DEFAULT_MAX_BATCH, max_delay_ms=DEFAULT_MAX_DELAY_MS):
+        self.engine = engine
+        self.max_batch = max_batch
+        self.max_delay = max_delay_ms / 1000.0
+        self.batches = 0
+        self.samples = 0
+        self._queue = asyncio.Queue()
+        self._batch = np.zeros((max_batch,) + tuple(engine.input_shape[1:]), dtype=np.float32)
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._executor.shutdown(wait=True)
+
+    async def predict(self, sample):
+        """
+        Class probabilities for one sample. The sample is copied, so the
+        caller may reuse its buffer as soon as this is called.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((np.array(sample, dtype=np.float32), future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        items = [await self._queue.get()]
+        deadline = loop.time() + self.max_delay
+        while len(items) < self.max_batch:
+            if not self._queue.empty():
+                items.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0: break
+            try:
+                items.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return items
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = await self._collect()
+            batched = []
+            for sample, future in items:
+                # A sample of the wrong shape fails its own request, not the loop
+                try:
+                    self._batch[len(batched)] = sample
+                except ValueError as e:
+                    if not future.done(): future.set_exception(e)
+                    continue
+                batched.append((sample, future))
+            items = batched
+            if not items: continue
+            try:
+                probs = await loop.run_in_executor(self._executor, self.engine.predict, self._batch[:len(items)])
+            except Exception as e:
+                for _, future in items:
+                    if not future.done(): future.set_exception(e)
+                continue
+            self.batches += 1
+            self.samples += len(items)
+            for (_, future), res in zip(items, probs):
+                if not future.done(): future.set_result(res)
+
+    def mean_batch_size(self):
+        return self.samples / self.batches if self.batches else 0.0
@@ -0,0 +1,236 @@
+# model_bundle.py
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+
+from landmark_utils import LAYOUT_SIZES, layout_for_size
+from inference_engine import load_engine, COMPILED_ENGINE, KERAS_ENGINE, TFLITE_ENGINE, NUMPY_ENGINE
+from numpy_mlp import export_mlp_npz
+from feature_store import LEGACY_BACKEND
+
+# --- Bundle Layout ---
+# <name>.bundle/
+#   bundle.json   manifest: labels, schema, landmark backend, sequence length, normalization, artifacts
+#   model.h5      Keras weights ('keras' artifact)
+#   model.npz     NumPy weights for Dense-only models ('numpy' artifact)
+#   *.tflite      optional exports added with add_artifact()
+BUNDLE_SUFFIX = '.bundle'
+MANIFEST_NAME = 'bundle.json'
+BUNDLE_VERSION = 1
+# The artifacts each inference engine can run, in order of preference
+ENGINE_ARTIFACTS = {
+    NUMPY_ENGINE: ['numpy'],
+    COMPILED_ENGINE: ['keras'],
+    KERAS_ENGINE: ['keras'],
+    TFLITE_ENGINE: ['tflite_float16', 'tflite_int8'],
+}
+
+# Features are MediaPipe landmarks as extracted (x, y normalized to the image,
+# z relative, pose visibility); no standardization is applied before the model.
+DEFAULT_NORMALIZATION = {'coordinates': 'mediapipe_normalized', 'mean': None, 'std': None}
+
+
+class BundleError(ValueError):
+    pass
+
+
+def is_bundle(path):
+    return os.path.isfile(os.path.join(path, MANIFEST_NAME))
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _artifact_entry(bundle_dir, file_name):
+    path = os.path.join(bundle_dir, file_name)
+    return {'file': file_name, 'size': os.path.getsize(path), 'sha256': _file_sha256(path)}
+
+
+def _write_manifest(bundle_dir, manifest):
+    # Write-then-rename so a reader never sees a half-written manifest
+    tmp_path = os.path.join(bundle_dir, MANIFEST_NAME + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(bundle_dir, MANIFEST_NAME))
+
+
+# --- Writing ---
+def write_bundle(bundle_dir, model, labels, model_type, sequence_length=None, normalization=None, padding=None,
+                 landmark_backend=LEGACY_BACKEND, source_length=None):
+    """
+    Saves a trained Keras model with everything a detector needs to run it:
+    the label list in training order, the feature layout, the MediaPipe
+    backend the features came from, the sequence length (dynamic models) and
+    the normalization metadata. Dense-only models also
+    get a NumPy copy. With padding='resample', source_length is the number of
+    raw frames a detector resamples to sequence_length (see dynamic_window).
+    Returns the manifest.
+    """
+    os.makedirs(bundle_dir, exist_ok=True)
+    num_features = int(model.input_shape[-1])
+    labels = [str(label) for label in labels]
+    if int(model.output_shape[-1]) != len(labels):
+        raise BundleError(f"Model has {model.output_shape[-1]} outputs but {len(labels)} labels were given")
+
+    model.save(os.path.join(bundle_dir, 'model.h5'))
+    artifacts = {'keras': _artifact_entry(bundle_dir, 'model.h5')}
+    try:
+        export_mlp_npz(model, os.path.join(bundle_dir, 'model.npz'), labels)
+        artifacts['numpy'] = _artifact_entry(bundle_dir, 'model.npz')
+    except ValueError:
+        pass  # not a Dense-only model
+
+    manifest = {
+        'format_version': BUNDLE_VERSION,
+        'model_type': model_type,
+        'labels': labels,
+        'layout': layout_for_size(num_features),
+        'num_features': num_features,
+        'landmark_backend': landmark_backend,
+        'sequence_length': sequence_length,
+        'padding': padding,
+        'source_length': source_length,
+        'normalization': dict(normalization or DEFAULT_NORMALIZATION),
+        'artifacts': artifacts,
+    }
+    _write_manifest(bundle_dir, manifest)
+    print(f"Model bundle written to '{bundle_dir}' ({len(labels)} labels, artifacts: {', '.join(artifacts)})")
+    return manifest
+
+
+def add_artifact(bundle_dir, kind, source_path):
+    """
+    Copies an extra model file (e.g. an exported .tflite) into the bundle and
+    records it in the manifest under `kind`.
+    """
+    manifest = read_manifest(bundle_dir)
+    file_name = os.path.basename(source_path)
+    if os.path.abspath(source_path) != os.path.abspath(os.path.join(bundle_dir, file_name)):
+        shutil.copyfile(source_path, os.path.join(bundle_dir, file_name))
+    manifest['artifacts'][kind] = _artifact_entry(bundle_dir, file_name)
+    _write_manifest(bundle_dir, manifest)
+    return manifest
+
+
+# --- Reading ---
+def read_manifest(bundle_dir, verify_checksums=False):
+    """
+    Reads and validates a bundle manifest. The default check is cheap
+    (schema, label count, files present with the recorded sizes);
+    verify_checksums=True also hashes every artifact.
+    """
+    manifest_path = os.path.join(bundle_dir, MANIFEST_NAME)
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise BundleError(f"Cannot read bundle manifest '{manifest_path}': {e}")
+
+    if manifest.get('format_version') != BUNDLE_VERSION:
+        raise BundleError(f"Unsupported bundle version {manifest.get('format_version')} in '{bundle_dir}'")
+    for key in ('model_type', 'labels', 'layout', 'num_features', 'artifacts'):
+        if key not in manifest:
+            raise BundleError(f"Bundle manifest '{manifest_path}' is missing '{key}'")
+    # Bundles written before the backend was recorded were trained on Holistic features
+    manifest.setdefault('landmark_backend', LEGACY_BACKEND)
+    manifest.setdefault('source_length', None)
+    if not manifest['labels']:
+        raise BundleError(f"Bundle '{bundle_dir}' has no labels")
+    if LAYOUT_SIZES.get(manifest['layout']) != manifest['num_features']:
+        raise BundleError(f"Layout '{manifest['layout']}' does not have {manifest['num_features']} features")
+    if manifest['model_type'] == 'dynamic' and not manifest.get('sequence_length'):
+        raise BundleError(f"Dynamic bundle '{bundle_dir}' has no sequence length")
+    for kind, entry in manifest['artifacts'].items():
+        path = os.path.join(bundle_dir, entry['file'])
+        if not os.path.isfile(path) or os.path.getsize(path) != entry['size']:
+            raise BundleError(f"Artifact '{kind}' ({entry['file']}) is missing or has the wrong size")
+        if verify_checksums and _file_sha256(path) != entry['sha256']:
+            raise BundleError(f"Artifact '{kind}' ({entry['file']}) failed its checksum")
+    return manifest
+
+
+def load_bundle(bundle_dir, engine=COMPILED_ENGINE, artifact=None, verify_checksums=False):
+    """
+    Loads a bundle without touching the dataset. Returns (engine, manifest).
+    Picks `artifact` if given, otherwise the first artifact the requested
+    engine can run (ENGINE_ARTIFACTS), and checks the loaded model against
+    the manifest. Never falls back to an artifact of another engine.
+    """
+    manifest = read_manifest(bundle_dir, verify_checksums)
+    artifacts = manifest['artifacts']
+    if artifact is None:
+        if engine not in ENGINE_ARTIFACTS:
+            raise BundleError(f"Unknown inference engine: '{engine}'")
+        artifact = next((kind for kind in ENGINE_ARTIFACTS[engine] if kind in artifacts), None)
+        if artifact is None:
+            raise BundleError(f"Bundle '{bundle_dir}' has no artifact for the '{engine}' engine "
+                              f"(needs one of: {', '.join(ENGINE_ARTIFACTS[engine])}; has: {', '.join(artifacts)})")
+    if artifact not in artifacts:
+        raise BundleError(f"Bundle '{bundle_dir}' has no '{artifact}' artifact (has: {', '.join(artifacts)})")
+
+    model = load_engine(os.path.join(bundle_dir, artifacts[artifact]['file']), engine)
+    if model.input_shape[-1] != manifest['num_features']:
+        raise BundleError(f"Model expects {model.input_shape[-1]} features, manifest says {manifest['num_features']}")
+    if manifest['model_type'] == 'dynamic' and model.input_shape[1] != manifest['sequence_length']:
+        raise BundleError(f"Model window is {model.input_shape[1]} frames, manifest says {manifest['sequence_length']}")
+    if model.num_classes != len(manifest['labels']):
+        raise BundleError(f"Model has {model.num_classes} outputs for {len(manifest['labels'])} labels")
+    return model, manifest
+
+
+def load_model_and_labels(model_path, engine=COMPILED_ENGINE, actions_path=None, landmark_backend=None):
+    """
+    Detector entry point: a bundle directory gives the model and its labels
+    directly; a bare model file falls back to listing `actions_path` like
+    the original scripts. Returns (engine, labels, manifest or None).
+    A bundle trained on another `landmark_backend` than the caller runs is refused.
+    """
+    if is_bundle(model_path):
+        model, manifest = load_bundle(model_path, engine)
+        if landmark_backend and manifest['landmark_backend'] != landmark_backend:
+            raise BundleError(f"'{model_path}' was trained on '{manifest['landmark_backend']}' landmarks, "
+                              f"but this run uses the '{landmark_backend}' backend")
+        return model, manifest['labels'], manifest
+    model = load_engine(model_path, engine)
+    labels = sorted(d for d in os.listdir(actions_path) if os.path.isdir(os.path.join(actions_path, d)))
+    return model, labels, None
+
+
+def dynamic_window(model, manifest=None):
+    """
+    (window_frames, resample_length) for running a dynamic model on a stream:
+    how many raw frames the sliding window holds, and the length to resample
+    them to before each call (None = feed them as they are). A model trained
+    with --sequence-mode resample saw whole signs time-normalized to its
+    input length, so its window spans the signs' typical raw length instead.
+    """
+    length = model.input_shape[1]
+    if not manifest or manifest.get('padding') != 'resample':
+        return length, None
+    if not manifest.get('source_length'):
+        print(f"Warning: bundle trained on resampled sequences records no source length; resampling {length}-frame windows.")
+    return manifest.get('source_length') or length, length
+
+
+# --- Inspection ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate a model bundle and print its manifest.")
+    parser.add_argument('bundle', help="Bundle directory.")
+    parser.add_argument('--verify', action='store_true', help="Also check artifact checksums.")
+    args = parser.parse_args()
+    try:
+        manifest = read_manifest(args.bundle, args.verify)
+    except BundleError as e:
+        print(f"Invalid bundle: {e}")
+        sys.exit(1)
+    print(json.dumps({key: value for key, value in manifest.items() if key != 'labels'}, indent=2))
+    print(f"Labels ({len(manifest['labels'])}): {manifest['labels']}")
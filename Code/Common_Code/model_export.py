@@ -0,0 +1,166 @@
+# model_export.py
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.models import load_model
+
+from inference_engine import CompiledEngine, TFLiteEngine, convert_to_tflite
+from feature_store import iter_npy_samples, iter_store_samples
+
+# --- Configuration ---
+CALIBRATION_SAMPLES = 200
+LATENCY_CALLS = 200
+LATENCY_WARMUP = 20
+FLOAT16_SUFFIX = '_float16.tflite'
+INT8_SUFFIX = '_int8.tflite'
+REPORT_SUFFIX = '_quantization'
+
+
+def representative_dataset(X_train, num_samples=CALIBRATION_SAMPLES, seed=0):
+    """
+    Calibration generator for int8 conversion: a fixed random subset of the
+    training features, one sample per step.
+    """
+    rng = np.random.default_rng(seed)
+    indices = rng.choice(len(X_train), size=min(num_samples, len(X_train)), replace=False)
+
+    def generator():
+        for i in indices:
+            yield [np.asarray(X_train[i:i + 1], dtype=np.float32)]
+    return generator
+
+
+def export_float16(model):
+    return convert_to_tflite(model, optimizations=[tf.lite.Optimize.DEFAULT], float16=True)
+
+
+def export_int8(model, X_train):
+    """
+    Full-integer model (int8 weights, activations and I/O). Falls back to int8
+    weights with float I/O when some op (typically the LSTM) has no
+    full-integer kernel. Returns (flatbuffer, description).
+    """
+    dataset = representative_dataset(X_train)
+    try:
+        return convert_to_tflite(model, optimizations=[tf.lite.Optimize.DEFAULT], representative_dataset=dataset,
+                                 int8_io=True), 'full int8'
+    except Exception as e:
+        print(f"Full-integer conversion failed ({e}); exporting int8 weights with float I/O.")
+        return convert_to_tflite(model, optimizations=[tf.lite.Optimize.DEFAULT], representative_dataset=dataset), 'int8 weights, float I/O'
+
+
+def measure(engine, X_test, y_test):
+    """
+    Test accuracy, predictions and single-sample latency (ms) of an engine.
+    """
+    predictions = np.array([np.argmax(engine.predict_one(x)) for x in X_test])
+    accuracy = float(np.mean(predictions == y_test)) if len(y_test) else float('nan')
+    for x in X_test[:LATENCY_WARMUP]:
+        engine.predict_one(x)
+    samples = X_test[np.arange(LATENCY_CALLS) % len(X_test)]
+    latencies = []
+    for x in samples:
+        start = time.perf_counter()
+        engine.predict_one(x)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies = np.array(latencies)
+    return predictions, accuracy, latencies
+
+
+def export_quantized_models(model, model_path, X_train, X_test, y_test):
+    """
+    Writes <model>_float16.tflite and <model>_int8.tflite next to model_path and
+    a <model>_quantization.json/.csv report comparing accuracy, size and
+    single-sample CPU latency with the Keras model. y_test holds class indices.
+    Returns the report rows.
+    """
+    stem = os.path.splitext(model_path)[0]
+    X_test = np.asarray(X_test, dtype=np.float32)
+    y_test = np.asarray(y_test)
+
+    variants = [('keras', model_path, 'float32 (.h5)', CompiledEngine(model))]
+    float16_path = stem + FLOAT16_SUFFIX
+    with open(float16_path, 'wb') as f:
+        f.write(export_float16(model))
+    variants.append(('float16', float16_path, 'float16 weights', TFLiteEngine(model_path=float16_path)))
+    int8_path = stem + INT8_SUFFIX
+    int8_model, int8_kind = export_int8(model, X_train)
+    with open(int8_path, 'wb') as f:
+        f.write(int8_model)
+    variants.append(('int8', int8_path, int8_kind, TFLiteEngine(model_path=int8_path)))
+
+    rows, reference = [], None
+    for name, path, kind, engine in variants:
+        predictions, accuracy, latencies = measure(engine, X_test, y_test)
+        if reference is None:
+            reference = predictions
+        rows.append({
+            'variant': name, 'path': path, 'kind': kind,
+            'size_kb': round(os.path.getsize(path) / 1024, 1),
+            'test_accuracy': round(accuracy, 4),
+            'agreement_with_keras': round(float(np.mean(predictions == reference)), 4),
+            'mean_ms': round(float(latencies.mean()), 4),
+            'p95_ms': round(float(np.percentile(latencies, 95)), 4),
+        })
+
+    with open(stem + REPORT_SUFFIX + '.json', 'w') as f:
+        json.dump({'model': model_path, 'test_samples': len(X_test), 'variants': rows}, f, indent=2)
+    with open(stem + REPORT_SUFFIX + '.csv', 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f"\n--- Quantization report ({len(X_test)} test samples) ---")
+    print(f"{'variant':<10}{'size KB':>10}{'accuracy':>10}{'agree':>8}{'mean ms':>10}{'p95 ms':>10}  kind")
+    for row in rows:
+        print(f"{row['variant']:<10}{row['size_kb']:>10.1f}{row['test_accuracy']:>10.2%}{row['agreement_with_keras']:>8.1%}"
+              f"{row['mean_ms']:>10.3f}{row['p95_ms']:>10.3f}  {row['kind']}")
+    print(f"Report saved to '{stem + REPORT_SUFFIX}.json' and '{stem + REPORT_SUFFIX}.csv'")
+    return rows
+
+
+def prepare_features(samples, input_shape):
+    """
+    Stacks feature arrays into model input, padding or cutting sequences to
+    the model's length like the trainer's pad_sequences.
+    """
+    X = np.zeros((len(samples),) + tuple(input_shape[1:]), dtype=np.float32)
+    for i, features in enumerate(samples):
+        if X.ndim == 3:
+            length = min(len(features), X.shape[1])
+            X[i, :length] = features[:length]
+        else:
+            X[i] = features
+    return X
+
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export float16 / int8 TFLite models from a trained .h5 and report accuracy, size and latency.")
+    parser.add_argument('model', help="Trained .h5 model.")
+    parser.add_argument('data', help="Processed <split>/<action>/*.npy tree (or a packed store with --store).")
+    parser.add_argument('actions_path', help="Original dataset folder the trainer listed the actions from.")
+    parser.add_argument('--store', action='store_true', help="'data' is a packed feature store.")
+    args = parser.parse_args()
+
+    model = load_model(args.model, compile=False)
+    actions = np.array(sorted(d for d in os.listdir(args.actions_path) if os.path.isdir(os.path.join(args.actions_path, d))))
+    label_map = {label: num for num, label in enumerate(actions)}
+    splits = {'train': ([], []), 'test': ([], [])}
+    iterator = iter_store_samples if args.store else iter_npy_samples
+    for split, action, _, features in iterator(args.data, actions, list(splits)):
+        splits[split][0].append(features)
+        splits[split][1].append(label_map[action])
+    if not splits['train'][0] or not splits['test'][0]:
+        print("Error: Need both train (calibration) and test samples.")
+        sys.exit(1)
+
+    X_train = prepare_features(splits['train'][0], model.input_shape)
+    X_test = prepare_features(splits['test'][0], model.input_shape)
+    export_quantized_models(model, args.model, X_train, X_test, np.array(splits['test'][1]))
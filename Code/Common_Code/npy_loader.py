@@ -0,0 +1,131 @@
+# npy_loader.py
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from feature_store import SPLITS
+
+# --- Configuration ---
+# np.load is I/O bound (and releases the GIL while reading), so threads overlap the file latency
+LOAD_WORKERS = 8
+
+
+def scan_npy_tree(data_path, actions, splits=SPLITS):
+    """
+    Lists every <split>/<action>/*.npy file with one os.scandir per folder.
+    Returns (split, action, file_name, path) tuples action by action, split
+    by split (like iter_npy_samples), with file names sorted so the order is
+    the same on every machine.
+    """
+    files = []
+    for action in actions:
+        for split in splits:
+            action_path = os.path.join(data_path, split, action)
+            if not os.path.isdir(action_path): continue
+            with os.scandir(action_path) as entries:
+                names = sorted(entry.name for entry in entries if entry.name.endswith('.npy') and entry.is_file())
+            files.extend((split, action, name, os.path.join(action_path, name)) for name in names)
+    return files
+
+
+def _read_header(f):
+    """
+    Reads the .npy header and leaves f at the start of the data. Returns
+    (shape, fortran_order, dtype), or None for a format version it cannot parse.
+    """
+    version = np.lib.format.read_magic(f)
+    if version == (1, 0):
+        return np.lib.format.read_array_header_1_0(f)
+    if version == (2, 0):
+        return np.lib.format.read_array_header_2_0(f)
+    return None
+
+
+def read_npy_header(path):
+    with open(path, 'rb') as f:
+        header = _read_header(f)
+    if header is None:
+        array = np.load(path, mmap_mode='r')
+        return array.shape, False, array.dtype
+    return header
+
+
+def is_empty_video(shape):
+    # Extractors save np.array([]) (shape (0,)) for a video that produced no frames
+    return len(shape) == 1 and shape[0] == 0
+
+
+def sequence_shapes(shapes):
+    """
+    Header shapes with empty videos turned into (0, features) sequences, so a
+    tree is a sequence tree when any file is 2-D, whatever its first file is.
+    """
+    features = next((shape[-1] for shape in shapes if len(shape) == 2), None)
+    if features is None:
+        return [tuple(shape) for shape in shapes]
+    return [(0, features) if is_empty_video(shape) else tuple(shape) for shape in shapes]
+
+
+def _read_into(path, out):
+    """
+    Reads a .npy file straight into the preallocated array `out` when the
+    layout allows it, otherwise through np.load. Returns the bytes read.
+    """
+    with open(path, 'rb') as f:
+        header = _read_header(f)
+        if header is not None:
+            shape, fortran_order, dtype = header
+            if is_empty_video(shape) and out.size == 0:
+                return 0
+            if tuple(shape) != out.shape:
+                raise ValueError(f"'{path}' has shape {tuple(shape)}, expected {out.shape}")
+            if dtype == out.dtype and not fortran_order:
+                read = f.readinto(memoryview(out).cast('B')) if out.nbytes else 0
+                if read != out.nbytes:
+                    raise ValueError(f"'{path}' is truncated ({read} of {out.nbytes} data bytes)")
+                return out.nbytes
+    out[...] = np.load(path)
+    return out.nbytes
+
+
+def load_npy_tree(data_path, actions, splits=SPLITS, workers=LOAD_WORKERS):
+    """
+    Parallel replacement for iter_npy_samples: lists the tree once, reads the
+    files on a thread pool into arrays preallocated from the .npy headers and
+    returns (split, action, file_name, array) in scan_npy_tree order.
+
+    Static samples become rows of one (N, F) array; sequences become slices
+    of one (total_frames, F) buffer. Headers are read in an extra parallel
+    pass only for sequences, whose lengths differ. Empty videos become
+    (0, F) slices.
+    """
+    start = time.perf_counter()
+    files = scan_npy_tree(data_path, actions, splits)
+    if not files:
+        return []
+    paths = [path for _, _, _, path in files]
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        # The first non-empty file decides the layout; empty videos are (0,) whatever the tree holds
+        for path in paths:
+            first_shape, _, dtype = read_npy_header(path)
+            if not is_empty_video(first_shape):
+                break
+        if len(first_shape) == 1 and not is_empty_video(first_shape):
+            # Static: every sample has the first file's shape
+            data = np.empty((len(paths),) + tuple(first_shape), dtype=dtype)
+            slots = list(data)
+        else:
+            shapes = sequence_shapes([shape for shape, _, _ in executor.map(read_npy_header, paths)])
+            lengths = np.array([shape[0] for shape in shapes], dtype=int)
+            offsets = np.concatenate([[0], np.cumsum(lengths)])
+            data = np.empty((int(offsets[-1]), shapes[0][-1]), dtype=dtype)
+            slots = [data[offsets[i]:offsets[i + 1]] for i in range(len(paths))]
+        total_bytes = sum(executor.map(_read_into, paths, slots))
+
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"Loaded {len(paths)} files ({total_bytes / 1e6:.1f} MB) in {elapsed:.2f}s: "
+          f"{len(paths) / elapsed:.0f} files/s, {total_bytes / 1e6 / elapsed:.1f} MB/s ({workers} threads)")
+    return [(split, action, file_name, slot) for (split, action, file_name, _), slot in zip(files, slots)]
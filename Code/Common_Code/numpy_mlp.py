@@ -0,0 +1,141 @@
+# numpy_mlp.py
+
+import os
+import sys
+import argparse
+import numpy as np
+
+# NumPy-only runtime for the static Dense model. Nothing here imports
+# TensorFlow, except the exporter's command line which has to read the .h5.
+
+NPZ_VERSION = 1
+
+
+def _relu(x):
+    np.maximum(x, 0.0, out=x)
+    return x
+
+
+def _softmax(x):
+    # Same formulation as Keras: exp(x - max) / sum
+    x -= np.max(x, axis=-1, keepdims=True)
+    np.exp(x, out=x)
+    x /= np.sum(x, axis=-1, keepdims=True)
+    return x
+
+
+def _linear(x):
+    return x
+
+
+def _tanh(x):
+    np.tanh(x, out=x)
+    return x
+
+
+def _sigmoid(x):
+    np.negative(x, out=x)
+    np.exp(x, out=x)
+    x += 1.0
+    np.reciprocal(x, out=x)
+    return x
+
+
+ACTIVATIONS = {'relu': _relu, 'softmax': _softmax, 'linear': _linear, 'tanh': _tanh, 'sigmoid': _sigmoid}
+
+
+def export_mlp_npz(model, npz_path, labels=None):
+    """
+    Writes the Dense layers of a Keras model (kernels, biases, activations)
+    and the label list to a compact .npz. Dropout layers are skipped; any
+    other layer type is rejected.
+    """
+    arrays, activations = {}, []
+    for layer in model.layers:
+        kind = layer.__class__.__name__
+        if kind == 'Dropout':
+            continue
+        if kind != 'Dense':
+            raise ValueError(f"Layer '{layer.name}' ({kind}) is not supported by the NumPy runtime")
+        activation = layer.get_config()['activation']
+        if activation not in ACTIVATIONS:
+            raise ValueError(f"Activation '{activation}' of layer '{layer.name}' is not supported")
+        kernel, bias = layer.get_weights()
+        arrays[f'kernel_{len(activations)}'] = kernel.astype(np.float32)
+        arrays[f'bias_{len(activations)}'] = bias.astype(np.float32)
+        activations.append(activation)
+    np.savez(npz_path, version=NPZ_VERSION, activations=np.array(activations),
+             labels=np.array([] if labels is None else list(labels), dtype=str), **arrays)
+
+
+class NumpyMLP:
+    """
+    Dense-stack inference with NumPy, exposing the same predict / predict_one
+    interface as the inference engines. Single-sample calls reuse
+    preallocated float32 buffers, so a frame costs one matmul per layer.
+    """
+    name = 'numpy'
+
+    def __init__(self, kernels, biases, activations, labels=None):
+        self.kernels = [np.ascontiguousarray(k, dtype=np.float32) for k in kernels]
+        self.biases = [np.asarray(b, dtype=np.float32) for b in biases]
+        self.activations = [ACTIVATIONS[a] for a in activations]
+        self.labels = labels
+        self.input_shape = (None, self.kernels[0].shape[0])
+        self.num_classes = self.kernels[-1].shape[1]
+        self._one_input = np.zeros((1, self.kernels[0].shape[0]), dtype=np.float32)
+        self._one_buffers = [np.zeros((1, k.shape[1]), dtype=np.float32) for k in self.kernels]
+
+    @classmethod
+    def load(cls, npz_path):
+        with np.load(npz_path) as data:
+            if int(data['version']) != NPZ_VERSION:
+                raise ValueError(f"Unsupported NumPy model version in '{npz_path}'")
+            activations = [str(a) for a in data['activations']]
+            kernels = [data[f'kernel_{i}'] for i in range(len(activations))]
+            biases = [data[f'bias_{i}'] for i in range(len(activations))]
+            labels = np.array([str(l) for l in data['labels']]) if len(data['labels']) else None
+        return cls(kernels, biases, activations, labels)
+
+    def _forward(self, x, buffers):
+        for kernel, bias, activation, out in zip(self.kernels, self.biases, self.activations, buffers):
+            np.matmul(x, kernel, out=out)
+            out += bias
+            x = activation(out)
+        return x
+
+    def predict(self, batch):
+        batch = np.asarray(batch, dtype=np.float32)
+        buffers = [np.empty((len(batch), k.shape[1]), dtype=np.float32) for k in self.kernels]
+        return self._forward(batch, buffers)
+
+    def predict_one(self, sample):
+        """
+        Class probabilities for one sample. The returned array is reused by
+        the next call.
+        """
+        self._one_input[0] = sample
+        return self._forward(self._one_input, self._one_buffers)[0]
+
+
+# --- Exporter ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a trained static Dense model (.h5) to a NumPy .npz.")
+    parser.add_argument('model', help="Trained static .h5 model.")
+    parser.add_argument('output', help="Output .npz path.")
+    parser.add_argument('--actions-path', default=None, help="Dataset folder the trainer listed the actions from (stored as labels).")
+    args = parser.parse_args()
+
+    from tensorflow.keras.models import load_model
+    model = load_model(args.model, compile=False)
+    labels = None
+    if args.actions_path:
+        labels = sorted(d for d in os.listdir(args.actions_path) if os.path.isdir(os.path.join(args.actions_path, d)))
+    export_mlp_npz(model, args.output, labels)
+    runtime = NumpyMLP.load(args.output)
+    sample = np.random.default_rng(0).standard_normal((64,) + tuple(model.input_shape[1:])).astype(np.float32)
+    diff = np.abs(runtime.predict(sample) - model.predict(sample, verbose=0)).max()
+    print(f"Exported {len(runtime.kernels)} Dense layers to '{args.output}' ({os.path.getsize(args.output) / 1024:.1f} KB), "
+          f"max |diff| vs Keras on random input: {diff:.2e}")
+    if diff > 1e-5:
+        sys.exit(1)
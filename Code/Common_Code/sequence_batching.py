@@ -0,0 +1,95 @@
+# sequence_batching.py
+
+import numpy as np
+
+# --- Configuration ---
+# 'pad': every sequence zero-padded to the global max length (original behaviour)
+# 'bucket': batches of similar-length sequences, padded only to the batch's longest
+# 'resample': every sequence linearly resampled to one fixed length, no padding
+SEQUENCE_MODES = ['pad', 'bucket', 'resample']
+NUM_BUCKETS = 6
+
+
+def bucket_boundaries(lengths, num_buckets=NUM_BUCKETS):
+    """
+    Length boundaries at the quantiles of `lengths`, so buckets hold similar
+    sample counts. Bucket i takes boundaries[i-1] <= length < boundaries[i],
+    as in tf.data's bucket_by_sequence_length.
+    """
+    quantiles = np.quantile(np.asarray(lengths), np.linspace(0, 1, num_buckets + 1)[1:-1])
+    return sorted(set(int(q) + 1 for q in quantiles))
+
+
+def plan_batches(lengths, batch_size, boundaries, rng=None, shuffle=True):
+    """
+    Splits sample indices into batches that never mix buckets. With shuffle,
+    samples are shuffled within each bucket and the batch order is shuffled.
+    Returns a list of index arrays.
+    """
+    rng = rng or np.random.default_rng()
+    buckets = np.searchsorted(boundaries, np.asarray(lengths), side='right')
+    batches = []
+    for bucket in np.unique(buckets):
+        members = np.flatnonzero(buckets == bucket)
+        if shuffle:
+            members = rng.permutation(members)
+        batches.extend(members[i:i + batch_size] for i in range(0, len(members), batch_size))
+    if shuffle:
+        batches = [batches[i] for i in rng.permutation(len(batches))]
+    return batches
+
+
+def pad_batch(sequences, length=None):
+    """
+    Stacks sequences into a float32 (N, length, F) array, zero-padded at the
+    end (like pad_sequences(padding='post')); length defaults to the longest.
+    """
+    length = length or max(len(s) for s in sequences)
+    batch = np.zeros((len(sequences), length, sequences[0].shape[-1]), dtype=np.float32)
+    for row, sequence in enumerate(sequences):
+        batch[row, :len(sequence)] = sequence[:length]
+    return batch
+
+
+def resample_sequence(sequence, length):
+    """
+    Linearly interpolates a (T, F) sequence to (length, F) frames along time.
+    An (N, T, F) batch of windows is resampled the same way to (N, length, F).
+    """
+    sequence = np.asarray(sequence, dtype=np.float32)
+    frames = sequence.shape[-2]
+    if frames == 0:
+        return np.zeros(sequence.shape[:-2] + (length, sequence.shape[-1]), dtype=np.float32)
+    positions = np.linspace(0, frames - 1, length)
+    lower = np.floor(positions).astype(int)
+    upper = np.minimum(lower + 1, frames - 1)
+    weight = (positions - lower).astype(np.float32)[:, np.newaxis]
+    return sequence[..., lower, :] * (1.0 - weight) + sequence[..., upper, :] * weight
+
+
+def padding_waste(lengths, batches=None, padded_length=None):
+    """
+    Fraction of the timesteps fed to the model that are padding, either for
+    one global padded_length or for a list of batches padded to their longest.
+    """
+    lengths = np.asarray(lengths)
+    if batches is None:
+        total = len(lengths) * padded_length
+    else:
+        total = sum(len(batch) * lengths[batch].max() for batch in batches)
+    return 1.0 - lengths.sum() / total if total else 0.0
+
+
+def print_padding_report(lengths, mode, max_len, batch_size, boundaries=None, resample_length=None):
+    """
+    Prints the padding waste of the original global padding to max_len next
+    to the selected sequence mode (bucket waste is estimated from one batch plan).
+    """
+    before = padding_waste(lengths, padded_length=max_len)
+    print(f"\n--- Padding report ({len(lengths)} training sequences, {min(lengths)}-{max(lengths)} frames) ---")
+    print(f"{'pad to ' + str(max_len):<17}{before:>8.1%} of timesteps are padding")
+    if mode == 'bucket':
+        after = padding_waste(lengths, plan_batches(lengths, batch_size, boundaries, np.random.default_rng(0)))
+        print(f"{'bucket':<17}{after:>8.1%} of timesteps are padding (boundaries {boundaries})")
+    elif mode == 'resample':
+        print(f"{'resample':<17}{0:>8.1%} of timesteps are padding (every sequence is {resample_length} frames)")
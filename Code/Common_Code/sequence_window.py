@@ -0,0 +1,61 @@
+# sequence_window.py
+
+import numpy as np
+
+
+class SlidingWindow:
+    """
+    Fixed-size float32 ring buffer for the last `length` frames of keypoints.
+
+    Every frame is written twice, at slot i and at slot i + length of a
+    (1, 2 * length, features) buffer, so the newest `length` frames always sit
+    next to each other in memory. view() therefore returns a contiguous
+    (1, length, features) batch - oldest frame first - without copying the
+    window. The view is overwritten by later append() calls; copy it if it
+    has to outlive the next frame.
+    """
+
+    def __init__(self, length, num_features):
+        self.length = length
+        self.num_features = num_features
+        self._buffer = np.zeros((1, 2 * length, num_features), dtype=np.float32)
+        self._pos = 0
+        self._count = 0
+
+    def append(self, keypoints):
+        self._buffer[0, self._pos] = keypoints
+        self._buffer[0, self._pos + self.length] = keypoints
+        self._pos = (self._pos + 1) % self.length
+        self._count = min(self._count + 1, self.length)
+
+    def view(self):
+        """
+        (1, length, features) view of the window, ready for model input.
+        Frames not filled yet are zeros.
+        """
+        return self._buffer[:, self._pos:self._pos + self.length]
+
+    def is_full(self):
+        return self._count == self.length
+
+    def reset(self):
+        self._buffer.fill(0)
+        self._pos = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+
+def iter_windows(frames, length, stride=1):
+    """
+    Replays a (frames, features) sequence through a SlidingWindow, as the
+    real-time detectors see it, and yields (end_frame_index, window_view)
+    for every full window, `stride` frames apart.
+    """
+    frames = np.asarray(frames, dtype=np.float32)
+    window = SlidingWindow(length, frames.shape[1])
+    for i, keypoints in enumerate(frames):
+        window.append(keypoints)
+        if window.is_full() and (i - length + 1) % stride == 0:
+            yield i, window.view()
@@ -0,0 +1,146 @@
+# startup.py
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+# --- Configuration ---
+WARMUP_CALLS = 2
+# Dummy frame for the Holistic warm-up (the first process() call builds the graphs)
+WARMUP_FRAME_SHAPE = (480, 640, 3)
+TIMELINE_WIDTH = 50
+
+
+class _Phase:
+    def __init__(self, timeline, name):
+        self.timeline = timeline
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timeline._record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class StartupTimeline:
+    """
+    Records when each startup phase ran (and on which thread) relative to
+    the detector's launch, plus one-off marks such as the first prediction.
+    Safe to use from the startup threads.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases = []
+        self.marks = {}
+        self._lock = threading.Lock()
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def _record(self, name, start, end):
+        with self._lock:
+            self.phases.append({'phase': name, 'thread': threading.current_thread().name,
+                                'start_s': start - self.start, 'end_s': end - self.start})
+
+    def mark(self, name):
+        """
+        Records the first time `name` happens; later calls are ignored.
+        """
+        if name not in self.marks:
+            self.marks[name] = time.perf_counter() - self.start
+
+    def summary(self):
+        return {'phases': sorted(self.phases, key=lambda p: p['start_s']), 'marks': dict(self.marks)}
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.summary(), f, indent=2)
+
+    def print_timeline(self):
+        summary = self.summary()
+        end = max([p['end_s'] for p in summary['phases']] + list(summary['marks'].values()) + [1e-9])
+        print(f"\n--- Startup timeline ({end:.2f}s) ---")
+        for p in summary['phases']:
+            first = int(p['start_s'] / end * TIMELINE_WIDTH)
+            last = max(first + 1, int(p['end_s'] / end * TIMELINE_WIDTH))
+            bar = ' ' * first + '#' * (last - first)
+            print(f"{p['phase']:<18}{p['start_s']:>7.2f}s {p['end_s'] - p['start_s']:>6.2f}s |{bar:<{TIMELINE_WIDTH}}| {p['thread']}")
+        for name, at in summary['marks'].items():
+            print(f"{name:<18}{at:>7.2f}s")
+
+
+def _release(resource):
+    # Cameras have release(), landmark backends close(); models hold nothing to free
+    for method in ('release', 'close'):
+        if hasattr(resource, method):
+            try:
+                getattr(resource, method)()
+            except Exception:
+                pass
+            return
+
+
+def run_startup(tasks, timeline, parallel=True, main_thread=()):
+    """
+    Runs (name, function) startup tasks, each timed as a phase, either in
+    parallel or one after another. Returns {name: result}.
+
+    In parallel mode the tasks named in `main_thread` run on the calling
+    thread while the others run on a pool; the camera belongs there, since
+    macOS only grants camera access (AVFoundation) on the main thread.
+    If any task raises, the results already acquired are released
+    (release() / close()) and the first exception is re-raised.
+    """
+    def timed(name, function):
+        with timeline.phase(name):
+            return function()
+
+    results, errors = {}, []
+    if not parallel:
+        for name, function in tasks:
+            try:
+                results[name] = timed(name, function)
+            except Exception as e:
+                errors.append(e)
+                break
+    else:
+        pooled = [(name, function) for name, function in tasks if name not in main_thread]
+        with ThreadPoolExecutor(max_workers=max(1, len(pooled)), thread_name_prefix='startup') as executor:
+            futures = [(name, executor.submit(timed, name, function)) for name, function in pooled]
+            for name, function in tasks:
+                if name in main_thread:
+                    try:
+                        results[name] = timed(name, function)
+                    except Exception as e:
+                        errors.append(e)
+            for name, future in futures:
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    errors.append(e)
+
+    if errors:
+        for resource in results.values():
+            _release(resource)
+        raise errors[0]
+    return results
+
+
+def warm_up_engine(engine, calls=WARMUP_CALLS):
+    """
+    Runs the model on zeros so tracing / interpreter allocation happens
+    before the first real frame.
+    """
+    dummy = np.zeros((1,) + tuple(engine.input_shape[1:]), dtype=np.float32)
+    for _ in range(calls):
+        engine.predict(dummy)
+
+
+def warm_up_holistic(holistic, shape=WARMUP_FRAME_SHAPE):
+    holistic.process(np.zeros(shape, dtype=np.uint8))
@@ -0,0 +1,89 @@
+# streaming_lstm.py
+
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.layers import LSTM
+
+# --- Configuration ---
+# Staggered state copies kept by StreamingLSTM. 1 = a single state reset every
+# T frames; T = exact parity with the windowed model (one row is always T frames old).
+DEFAULT_STREAMS = 4
+
+
+def build_streaming_model(model, batch_size=1):
+    """
+    Rebuilds a trained (T, F) -> classes LSTM stack as a stateful model that
+    takes one frame per call, (batch_size, 1, F), and copies the weights over.
+    Dropout is kept in the graph but is a no-op at inference.
+    """
+    num_features = model.input_shape[-1]
+    inputs = tf.keras.Input(batch_shape=(batch_size, 1, num_features))
+    x = inputs
+    for layer in model.layers:
+        config = layer.get_config()
+        config.pop('batch_input_shape', None)
+        if isinstance(layer, LSTM):
+            config['stateful'] = True
+        clone = layer.__class__.from_config(config)
+        x = clone(x)
+        clone.set_weights(layer.get_weights())
+    return tf.keras.Model(inputs, x)
+
+
+class StreamingLSTM:
+    """
+    Advances the LSTM state by one frame per camera frame instead of re-running
+    all T steps of the sliding window.
+
+    `streams` staggered copies of the state run side by side as one batch; each
+    is reset every T frames, at evenly spaced offsets, and the prediction comes
+    from the copy with the longest history (between T - T/streams + 1 and T
+    frames). Each frame costs one batched single step whatever T is.
+    """
+
+    def __init__(self, model, streams=DEFAULT_STREAMS):
+        self.window = model.input_shape[1]
+        self.num_features = model.input_shape[2]
+        self.streams = max(1, min(int(streams), self.window))
+        self.model = build_streaming_model(model, self.streams)
+        self._lstm_layers = [layer for layer in self.model.layers if isinstance(layer, LSTM)]
+        signature = [tf.TensorSpec(shape=(self.streams, 1, self.num_features), dtype=tf.float32)]
+        self._forward = tf.function(lambda x: self.model(x, training=False), input_signature=signature)
+        self._input = np.zeros((self.streams, 1, self.num_features), dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        for layer in self._lstm_layers:
+            layer.reset_states()
+        # Every copy starts from the zero state, as if preceded by zero frames
+        self._ages = np.array([i * self.window // self.streams for i in range(self.streams)])
+        self.frames_seen = 0
+
+    def _reset_rows(self, rows):
+        for layer in self._lstm_layers:
+            for state in layer.states:
+                value = state.numpy()
+                value[rows] = 0.0
+                state.assign(value)
+
+    def step(self, keypoints):
+        """
+        Feeds one frame of keypoints and returns class probabilities for the
+        trailing window.
+        """
+        expired = self._ages >= self.window
+        if expired.any():
+            self._reset_rows(np.flatnonzero(expired))
+            self._ages[expired] = 0
+        self._input[:, 0, :] = keypoints
+        probs = self._forward(self._input).numpy()
+        self._ages += 1
+        self.frames_seen += 1
+        return probs[np.argmax(self._ages)]
+
+    def is_ready(self):
+        """
+        True once a full window of frames has been seen (when the windowed
+        detector would start predicting).
+        """
+        return self.frames_seen >= self.window
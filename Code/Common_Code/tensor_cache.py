@@ -0,0 +1,119 @@
+# tensor_cache.py
+
+import os
+import json
+import time
+import shutil
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+from npy_loader import scan_npy_tree, LOAD_WORKERS
+
+# --- Cache Layout ---
+# <cache_dir>/<name>-<fingerprint[:16]>/
+#   cache.json     fingerprint, array names, build time (written last: its presence marks a complete entry)
+#   <array>.npy    one file per prepared array, opened memory-mapped on a hit
+# The fingerprint covers every input file's path, size and mtime, the action
+# list and the preprocessing parameters, so any change to them is a miss.
+# Entries of the same name with another fingerprint are deleted once a new entry is written.
+CACHE_VERSION = 1
+MANIFEST_NAME = 'cache.json'
+
+
+def input_files(data_path, actions, store_path=None):
+    """
+    The files a trainer's data comes from: the packed store's files, or every
+    .npy of the <split>/<action> tree.
+    """
+    if store_path:
+        return sorted(os.path.join(store_path, name) for name in os.listdir(store_path))
+    return [path for _, _, _, path in scan_npy_tree(data_path, actions)]
+
+
+def _stat(path):
+    info = os.stat(path)
+    return info.st_size, info.st_mtime_ns
+
+
+def fingerprint(files, actions, params, workers=LOAD_WORKERS):
+    """
+    SHA-256 over the cache version, actions, params (JSON-serializable) and
+    each file's path, size and mtime. Only stats the files, never reads them.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps({'version': CACHE_VERSION, 'actions': [str(a) for a in actions], 'params': params},
+                             sort_keys=True).encode())
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        for path, (size, mtime) in zip(files, executor.map(_stat, files)):
+            digest.update(f"{os.path.abspath(path)}\0{size}\0{mtime}\n".encode())
+    return digest.hexdigest()
+
+
+def _open_entry(entry_path, key):
+    try:
+        with open(os.path.join(entry_path, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('key') != key:
+        return None
+    try:
+        return {name: np.load(os.path.join(entry_path, name + '.npy'), mmap_mode='r') for name in manifest['arrays']}
+    except (OSError, ValueError):
+        return None  # damaged entry, rebuild it
+
+
+def load_or_build(cache_dir, name, key, build):
+    """
+    Returns the arrays cached under `name` for fingerprint `key`, memory-mapped,
+    or calls build() -> {array name: array}, stores its result and returns it.
+    """
+    entry_path = os.path.join(cache_dir, f'{name}-{key[:16]}')
+    start = time.perf_counter()
+    arrays = _open_entry(entry_path, key)
+    if arrays is not None:
+        size_mb = sum(array.nbytes for array in arrays.values()) / 1e6
+        print(f"Tensor cache hit '{os.path.basename(entry_path)}' ({size_mb:.1f} MB, opened in {time.perf_counter() - start:.2f}s)")
+        return arrays
+
+    print(f"Tensor cache miss for '{name}': preparing the data...")
+    arrays = build()
+    # Write into a temporary directory and rename, so a crash never leaves a half entry behind
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f'{entry_path}.tmp-{os.getpid()}'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    for array_name, array in arrays.items():
+        np.save(os.path.join(tmp_path, array_name + '.npy'), np.asarray(array))
+    with open(os.path.join(tmp_path, MANIFEST_NAME), 'w') as f:
+        json.dump({'key': key, 'arrays': list(arrays), 'created': time.time()}, f, indent=2)
+    shutil.rmtree(entry_path, ignore_errors=True)
+    os.rename(tmp_path, entry_path)
+
+    for other in os.listdir(cache_dir):
+        if other.startswith(f'{name}-') and other != os.path.basename(entry_path) and '.tmp-' not in other:
+            shutil.rmtree(os.path.join(cache_dir, other), ignore_errors=True)
+    size_mb = sum(np.asarray(array).nbytes for array in arrays.values()) / 1e6
+    print(f"Prepared data cached as '{os.path.basename(entry_path)}' ({size_mb:.1f} MB) in {time.perf_counter() - start:.2f}s")
+    return arrays
+
+
+def pack_sequences(sequences):
+    """
+    Variable-length (T, F) sequences -> one (total_frames, F) float32 array
+    and the offsets of each sequence (len(sequences) + 1 values). Empty
+    videos, saved as (0,) arrays, are packed as zero-frame sequences.
+    """
+    features = next((np.shape(s)[-1] for s in sequences if np.ndim(s) == 2), 0)
+    sequences = [np.reshape(s, (0, features)) if np.size(s) == 0 else s for s in sequences]
+    offsets = np.concatenate([[0], np.cumsum([len(s) for s in sequences])]).astype(np.int64)
+    frames = np.concatenate(sequences).astype(np.float32) if sequences else np.zeros((0, 0), dtype=np.float32)
+    return frames, offsets
+
+
+def unpack_sequences(frames, offsets):
+    """
+    Views of the individual sequences of a pack_sequences() result.
+    """
+    return [frames[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
@@ -0,0 +1,235 @@
+# training_pipeline.py
+
+import sys
+import time
+import resource
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import tensorflow as tf
+
+from feature_store import FeatureStore, has_split
+from sequence_batching import plan_batches, pad_batch, resample_sequence
+from npy_loader import scan_npy_tree, read_npy_header, sequence_shapes, LOAD_WORKERS
+
+# --- Configuration ---
+# Samples (after augmentation) held for shuffling; bounds memory instead of the dataset size
+SHUFFLE_BUFFER = 2048
+BATCH_SIZE = 32
+PIPELINE_CHOICES = ['memory', 'streaming']
+# 'batch' augments each training batch on the fly; 'copies' stores flipped / noisy copies up front
+AUGMENTATION_CHOICES = ['batch', 'copies']
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KB on Linux, bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024.0 * 1024.0 if sys.platform == 'darwin' else 1024.0)
+
+
+class SampleIndex:
+    """
+    File list (or feature store rows) and labels of one split, without the
+    features. Shapes come from the .npy headers / store index, so building
+    the index reads no sample data. read(i) loads one sample on demand.
+    """
+
+    def __init__(self, labels, shapes, paths=None, store=None, rows=None):
+        self.labels = np.asarray(labels, dtype=np.int32)
+        self.shapes = shapes
+        self.paths = paths
+        self.store = store
+        self.rows = rows
+        self.num_features = shapes[0][-1] if shapes else 0
+        self.is_sequence = bool(shapes) and len(shapes[0]) == 2
+
+    @classmethod
+    def from_npy_tree(cls, data_path, actions, split, workers=LOAD_WORKERS):
+        # Same action-major order as load_npy_tree(); headers are read on a thread pool
+        label_map = {label: num for num, label in enumerate(actions)}
+        files = scan_npy_tree(data_path, actions, [split])
+        paths = [path for _, _, _, path in files]
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            shapes = sequence_shapes([shape for shape, _, _ in executor.map(read_npy_header, paths)])
+        return cls([label_map[action] for _, action, _, _ in files], shapes, paths=paths)
+
+    @classmethod
+    def from_store(cls, store_path, actions, split):
+        label_map = {label: num for num, label in enumerate(actions)}
+        if not has_split(store_path, split):
+            return cls([], [])
+        store = FeatureStore(store_path, split)
+        rows = [i for i in range(len(store)) if str(store.labels[i]) in label_map]
+        labels = [label_map[str(store.labels[i])] for i in rows]
+        if store.is_sequence:
+            shapes = [(int(store.lengths[i]), store.num_features) for i in rows]
+        else:
+            shapes = [(store.num_features,)] * len(rows)
+        return cls(labels, shapes, store=store, rows=rows)
+
+    @classmethod
+    def open(cls, data_path, actions, split, store_path=None, workers=LOAD_WORKERS):
+        if store_path:
+            return cls.from_store(store_path, actions, split)
+        return cls.from_npy_tree(data_path, actions, split, workers)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def max_length(self):
+        return max((shape[0] for shape in self.shapes), default=0) if self.is_sequence else 1
+
+    def read(self, i):
+        if self.store is not None:
+            return np.array(self.store.sample(self.rows[i]), dtype=np.float32)
+        # Empty videos are stored as (0,); read them back as (0, features)
+        return np.load(self.paths[i]).astype(np.float32).reshape(self.shapes[i])
+
+    def stack(self, indices=None, max_len=None, resample_length=None):
+        """
+        Loads the given samples (default: all) into one array, post-padding
+        sequences with zeros to max_len like pad_sequences (or resampling them
+        to resample_length). Meant for small sets such as the test split or
+        calibration data.
+        """
+        indices = range(len(self)) if indices is None else indices
+        if self.is_sequence and resample_length:
+            return np.stack([resample_sequence(self.read(i), resample_length) for i in indices])
+        if self.is_sequence:
+            max_len = max_len or self.max_length()
+            X = np.zeros((len(indices), max_len, self.num_features), dtype=np.float32)
+            for row, i in enumerate(indices):
+                sample = self.read(i)[:max_len]
+                X[row, :len(sample)] = sample
+            return X
+        return np.stack([self.read(i) for i in indices]) if len(indices) else np.zeros((0, self.num_features), dtype=np.float32)
+
+
+def make_dataset(index, num_classes, training=True, augment=None, max_len=None,
+                 batch_size=BATCH_SIZE, shuffle_buffer=SHUFFLE_BUFFER, seed=None, batch_augment=None,
+                 bucket_boundaries=None, resample_length=None):
+    """
+    tf.data pipeline over a SampleIndex: shuffled file order, parallel lazy
+    reads, optional augmentation (augment(x) returns a list of extra copies,
+    like the trainers' flip + noise), a bounded shuffle buffer, batching
+    (zero post-padding to max_len for sequences) and prefetching.
+    batch_augment (a BatchAugmenter) is applied to each padded batch instead.
+    Sequences can instead be grouped by length (bucket_boundaries, padded
+    to each batch's longest) or resampled to resample_length frames.
+    Labels are one-hot, as with to_categorical.
+    """
+    if index.is_sequence:
+        sample_shape = (resample_length, index.num_features) if resample_length else (None, index.num_features)
+    else:
+        sample_shape = (index.num_features,)
+
+    def load(i):
+        x = index.read(int(i))
+        if resample_length:
+            x = resample_sequence(x, resample_length)
+        variants = [x] + (list(augment(x)) if augment else [])
+        return (np.stack(variants).astype(np.float32),
+                np.full(len(variants), index.labels[int(i)], dtype=np.int32))
+
+    def load_op(i):
+        x, y = tf.numpy_function(load, [i], (tf.float32, tf.int32))
+        x.set_shape((None,) + sample_shape)
+        y.set_shape((None,))
+        return x, y
+
+    dataset = tf.data.Dataset.from_tensor_slices(np.arange(len(index), dtype=np.int64))
+    if training:
+        # Shuffling indices is cheap, so the file order is a full permutation every epoch
+        dataset = dataset.shuffle(max(len(index), 1), seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.map(load_op, num_parallel_calls=tf.data.AUTOTUNE, deterministic=not training)
+    dataset = dataset.unbatch()
+    if training:
+        # Mixes the augmented copies of a sample with other samples
+        dataset = dataset.shuffle(shuffle_buffer, seed=seed, reshuffle_each_iteration=True)
+    dataset = dataset.map(lambda x, y: (x, tf.one_hot(y, num_classes)), num_parallel_calls=tf.data.AUTOTUNE)
+    if index.is_sequence and bucket_boundaries:
+        dataset = dataset.bucket_by_sequence_length(lambda x, y: tf.shape(x)[0], bucket_boundaries,
+                                                    [batch_size] * (len(bucket_boundaries) + 1),
+                                                    padded_shapes=([None, index.num_features], [num_classes]))
+    elif index.is_sequence:
+        length = resample_length or max_len or index.max_length()
+        dataset = dataset.padded_batch(batch_size, padded_shapes=([length, index.num_features], [num_classes]))
+    else:
+        dataset = dataset.batch(batch_size)
+    if batch_augment is not None:
+        def augment_op(x, y):
+            augmented = tf.numpy_function(batch_augment, [x], tf.float32)
+            augmented.set_shape(x.shape)
+            return augmented, y
+        dataset = dataset.map(augment_op, num_parallel_calls=tf.data.AUTOTUNE)
+    return dataset.prefetch(tf.data.AUTOTUNE)
+
+
+class AugmentedBatches(tf.keras.utils.Sequence):
+    """
+    In-memory training batches for fit(), reshuffled every epoch and passed
+    through a BatchAugmenter, so no augmented copies are stored.
+    """
+
+    def __init__(self, X, y, augmenter, batch_size=BATCH_SIZE, seed=None):
+        super().__init__()
+        self.X, self.y = X, y
+        self.augmenter = augmenter
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(seed)
+        self.order = self.rng.permutation(len(X))
+
+    def __len__(self):
+        return int(np.ceil(len(self.X) / self.batch_size))
+
+    def __getitem__(self, i):
+        rows = np.sort(self.order[i * self.batch_size:(i + 1) * self.batch_size])
+        return self.augmenter(self.X[rows]), self.y[rows]
+
+    def on_epoch_end(self):
+        self.order = self.rng.permutation(len(self.X))
+
+
+class BucketedBatches(tf.keras.utils.Sequence):
+    """
+    In-memory variable-length sequences batched by length bucket: each batch
+    is zero-padded only to its longest sequence. The batch plan is redrawn
+    every epoch; an optional BatchAugmenter is applied per batch.
+    """
+
+    def __init__(self, sequences, y, boundaries, augmenter=None, batch_size=BATCH_SIZE, shuffle=True, seed=None):
+        super().__init__()
+        self.sequences, self.y = sequences, y
+        self.lengths = np.array([len(s) for s in sequences])
+        self.boundaries = boundaries
+        self.augmenter = augmenter
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.rng = np.random.default_rng(seed)
+        self.on_epoch_end()
+
+    def __len__(self):
+        return len(self.batches)
+
+    def __getitem__(self, i):
+        rows = self.batches[i]
+        X = pad_batch([self.sequences[row] for row in rows])
+        return (self.augmenter(X) if self.augmenter else X), self.y[rows]
+
+    def on_epoch_end(self):
+        self.batches = plan_batches(self.lengths, self.batch_size, self.boundaries, self.rng, self.shuffle)
+
+
+class FirstStepTimer(tf.keras.callbacks.Callback):
+    """
+    Prints the time from `start` (taken before loading data) to the end of
+    the first training step, and the peak RSS at that point.
+    """
+
+    def __init__(self, start):
+        super().__init__()
+        self.start = start
+        self.elapsed = None
+
+    def on_train_batch_end(self, batch, logs=None):
+        if self.elapsed is None:
+            self.elapsed = time.perf_counter() - self.start
+            print(f"\nTime to first training step: {self.elapsed:.2f}s (peak RSS {peak_rss_mb():.0f} MB)")
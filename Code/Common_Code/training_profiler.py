@@ -0,0 +1,226 @@
+# training_profiler.py
+
+import csv
+import json
+import time
+import threading
+from collections import deque
+import numpy as np
+import tensorflow as tf
+
+from training_pipeline import peak_rss_mb, BATCH_SIZE
+
+# --- Configuration ---
+PROFILE_SUFFIX = '_training_profile'
+# Above this share of step time spent waiting on input, the run is reported as input-bound
+INPUT_BOUND_SHARE = 0.2
+
+
+class _TimedSequence(tf.keras.utils.Sequence):
+    """
+    Wraps a Keras Sequence and tells the profiler how long each batch took
+    to build. Keras reads batches ahead on a background thread, so when a
+    batch is ready says nothing about how long fit() waited for it.
+    """
+
+    def __init__(self, sequence, profiler):
+        super().__init__()
+        self.sequence = sequence
+        self.profiler = profiler
+
+    def __len__(self):
+        return len(self.sequence)
+
+    def __getitem__(self, i):
+        start = time.perf_counter()
+        batch = self.sequence[i]
+        self.profiler._batch_loaded(len(batch[0]), time.perf_counter() - start)
+        return batch
+
+    def on_epoch_end(self):
+        self.sequence.on_epoch_end()
+
+
+class TrainingProfiler(tf.keras.callbacks.Callback):
+    """
+    Per-step training throughput: step time, samples/s, and - for inputs
+    passed through instrument() - how much of each step was spent waiting
+    for the batch versus computing. Also records epoch wall time and peak
+    RSS, prints a summary when fit() ends and writes
+    <report_prefix>.json (summary + epochs) and <report_prefix>.csv (steps).
+
+        profiler = TrainingProfiler(os.path.join(MODEL_SAVE_PATH, 'model' + PROFILE_SUFFIX))
+        model.fit(profiler.instrument(train_data), callbacks=[profiler], ...)
+
+    For a tf.data.Dataset, a batch is "ready" when the last pipeline stage
+    hands it to fit(); the wait is the part of the step before that moment.
+    A Keras Sequence is read ahead on a background thread, so its wait cannot
+    be measured: the time spent in __getitem__ is reported as loader time
+    instead, and the run counts as input-bound when building a batch takes
+    longer than a training step. Plain NumPy inputs are not instrumented.
+    """
+
+    def __init__(self, report_prefix=None, batch_size=BATCH_SIZE):
+        super().__init__()
+        self.report_prefix = report_prefix
+        self.batch_size = batch_size
+        self.instrumented = False
+        self.input_kind = None  # 'dataset' (wait measured) or 'sequence' (loader time measured)
+        self._ready = deque()
+        self._loads = deque()
+        self._lock = threading.Lock()
+
+    # --- Input instrumentation ---
+    def instrument(self, data):
+        """
+        Returns `data` instrumented for the profiler: a final synchronous
+        ready-time marker for a tf.data.Dataset, a loader timer around a Keras
+        Sequence. Anything else is returned unchanged.
+        """
+        if isinstance(data, tf.data.Dataset):
+            self.instrumented = True
+            self.input_kind = 'dataset'
+
+            def mark(x, y):
+                marker = tf.py_function(lambda n: self._batch_ready(int(n)) or 0, [tf.shape(x)[0]], tf.int64)
+                with tf.control_dependencies([marker]):
+                    return tf.identity(x), y
+
+            options = tf.data.Options()
+            # A prefetch injected after the marker would hide the wait
+            if hasattr(options.experimental_optimization, 'inject_prefetch'):
+                options.experimental_optimization.inject_prefetch = False
+            return data.map(mark).with_options(options)
+        if isinstance(data, tf.keras.utils.Sequence):
+            self.instrumented = True
+            self.input_kind = 'sequence'
+            return _TimedSequence(data, self)
+        return data
+
+    def _batch_ready(self, samples):
+        with self._lock:
+            self._ready.append((time.perf_counter(), samples))
+
+    def _batch_loaded(self, samples, load_s):
+        with self._lock:
+            self._loads.append((load_s, samples))
+
+    # --- Callback hooks ---
+    def on_train_begin(self, logs=None):
+        # Keras may peek at the first batch while building the input; drop it
+        with self._lock:
+            self._ready.clear()
+            self._loads.clear()
+        self.steps = []
+        self.epochs = []
+        self.train_start = time.perf_counter()
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.epoch = epoch
+        self.epoch_start = time.perf_counter()
+        self.epoch_first_step = len(self.steps)
+
+    def on_train_batch_begin(self, batch, logs=None):
+        self.step_start = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        end = time.perf_counter()
+        step_s = end - self.step_start
+        with self._lock:
+            ready = self._ready.popleft() if self._ready else None
+            # Read-ahead batches are matched to steps in order
+            load = self._loads.popleft() if self._loads else None
+        samples, wait_s, load_s = self.batch_size, None, None
+        if ready is not None:
+            ready_time, samples = ready
+            wait_s = min(max(ready_time - self.step_start, 0.0), step_s)
+        elif load is not None:
+            load_s, samples = load
+        self.steps.append({
+            'epoch': self.epoch, 'step': batch, 'samples': samples,
+            'step_ms': step_s * 1000.0,
+            'input_wait_ms': None if wait_s is None else wait_s * 1000.0,
+            'compute_ms': None if wait_s is None else (step_s - wait_s) * 1000.0,
+            'loader_ms': None if load_s is None else load_s * 1000.0,
+            'samples_per_s': samples / step_s if step_s > 0 else 0.0,
+        })
+
+    def on_epoch_end(self, epoch, logs=None):
+        steps = self.steps[self.epoch_first_step:]
+        row = {'epoch': epoch, 'wall_s': time.perf_counter() - self.epoch_start, 'peak_rss_mb': peak_rss_mb()}
+        row.update(self._totals(steps))
+        row.update({key: float(value) for key, value in (logs or {}).items()})
+        self.epochs.append(row)
+
+    def on_train_end(self, logs=None):
+        self.print_summary()
+        if self.report_prefix:
+            self.save_report(self.report_prefix)
+            print(f"Training profile saved to '{self.report_prefix}.json' and '{self.report_prefix}.csv'")
+
+    # --- Reporting ---
+    def _totals(self, steps):
+        step_s = sum(step['step_ms'] for step in steps) / 1000.0
+        samples = sum(step['samples'] for step in steps)
+        waits = [step['input_wait_ms'] for step in steps if step['input_wait_ms'] is not None]
+        loads = [step['loader_ms'] for step in steps if step['loader_ms'] is not None]
+        return {
+            'steps': len(steps), 'samples': samples,
+            'samples_per_s': samples / step_s if step_s > 0 else 0.0,
+            'mean_step_ms': step_s * 1000.0 / len(steps) if steps else 0.0,
+            'input_wait_share': sum(waits) / (step_s * 1000.0) if waits and step_s > 0 else None,
+            'mean_loader_ms': sum(loads) / len(loads) if loads else None,
+        }
+
+    def summary(self):
+        step_ms = np.array([step['step_ms'] for step in self.steps]) if self.steps else np.zeros(1)
+        totals = self._totals(self.steps)
+        if totals['input_wait_share'] is not None:
+            bound = 'input' if totals['input_wait_share'] > INPUT_BOUND_SHARE else 'compute'
+        elif totals['mean_loader_ms'] is not None:
+            # Read-ahead only hides the loader while it builds batches faster than fit() consumes them
+            bound = 'input' if totals['mean_loader_ms'] > totals['mean_step_ms'] else 'compute'
+        else:
+            bound = None
+        return {
+            **totals,
+            'p50_step_ms': float(np.percentile(step_ms, 50)),
+            'p95_step_ms': float(np.percentile(step_ms, 95)),
+            'epochs': len(self.epochs),
+            'mean_epoch_s': float(np.mean([e['wall_s'] for e in self.epochs])) if self.epochs else 0.0,
+            'total_s': time.perf_counter() - self.train_start,
+            'peak_rss_mb': peak_rss_mb(),
+            'input_instrumented': self.instrumented,
+            'input_kind': self.input_kind,
+            'bound': bound,
+        }
+
+    def save_report(self, path_prefix):
+        """
+        Writes <path_prefix>.json (summary and per-epoch rows) and
+        <path_prefix>.csv (one row per training step). Returns the summary.
+        """
+        summary = self.summary()
+        with open(path_prefix + '.json', 'w') as f:
+            json.dump({'summary': summary, 'epochs': self.epochs}, f, indent=2)
+        with open(path_prefix + '.csv', 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['epoch', 'step', 'samples', 'step_ms', 'input_wait_ms', 'compute_ms', 'loader_ms', 'samples_per_s'])
+            writer.writeheader()
+            writer.writerows(self.steps)
+        return summary
+
+    def print_summary(self):
+        summary = self.summary()
+        print(f"\n--- Training profile: {summary['epochs']} epochs, {summary['steps']} steps, "
+              f"{summary['total_s']:.1f}s, peak RSS {summary['peak_rss_mb']:.0f} MB ---")
+        print(f"epoch wall time  {summary['mean_epoch_s']:.2f}s mean")
+        print(f"step time        {summary['mean_step_ms']:.2f} ms mean, {summary['p50_step_ms']:.2f} p50, {summary['p95_step_ms']:.2f} p95")
+        print(f"throughput       {summary['samples_per_s']:.0f} samples/s")
+        if summary['input_wait_share'] is not None:
+            print(f"input wait       {summary['input_wait_share']:.1%} of step time -> {summary['bound']}-bound")
+        elif summary['mean_loader_ms'] is not None:
+            print("input wait       not measurable (Keras reads Sequence batches ahead on a background thread)")
+            print(f"loader time      {summary['mean_loader_ms']:.2f} ms per batch vs {summary['mean_step_ms']:.2f} ms per step "
+                  f"-> {summary['bound']}-bound")
+        else:
+            print("input wait       not measured (in-memory arrays)")
@@ -0,0 +1,114 @@
+# video_stream.py
+
+import queue
+import threading
+import cv2
+
+# --- Configuration ---
+# Max decoded RGB frames held ahead of Holistic. 64 frames of 640x480 RGB is ~60 MB.
+DEFAULT_QUEUE_SIZE = 64
+
+_END_OF_VIDEO = object()
+
+
+class _DecodeError:
+    def __init__(self, error):
+        self.error = error
+
+
+def read_video_frames(video_path, fps=None):
+    """
+    Plain sequential decode: yields the RGB frames of one video. If `fps` is
+    a dict, the capture's frame rate is stored in it under video_path.
+    """
+    cap = cv2.VideoCapture(video_path)
+    if fps is not None:
+        fps[video_path] = cap.get(cv2.CAP_PROP_FPS)
+    while cap.isOpened():
+        ret, frame = cap.read()
+        if not ret: break
+        yield cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    cap.release()
+
+
+class PipelinedVideoReader:
+    """
+    Decodes a list of videos on a background thread into a bounded queue of
+    RGB frames, so the caller can run Holistic while the next frames (and the
+    next video) are being decoded. cv2 releases the GIL while decoding and
+    converting, so the two stages really do overlap. `fps` maps each video
+    path to its capture's frame rate once decoding of it has started.
+    """
+
+    def __init__(self, video_paths, queue_size=DEFAULT_QUEUE_SIZE, fps=None):
+        self.video_paths = list(video_paths)
+        self.fps = {} if fps is None else fps
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._decode_all, name='video-decoder', daemon=True)
+
+    # --- Decoder thread ---
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _decode_all(self):
+        try:
+            for video_path in self.video_paths:
+                for frame in read_video_frames(video_path, self.fps):
+                    if not self._put(frame):
+                        return
+                if not self._put(_END_OF_VIDEO):
+                    return
+        except Exception as e:
+            self._put(_DecodeError(e))
+
+    # --- Consumer side ---
+    def _frames(self):
+        while True:
+            item = self._queue.get()
+            if item is _END_OF_VIDEO:
+                return
+            if isinstance(item, _DecodeError):
+                raise item.error
+            yield item
+
+    def videos(self):
+        """
+        Yields (video_path, frames) in input order. 'frames' must be consumed
+        before moving on; anything left unread is drained automatically.
+        """
+        if not self._thread.is_alive():
+            self._thread.start()
+        for video_path in self.video_paths:
+            frames = self._frames()
+            yield video_path, frames
+            for _ in frames:
+                pass
+
+    def close(self):
+        self._stop.set()
+        self._thread.join(timeout=1.0)
+
+
+def iter_videos(video_paths, streaming=False, queue_size=DEFAULT_QUEUE_SIZE, fps=None):
+    """
+    Yields (video_path, RGB frame iterator) for every video, either decoding
+    inline (streaming=False) or through a PipelinedVideoReader. Pass a dict
+    as `fps` to collect each video's frame rate from the decoding capture.
+    """
+    if not streaming:
+        for video_path in video_paths:
+            yield video_path, read_video_frames(video_path, fps)
+        return
+
+    reader = PipelinedVideoReader(video_paths, queue_size, fps)
+    try:
+        yield from reader.videos()
+    finally:
+        reader.close()
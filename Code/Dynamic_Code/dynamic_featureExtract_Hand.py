@@ -1,71 +1,51 @@
 # dynamic_feature_extractor_hands_only.py
 
-import cv2
 import os
-import numpy as np
-import mediapipe as mp
+import sys
+import time
+import argparse
 
-# Initialize MediaPipe Holistic model
-mp_holistic = mp.solutions.holistic
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from landmark_utils import HANDS_LAYOUT
+from video_stream import DEFAULT_QUEUE_SIZE
+from landmark_backends import create_backend, resolve_backend, BACKEND_CHOICES, HOLISTIC_BACKEND
+from feature_store import record_backend
+from dynamic_feature_extractor import collect_jobs, extract_videos, save_videos
 
 # --- Configuration ---
 SPLIT_DATA_PATH = "Dynamic_Data_Split"
 OUTPUT_DATA_PATH = "Dynamic_Processed_Data_Hands_Only" # Changed output path
 
-# --- Landmark Extraction Function for DYNAMIC data (MODIFIED) ---
-def extract_landmarks_dynamic(results):
-    """
-    Extracts landmarks for ONLY the left and right hands.
-    Pose feature has been removed.
-    """
-    # pose = np.array([[res.x, res.y, res.z, res.visibility] for res in results.pose_landmarks.landmark]).flatten() if results.pose_landmarks else np.zeros(33*4) # This line is removed
-    lh = np.array([[res.x, res.y, res.z] for res in results.left_hand_landmarks.landmark]).flatten() if results.left_hand_landmarks else np.zeros(21*3)
-    rh = np.array([[res.x, res.y, res.z] for res in results.right_hand_landmarks.landmark]).flatten() if results.right_hand_landmarks else np.zeros(21*3)
-    return np.concatenate([lh, rh]) # 'pose' is removed from concatenation
-
 # --- Main Execution (remains the same) ---
 if __name__ == "__main__":
-    print("Starting the DYNAMIC feature extraction process (Hands Only)...")
-
-    os.makedirs(OUTPUT_DATA_PATH, exist_ok=True)
-    
-    with mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5) as holistic:
-        
-        for split_part in ['train', 'val', 'test']:
-            split_path = os.path.join(SPLIT_DATA_PATH, split_part)
-            output_split_path = os.path.join(OUTPUT_DATA_PATH, split_part)
-            os.makedirs(output_split_path, exist_ok=True)
-            
-            if not os.path.exists(split_path):
-                print(f"Warning: Directory '{split_path}' not found. Skipping.")
-                continue
-
-            print(f"\n--- Processing '{split_part}' set for DYNAMIC data ---")
-            
-            for class_name in os.listdir(split_path):
-                class_path = os.path.join(split_path, class_name)
-                if not os.path.isdir(class_path):
-                    continue
+    parser = argparse.ArgumentParser(description="Extract 126 hand-only features from the split dynamic videos.")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Decode frames (and the next video) on a background thread while Holistic runs.")
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Max decoded frames buffered ahead of Holistic in streaming mode.")
+    parser.add_argument('--backend', choices=BACKEND_CHOICES, default=HOLISTIC_BACKEND,
+                        help="MediaPipe models to run (default Holistic, like the detectors); 'hands' / 'auto' run Hands alone "
+                             "and need a model trained on Hands features.")
+    parser.add_argument('--store', default=None,
+                        help="Write one packed feature store to this directory instead of per-video .npy files.")
+    args = parser.parse_args()
 
-                print(f"Processing dynamic class: '{class_name}'")
-                
-                output_class_path = os.path.join(output_split_path, class_name)
-                os.makedirs(output_class_path, exist_ok=True)
-
-                for file_name in os.listdir(class_path):
-                    if file_name.endswith('.mp4'):
-                        file_path = os.path.join(class_path, file_name)
-                        cap = cv2.VideoCapture(file_path)
-                        video_landmarks = []
-                        while cap.isOpened():
-                            ret, frame = cap.read()
-                            if not ret: break
-                            image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                            results = holistic.process(image)
-                            keypoints = extract_landmarks_dynamic(results)
-                            video_landmarks.append(keypoints)
-                        cap.release()
-                        npy_path = os.path.join(output_class_path, file_name.split('.')[0])
-                        np.save(npy_path, np.array(video_landmarks))
-
-    print("\nDynamic feature extraction (Hands Only) completed successfully!")
\ No newline at end of file
+    print("Starting the DYNAMIC feature extraction process (Hands Only)...")
+    try:
+        record_backend(args.store or OUTPUT_DATA_PATH, resolve_backend(HANDS_LAYOUT, args.backend))
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    # The .npy tree is only created when the features are saved there
+    if not args.store:
+        os.makedirs(OUTPUT_DATA_PATH, exist_ok=True)
+    jobs = collect_jobs(SPLIT_DATA_PATH, OUTPUT_DATA_PATH, create_dirs=not args.store)
+
+    start_time = time.time()
+    with create_backend(HANDS_LAYOUT, args.backend, min_detection_confidence=0.5, min_tracking_confidence=0.5) as holistic:
+        # Hands only: pose landmarks are not part of this layout
+        save_videos(extract_videos(holistic, jobs, HANDS_LAYOUT, args.streaming, args.queue_size), args.store)
+
+    print(f"\nDynamic feature extraction (Hands Only) completed successfully! "
+          f"{len(jobs)} videos in {time.time() - start_time:.1f}s.")
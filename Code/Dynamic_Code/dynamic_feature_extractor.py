@@ -1,10 +1,18 @@
 # dynamic_feature_extractor.py
 
-import cv2
 import os
+import sys
+import time
+import argparse
 import numpy as np
 import mediapipe as mp
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from landmark_utils import extract_landmarks, POSE_HANDS_LAYOUT
+from video_stream import iter_videos, DEFAULT_QUEUE_SIZE
+from feature_store import write_store, record_backend
+from landmark_backends import HOLISTIC_BACKEND
+
 # Initialize MediaPipe Holistic model
 mp_holistic = mp.solutions.holistic
 
@@ -12,60 +20,105 @@ mp_holistic = mp.solutions.holistic
 SPLIT_DATA_PATH = "Dynamic_Data_Split"
 OUTPUT_DATA_PATH = "Dynamic_Processed_Data"
 
-# --- Landmark Extraction Function for DYNAMIC data ---
-def extract_landmarks_dynamic(results):
+# --- Job Collection ---
+def collect_jobs(split_data_path, output_data_path, create_dirs=True):
     """
-    Extracts landmarks for pose, left hand, and right hand.
+    Lists every (split, class_name, video_path, npy_path) job in train/val/test
+    and creates the output class folders unless create_dirs is False (nothing
+    is saved as .npy with --store).
     """
-    pose = np.array([[res.x, res.y, res.z, res.visibility] for res in results.pose_landmarks.landmark]).flatten() if results.pose_landmarks else np.zeros(33*4)
-    lh = np.array([[res.x, res.y, res.z] for res in results.left_hand_landmarks.landmark]).flatten() if results.left_hand_landmarks else np.zeros(21*3)
-    rh = np.array([[res.x, res.y, res.z] for res in results.right_hand_landmarks.landmark]).flatten() if results.right_hand_landmarks else np.zeros(21*3)
-    return np.concatenate([pose, lh, rh])
+    jobs = []
+    for split_part in ['train', 'val', 'test']:
+        split_path = os.path.join(split_data_path, split_part)
+        output_split_path = os.path.join(output_data_path, split_part)
+        if create_dirs:
+            os.makedirs(output_split_path, exist_ok=True)
+
+        if not os.path.exists(split_path):
+            print(f"Warning: Directory '{split_path}' not found. Skipping.")
+            continue
+
+        print(f"\n--- Collecting '{split_part}' set for DYNAMIC data ---")
+
+        for class_name in os.listdir(split_path):
+            class_path = os.path.join(split_path, class_name)
+            if not os.path.isdir(class_path):
+                continue
+
+            output_class_path = os.path.join(output_split_path, class_name)
+            if create_dirs:
+                os.makedirs(output_class_path, exist_ok=True)
+
+            # Process only video files
+            class_jobs = [(split_part, class_name, os.path.join(class_path, file_name), os.path.join(output_class_path, file_name.split('.')[0]))
+                          for file_name in os.listdir(class_path) if file_name.endswith('.mp4')]
+            print(f"Dynamic class '{class_name}': {len(class_jobs)} videos")
+            jobs.extend(class_jobs)
+    return jobs
+
+# --- Extraction ---
+def extract_video_schemas(holistic, video_paths, layouts, streaming=False, queue_size=DEFAULT_QUEUE_SIZE, fps=None):
+    """
+    Decodes each video and runs Holistic once per frame, then derives every
+    requested layout from that single result. Yields
+    (video_path, {layout: landmarks}) with landmarks shaped (frames, features).
+    A dict passed as `fps` receives each video's frame rate (see iter_videos).
+    """
+    for video_path, frames in iter_videos(video_paths, streaming, queue_size, fps):
+        rows = {layout: [] for layout in layouts}
+        for image in frames:
+            results = holistic.process(image)
+            for layout in layouts:
+                rows[layout].append(extract_landmarks(results, layout))
+        yield video_path, {layout: np.array(layout_rows) for layout, layout_rows in rows.items()}
+
+def extract_videos(holistic, jobs, layout, streaming=False, queue_size=DEFAULT_QUEUE_SIZE):
+    """
+    Runs Holistic over every job's video and yields
+    (split, class_name, npy_path, landmarks) with landmarks shaped (frames, features).
+    """
+    jobs_by_video = {video_path: (split_part, class_name, npy_path) for split_part, class_name, video_path, npy_path in jobs}
+    for video_path, landmarks in extract_video_schemas(holistic, list(jobs_by_video), [layout], streaming, queue_size):
+        split_part, class_name, npy_path = jobs_by_video[video_path]
+        yield split_part, class_name, npy_path, landmarks[layout]
+
+def save_videos(samples, store_path=None):
+    """
+    Saves extracted videos as one .npy each, or packs them into a feature store.
+    """
+    if store_path:
+        write_store(store_path, ((split_part, class_name, os.path.basename(npy_path), landmarks)
+                                 for split_part, class_name, npy_path, landmarks in samples))
+        return
+    for _, _, npy_path, landmarks in samples:
+        np.save(npy_path, landmarks)
 
 # --- Main Execution ---
 if __name__ == "__main__":
-    print("Starting the DYNAMIC feature extraction process...")
+    parser = argparse.ArgumentParser(description="Extract 258 pose+hand features from the split dynamic videos.")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Decode frames (and the next video) on a background thread while Holistic runs.")
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Max decoded frames buffered ahead of Holistic in streaming mode.")
+    parser.add_argument('--store', default=None,
+                        help="Write one packed feature store to this directory instead of per-video .npy files.")
+    args = parser.parse_args()
 
-    os.makedirs(OUTPUT_DATA_PATH, exist_ok=True)
-    
-    with mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5) as holistic:
-        
-        for split_part in ['train', 'val', 'test']:
-            split_path = os.path.join(SPLIT_DATA_PATH, split_part)
-            output_split_path = os.path.join(OUTPUT_DATA_PATH, split_part)
-            os.makedirs(output_split_path, exist_ok=True)
-            
-            if not os.path.exists(split_path):
-                print(f"Warning: Directory '{split_path}' not found. Skipping.")
-                continue
+    print("Starting the DYNAMIC feature extraction process...")
+    try:
+        record_backend(args.store or OUTPUT_DATA_PATH, HOLISTIC_BACKEND)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
-            print(f"\n--- Processing '{split_part}' set for DYNAMIC data ---")
-            
-            for class_name in os.listdir(split_path):
-                class_path = os.path.join(split_path, class_name)
-                if not os.path.isdir(class_path):
-                    continue
+    # The .npy tree is only created when the features are saved there
+    if not args.store:
+        os.makedirs(OUTPUT_DATA_PATH, exist_ok=True)
+    jobs = collect_jobs(SPLIT_DATA_PATH, OUTPUT_DATA_PATH, create_dirs=not args.store)
 
-                print(f"Processing dynamic class: '{class_name}'")
-                
-                output_class_path = os.path.join(output_split_path, class_name)
-                os.makedirs(output_class_path, exist_ok=True)
+    start_time = time.time()
+    with mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5) as holistic:
+        save_videos(extract_videos(holistic, jobs, POSE_HANDS_LAYOUT, args.streaming, args.queue_size), args.store)
 
-                # Process only video files
-                for file_name in os.listdir(class_path):
-                    if file_name.endswith('.mp4'):
-                        file_path = os.path.join(class_path, file_name)
-                        cap = cv2.VideoCapture(file_path)
-                        video_landmarks = []
-                        while cap.isOpened():
-                            ret, frame = cap.read()
-                            if not ret: break
-                            image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                            results = holistic.process(image)
-                            keypoints = extract_landmarks_dynamic(results)
-                            video_landmarks.append(keypoints)
-                        cap.release()
-                        npy_path = os.path.join(output_class_path, file_name.split('.')[0])
-                        np.save(npy_path, np.array(video_landmarks))
-
-    print("\nDynamic feature extraction completed successfully!")
\ No newline at end of file
+    print(f"\nDynamic feature extraction completed successfully! "
+          f"{len(jobs)} videos in {time.time() - start_time:.1f}s.")
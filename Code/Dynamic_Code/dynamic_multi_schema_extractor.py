@@ -0,0 +1,86 @@
+# dynamic_multi_schema_extractor.py
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from landmark_utils import HANDS_LAYOUT, POSE_HANDS_LAYOUT, FACE_LAYOUT, LAYOUT_SIZES
+from video_stream import DEFAULT_QUEUE_SIZE
+from feature_store import FeatureStoreWriter, record_backend
+from landmark_backends import create_backend, resolve_backend, BACKEND_CHOICES, HOLISTIC_BACKEND
+from dynamic_feature_extractor import collect_jobs, extract_video_schemas
+
+# --- Configuration ---
+SPLIT_DATA_PATH = "Dynamic_Data_Split"
+
+# Output tree for each schema (the first two match the single-schema extractors)
+SCHEMA_OUTPUT_PATHS = {
+    HANDS_LAYOUT: "Dynamic_Processed_Data_Hands_Only",
+    POSE_HANDS_LAYOUT: "Dynamic_Processed_Data",
+    FACE_LAYOUT: "Dynamic_Processed_Data_Face",
+}
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run MediaPipe once per video frame and write every requested feature schema.")
+    parser.add_argument('--schemas', nargs='+', choices=list(SCHEMA_OUTPUT_PATHS), default=[HANDS_LAYOUT, POSE_HANDS_LAYOUT],
+                        help="Feature schemas to write (default: hands pose_hands).")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Decode frames (and the next video) on a background thread while Holistic runs.")
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Max decoded frames buffered ahead of Holistic in streaming mode.")
+    parser.add_argument('--backend', choices=BACKEND_CHOICES, default=HOLISTIC_BACKEND,
+                        help="MediaPipe models to run (default Holistic, like the single-schema extractors); 'auto' picks "
+                             "the lightest one covering every schema. Other backends need their own output directories.")
+    parser.add_argument('--store-root', default=None,
+                        help="Write one packed feature store per schema to <store-root>/<schema> instead of .npy files.")
+    args = parser.parse_args()
+
+    schemas = list(dict.fromkeys(args.schemas))
+    print(f"Starting the DYNAMIC multi-schema feature extraction process: "
+          f"{', '.join(f'{schema} ({LAYOUT_SIZES[schema]})' for schema in schemas)}")
+
+    # Each output tree / store records the backend; features from two backends are never mixed
+    try:
+        backend = resolve_backend(schemas, args.backend)
+        for schema in schemas:
+            record_backend(os.path.join(args.store_root, schema) if args.store_root else SCHEMA_OUTPUT_PATHS[schema], backend)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    # The input tree is listed once; every schema saves to the same <split>/<class>/<name> under its own tree
+    jobs = collect_jobs(SPLIT_DATA_PATH, '', create_dirs=False)
+    if not args.store_root:
+        class_dirs = sorted({os.path.dirname(relative_path) for _, _, _, relative_path in jobs})
+        for schema in schemas:
+            for class_dir in class_dirs:
+                os.makedirs(os.path.join(SCHEMA_OUTPUT_PATHS[schema], class_dir), exist_ok=True)
+    npy_paths = {video_path: (split_part, class_name, {schema: os.path.join(SCHEMA_OUTPUT_PATHS[schema], relative_path)
+                                                       for schema in schemas})
+                 for split_part, class_name, video_path, relative_path in jobs}
+
+    writers = {}
+    start_time = time.time()
+    try:
+        with create_backend(schemas, backend, min_detection_confidence=0.5, min_tracking_confidence=0.5) as holistic:
+            samples = extract_video_schemas(holistic, list(npy_paths), schemas, args.streaming, args.queue_size)
+            for video_path, landmarks in samples:
+                split_part, class_name, schema_npy_paths = npy_paths[video_path]
+                for schema in schemas:
+                    if args.store_root:
+                        key = (schema, split_part)
+                        if key not in writers:
+                            writers[key] = FeatureStoreWriter(os.path.join(args.store_root, schema), split_part)
+                        writers[key].append(landmarks[schema], class_name, os.path.basename(schema_npy_paths[schema]))
+                    else:
+                        np.save(schema_npy_paths[schema], landmarks[schema])
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    print(f"\nDynamic multi-schema feature extraction completed successfully! "
+          f"{len(npy_paths)} videos x {len(schemas)} schemas in {time.time() - start_time:.1f}s.")
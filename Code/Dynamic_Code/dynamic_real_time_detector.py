@@ -3,67 +3,177 @@
 import cv2
 import numpy as np
 import os
+import sys
+import argparse
 import mediapipe as mp
-from tensorflow.keras.models import load_model
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from landmark_utils import extract_landmarks, new_landmark_buffer, POSE_HANDS_LAYOUT, LAYOUT_SIZES
+from latency_profiler import LatencyProfiler
+from inference_engine import ENGINE_CHOICES
+from model_bundle import load_model_and_labels, dynamic_window
+from landmark_backends import HOLISTIC_BACKEND
+from inference_scheduler import InferenceScheduler
+from sequence_window import SlidingWindow
+from sequence_batching import resample_sequence
+from streaming_lstm import StreamingLSTM, DEFAULT_STREAMS
+from camera_capture import LatestFrameCapture
+from startup import StartupTimeline, run_startup, warm_up_engine, warm_up_holistic
 
 # --- Configuration ---
 MODEL_PATH = "models"
 ORIGINAL_DYNAMIC_PATH = "Dynamic_Data"
+# Written by the trainer; carries its own label list, so the dataset folder is only needed for a bare .h5
+MODEL_BUNDLE = os.path.join(MODEL_PATH, 'dynamic_model_final.bundle')
 CONFIDENCE_THRESHOLD = 0.8
-
-# --- Helper Function for Dynamic Signs ---
-def extract_landmarks_dynamic(results):
-    pose = np.array([[res.x, res.y, res.z, res.visibility] for res in results.pose_landmarks.landmark]).flatten() if results.pose_landmarks else np.zeros(33*4)
-    lh = np.array([[res.x, res.y, res.z] for res in results.left_hand_landmarks.landmark]).flatten() if results.left_hand_landmarks else np.zeros(21*3)
-    rh = np.array([[res.x, res.y, res.z] for res in results.right_hand_landmarks.landmark]).flatten() if results.right_hand_landmarks else np.zeros(21*3)
-    return np.concatenate([pose, lh, rh])
+# 'compiled' traces the model once instead of going through model.predict every frame
+INFERENCE_ENGINE = 'compiled'
+# Run the LSTM every PREDICTION_STRIDE frames once the window is full (1 = every frame)
+PREDICTION_STRIDE = 2
 
 # --- Main Program ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Real-time dynamic sign detection.")
+    parser.add_argument('--model', default=MODEL_BUNDLE if os.path.isdir(MODEL_BUNDLE) else os.path.join(MODEL_PATH, 'dynamic_model.h5'),
+                        help="Model to load: a model bundle, the trained .h5 or an exported .tflite (float16 / int8).")
+    parser.add_argument('--engine', choices=ENGINE_CHOICES, default=INFERENCE_ENGINE,
+                        help="Inference engine (a '.tflite' model path always uses the TFLite interpreter).")
+    parser.add_argument('--no-hand-gating', action='store_true', help="Run the model even when no hand is visible.")
+    parser.add_argument('--stride', type=int, default=PREDICTION_STRIDE, help="Run the model every N frames (ignored with --streaming).")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Advance a stateful copy of the LSTM one frame at a time instead of re-running the window.")
+    parser.add_argument('--streams', type=int, default=DEFAULT_STREAMS,
+                        help="Staggered LSTM states for --streaming (window length = exact parity with the windowed model).")
+    parser.add_argument('--direct-capture', action='store_true',
+                        help="Read the camera in the processing loop instead of a latest-frame capture thread.")
+    parser.add_argument('--sequential-startup', action='store_true',
+                        help="Load the model, the landmark backend and the camera one after another instead of in parallel.")
+    parser.add_argument('--no-warmup', action='store_true', help="Skip the warm-up inference before the loop.")
+    parser.add_argument('--startup-report', default=None, help="Write the startup timeline to this JSON file.")
+    parser.add_argument('--profile', action='store_true', help="Time every pipeline stage and print a report on exit.")
+    parser.add_argument('--overlay', action='store_true', help="Show rolling per-stage latency on the video (implies --profile).")
+    parser.add_argument('--report', default=None, help="Also write the latency report to <REPORT>.json and <REPORT>.csv.")
+    args = parser.parse_args()
+
+    # Initialize MediaPipe Holistic
+    mp_holistic = mp.solutions.holistic
+    mp_drawing = mp.solutions.drawing_utils
+
+    # --- Startup: model, landmark backend and camera load in parallel, each warmed up ---
+    timeline = StartupTimeline()
+
+    def load_dynamic_model():
+        model, labels, manifest = load_model_and_labels(args.model, args.engine, ORIGINAL_DYNAMIC_PATH, HOLISTIC_BACKEND)
+        if model.input_shape[2] != LAYOUT_SIZES[POSE_HANDS_LAYOUT]:
+            raise ValueError(f"model expects {model.input_shape[2]} features per frame, this detector extracts {LAYOUT_SIZES[POSE_HANDS_LAYOUT]}")
+        # The stateful model has to see every frame, so --stride saves nothing in streaming mode
+        streaming = None
+        window = dynamic_window(model, manifest)
+        if args.streaming:
+            if window[1] is not None:
+                raise ValueError("--streaming cannot resample windows; this model was trained with --sequence-mode resample")
+            if not hasattr(model, 'model'):
+                raise ValueError("--streaming needs the Keras model; use --engine compiled or keras")
+            streaming = StreamingLSTM(model.model, args.streams)
+        if not args.no_warmup:
+            with timeline.phase('model warm-up'):
+                warm_up_engine(model)
+                if streaming is not None:
+                    streaming.step(np.zeros(model.input_shape[2], dtype=np.float32))
+                    streaming.reset()
+        return model, labels, streaming, window
+
+    def create_holistic():
+        holistic = mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5)
+        if not args.no_warmup:
+            with timeline.phase('holistic warm-up'):
+                warm_up_holistic(holistic)
+        return holistic
+
+    # The capture thread always hands over the newest frame and counts the stale ones it
+    # drops; in direct mode the profiler estimates missed frames from the camera FPS instead.
+    def open_camera():
+        return LatestFrameCapture(0, threaded=not args.direct_capture)
+
     # --- Load the Dynamic Model ---
     try:
-        dynamic_model = load_model(os.path.join(MODEL_PATH, 'dynamic_model.h5'))
-        DYNAMIC_ACTIONS = np.array([d for d in os.listdir(ORIGINAL_DYNAMIC_PATH) if os.path.isdir(os.path.join(ORIGINAL_DYNAMIC_PATH, d))])
-        dynamic_sequence_length = dynamic_model.input_shape[1]
+        started = run_startup([('model', load_dynamic_model), ('holistic', create_holistic), ('camera', open_camera)],
+                              timeline, parallel=not args.sequential_startup, main_thread=['camera'])
+        dynamic_model, dynamic_labels, streaming_model, (dynamic_sequence_length, resample_length) = started['model']
+        DYNAMIC_ACTIONS = np.array(dynamic_labels)
         print(f"Successfully loaded Dynamic Model. Actions: {DYNAMIC_ACTIONS}")
+        if resample_length is not None:
+            print(f"Resampling each {dynamic_sequence_length}-frame window to {resample_length} frames, as in training.")
+        if streaming_model is not None:
+            print(f"Streaming inference with {streaming_model.streams} staggered LSTM state(s).")
     except Exception as e:
-        print(f"\nError: Could not load dynamic_model.h5. Reason: {e}")
+        print(f"\nError: Startup failed. Reason: {e}")
         print("Please ensure the model is in the 'models' directory. Exiting.")
         exit()
 
     # --- Initialize Real-time Variables ---
-    sequence = []
+    sequence = SlidingWindow(dynamic_sequence_length, LAYOUT_SIZES[POSE_HANDS_LAYOUT])
+    # Gated off once the whole window has no hand in it
+    # The stateful model steps on every frame, so in streaming mode a stride would skip nothing
+    # and only delay the displayed prediction: the scheduler just gates what is shown
+    scheduler = InferenceScheduler(hand_gating=not args.no_hand_gating, hand_memory=dynamic_sequence_length,
+                                   stride=1 if streaming_model is not None else args.stride)
+    dynamic_keypoints = new_landmark_buffer(POSE_HANDS_LAYOUT)  # reused every frame
     prediction_text = "..."
 
-    # Initialize MediaPipe Holistic
-    mp_holistic = mp.solutions.holistic
-    mp_drawing = mp.solutions.drawing_utils
-
     # --- Start Real-time Detection Loop ---
-    cap = cv2.VideoCapture(0)
-    with mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5) as holistic:
+    cap = started['camera']
+    camera_fps = cap.get(cv2.CAP_PROP_FPS)
+    profiler = LatencyProfiler(enabled=args.profile or args.overlay or bool(args.report),
+                               frame_interval_ms=1000.0 / camera_fps if args.direct_capture and camera_fps > 0 else None)
+    with started['holistic'] as holistic:
         while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret: break
+            profiler.start_frame()
+            with profiler.stage('capture'):
+                ret, frame = cap.read()
+            if not ret:
+                profiler.count_dropped()
+                break
+            profiler.count_dropped(cap.take_dropped())
+            timeline.mark('first frame')
+
+            with profiler.stage('convert'):
+                image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            with profiler.stage('holistic'):
+                results = holistic.process(image)
+            with profiler.stage('convert'):
+                image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
 
-            image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = holistic.process(image)
-            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-            
             # Draw landmarks
-            mp_drawing.draw_landmarks(image, results.pose_landmarks, mp_holistic.POSE_CONNECTIONS)
-            mp_drawing.draw_landmarks(image, results.left_hand_landmarks, mp_holistic.HAND_CONNECTIONS)
-            mp_drawing.draw_landmarks(image, results.right_hand_landmarks, mp_holistic.HAND_CONNECTIONS)
-            
+            with profiler.stage('draw'):
+                mp_drawing.draw_landmarks(image, results.pose_landmarks, mp_holistic.POSE_CONNECTIONS)
+                mp_drawing.draw_landmarks(image, results.left_hand_landmarks, mp_holistic.HAND_CONNECTIONS)
+                mp_drawing.draw_landmarks(image, results.right_hand_landmarks, mp_holistic.HAND_CONNECTIONS)
+
             # --- Dynamic Prediction Logic ---
-            dynamic_keypoints = extract_landmarks_dynamic(results)
-            sequence.append(dynamic_keypoints)
-            sequence = sequence[-dynamic_sequence_length:]
-
-            if len(sequence) == dynamic_sequence_length:
-                dynamic_res = dynamic_model.predict(np.expand_dims(sequence, axis=0), verbose=0)[0]
-                
-                if np.max(dynamic_res) > CONFIDENCE_THRESHOLD:
+            with profiler.stage('extract'):
+                dynamic_keypoints = extract_landmarks(results, POSE_HANDS_LAYOUT, out=dynamic_keypoints)
+                sequence.append(dynamic_keypoints)
+            scheduler.observe(bool(results.left_hand_landmarks or results.right_hand_landmarks))
+
+            if streaming_model is not None:
+                with profiler.stage('predict'):
+                    streaming_res = streaming_model.step(dynamic_keypoints)
+
+            if sequence.is_full():
+                if scheduler.step():
+                    if streaming_model is not None:
+                        scheduler.record(streaming_res)
+                    else:
+                        with profiler.stage('predict'):
+                            window = sequence.view()
+                            if resample_length is not None:
+                                window = resample_sequence(window, resample_length)
+                            scheduler.record(dynamic_model.predict(window)[0])
+                    timeline.mark('first prediction')
+                dynamic_res = scheduler.result
+
+                if dynamic_res is not None and np.max(dynamic_res) > CONFIDENCE_THRESHOLD:
                     prediction_text = DYNAMIC_ACTIONS[np.argmax(dynamic_res)]
                 else:
                     prediction_text = "..."
@@ -71,14 +181,35 @@ if __name__ == "__main__":
                 prediction_text = "..."
 
             # Display the result
-            (text_width, text_height), baseline = cv2.getTextSize(prediction_text, cv2.FONT_HERSHEY_SIMPLEX, 1, 2)
-            cv2.rectangle(image, (0, 0), (text_width + 20, text_height + 20), (0, 0, 0), -1)
-            cv2.putText(image, prediction_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2, cv2.LINE_AA)
-            
-            cv2.imshow('Dynamic Sign Language Detection', image)
+            with profiler.stage('draw'):
+                (text_width, text_height), baseline = cv2.getTextSize(prediction_text, cv2.FONT_HERSHEY_SIMPLEX, 1, 2)
+                cv2.rectangle(image, (0, 0), (text_width + 20, text_height + 20), (0, 0, 0), -1)
+                cv2.putText(image, prediction_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2, cv2.LINE_AA)
+                if args.overlay:
+                    profiler.draw_overlay(image)
 
-            if cv2.waitKey(10) & 0xFF == ord('q'):
+            with profiler.stage('display'):
+                cv2.imshow('Dynamic Sign Language Detection', image)
+                key = cv2.waitKey(10)
+            profiler.end_frame()
+
+            if key & 0xFF == ord('q'):
                 break
-                
+
         cap.release()
-        cv2.destroyAllWindows()
\ No newline at end of file
+        cv2.destroyAllWindows()
+        cap.print_stats()
+        if streaming_model is not None:
+            steps = streaming_model.frames_seen
+            print(f"Dynamic model (streaming): {steps} calls for {steps} frames (the stateful LSTM steps on every frame)")
+        else:
+            scheduler.print_stats('Dynamic model')
+        timeline.print_timeline()
+        if args.startup_report:
+            timeline.save(args.startup_report)
+
+    if profiler.enabled:
+        profiler.print_summary()
+        if args.report:
+            profiler.save_report(args.report)
+            print(f"Latency report saved to '{args.report}.json' and '{args.report}.csv'")
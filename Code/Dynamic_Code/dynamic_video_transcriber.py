@@ -0,0 +1,166 @@
+# dynamic_video_transcriber.py
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from landmark_utils import LAYOUT_SIZES, HANDS_LAYOUT, POSE_HANDS_LAYOUT
+from landmark_backends import create_backend, resolve_backend, BACKEND_CHOICES, HOLISTIC_BACKEND
+from inference_engine import load_engine, ENGINE_CHOICES, COMPILED_ENGINE
+from model_bundle import load_model_and_labels, is_bundle, dynamic_window
+from sequence_batching import resample_sequence
+from dynamic_feature_extractor import extract_video_schemas
+
+# --- Configuration ---
+MODEL_PATH = "models"
+ORIGINAL_DYNAMIC_PATH = "Dynamic_Data"
+# Written by the trainer; carries its own label list, so the dataset folder is only needed for a bare .h5
+MODEL_BUNDLE = os.path.join(MODEL_PATH, 'dynamic_model_final.bundle')
+DEFAULT_FPS = 30.0
+BATCH_SIZE = 256
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv')
+
+
+def collect_videos(input_path):
+    if os.path.isfile(input_path):
+        return [input_path]
+    videos = []
+    for root, _, files in os.walk(input_path):
+        videos.extend(os.path.join(root, f) for f in sorted(files) if f.lower().endswith(VIDEO_EXTENSIONS))
+    return sorted(videos)
+
+
+def predict_windows(engine, landmarks, window, stride, batch_size, resample_length=None):
+    """
+    Runs every sliding window of a (frames, features) sequence through the
+    model in batches. Returns (end_frame_indices, probabilities). Windows are
+    strided views of the sequence; only one batch is copied at a time. With
+    resample_length, each window is resampled to that many frames first.
+    """
+    if len(landmarks) < window:
+        return np.zeros(0, dtype=int), np.zeros((0, engine.num_classes), dtype=np.float32)
+    # (num_windows, features, window) view -> (num_windows, window, features)
+    windows = np.lib.stride_tricks.sliding_window_view(landmarks, window, axis=0).transpose(0, 2, 1)[::stride]
+    probs = np.empty((len(windows), engine.num_classes), dtype=np.float32)
+    for start in range(0, len(windows), batch_size):
+        batch = np.ascontiguousarray(windows[start:start + batch_size], dtype=np.float32)
+        if resample_length is not None:
+            batch = resample_sequence(batch, resample_length)
+        probs[start:start + len(batch)] = engine.predict(batch)
+    end_frames = np.arange(len(windows)) * stride + window - 1
+    return end_frames, probs
+
+
+def build_track(video_path, fps, end_frames, probs, window, actions):
+    track = []
+    for end_frame, res in zip(end_frames, probs):
+        class_id = int(np.argmax(res))
+        track.append({
+            'video': video_path,
+            'start_frame': int(end_frame - window + 1),
+            'end_frame': int(end_frame),
+            'start_s': round((end_frame - window + 1) / fps, 3),
+            'end_s': round((end_frame + 1) / fps, 3),
+            'class': class_id,
+            'label': str(actions[class_id]) if actions is not None and class_id < len(actions) else None,
+            'confidence': round(float(res[class_id]), 5),
+        })
+    return track
+
+
+def save_track(prefix, track, summary):
+    with open(prefix + '.json', 'w') as f:
+        json.dump({'summary': summary, 'predictions': track}, f, indent=2)
+    with open(prefix + '.csv', 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=['video', 'start_frame', 'end_frame', 'start_s', 'end_s', 'class', 'label', 'confidence'])
+        writer.writeheader()
+        writer.writerows(track)
+
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless transcription of recorded videos with the dynamic model.")
+    parser.add_argument('input', help="Video file, or a folder searched recursively for videos.")
+    parser.add_argument('--model', default=MODEL_BUNDLE if os.path.isdir(MODEL_BUNDLE) else os.path.join(MODEL_PATH, 'dynamic_model.h5'),
+                        help="Dynamic model: a model bundle, the trained .h5 or an exported .tflite.")
+    parser.add_argument('--layout', choices=[POSE_HANDS_LAYOUT, HANDS_LAYOUT], default=None,
+                        help="Feature layout the model was trained on (default: the bundle's layout, else pose_hands).")
+    parser.add_argument('--backend', choices=BACKEND_CHOICES, default=HOLISTIC_BACKEND,
+                        help="MediaPipe landmark backend ('holistic' matches the real-time detector).")
+    parser.add_argument('--engine', choices=ENGINE_CHOICES, default=COMPILED_ENGINE, help="Inference engine.")
+    parser.add_argument('--actions-path', default=ORIGINAL_DYNAMIC_PATH,
+                        help="Dataset folder the class labels are listed from (only for a bare model file; bundles carry their labels).")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Windows per model call.")
+    parser.add_argument('--stride', type=int, default=1, help="Frames between consecutive windows.")
+    parser.add_argument('--streaming', action='store_true', help="Decode the next frames on a background thread while MediaPipe runs.")
+    parser.add_argument('--output', default='transcription', help="Writes <OUTPUT>.json and <OUTPUT>.csv.")
+    args = parser.parse_args()
+
+    videos = collect_videos(args.input)
+    if not videos:
+        print(f"Error: No videos found at '{args.input}'.")
+        sys.exit(1)
+
+    # Labels come from the bundle, in training order, like the real-time detectors
+    actions, manifest = None, None
+    try:
+        if is_bundle(args.model) or os.path.isdir(args.actions_path):
+            engine, labels, manifest = load_model_and_labels(args.model, args.engine, args.actions_path)
+            actions = np.array(labels)
+        else:
+            print(f"Warning: '{args.actions_path}' not found, writing class indices only.")
+            engine = load_engine(args.model, args.engine)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    layout = args.layout or (manifest['layout'] if manifest else POSE_HANDS_LAYOUT)
+    if manifest and manifest['landmark_backend'] != resolve_backend(layout, args.backend):
+        print(f"Error: '{args.model}' was trained on '{manifest['landmark_backend']}' landmarks, not '{args.backend}'.")
+        sys.exit(1)
+    # Models trained with --sequence-mode resample see each window resampled to their input length
+    window, resample_length = dynamic_window(engine, manifest)
+    if engine.input_shape[2] != LAYOUT_SIZES[layout]:
+        print(f"Error: Model expects {engine.input_shape[2]} features per frame, layout '{layout}' has {LAYOUT_SIZES[layout]}.")
+        sys.exit(1)
+    print(f"Transcribing {len(videos)} video(s) with a {window}-frame window, stride {args.stride}, batch {args.batch_size}"
+          + (f", resampled to {resample_length} frames" if resample_length is not None else ""))
+
+    track = []
+    fps = {}  # filled by the decoder from each video's own capture
+    total_frames, total_windows, landmark_time, inference_time = 0, 0, 0.0, 0.0
+    run_start = time.perf_counter()
+    with create_backend(layout, args.backend, min_detection_confidence=0.5, min_tracking_confidence=0.5) as holistic:
+        stage_start = time.perf_counter()
+        for video_path, landmarks in extract_video_schemas(holistic, videos, [layout], args.streaming, fps=fps):
+            landmarks = landmarks[layout]
+            landmark_time += time.perf_counter() - stage_start
+
+            stage_start = time.perf_counter()
+            end_frames, probs = predict_windows(engine, landmarks, window, args.stride, args.batch_size, resample_length)
+            inference_time += time.perf_counter() - stage_start
+
+            video_fps = fps.get(video_path, 0.0)
+            track.extend(build_track(video_path, video_fps if video_fps > 0 else DEFAULT_FPS, end_frames, probs, window, actions))
+            total_frames += len(landmarks)
+            total_windows += len(end_frames)
+            print(f"  {video_path}: {len(landmarks)} frames, {len(end_frames)} windows")
+            stage_start = time.perf_counter()
+    total_time = time.perf_counter() - run_start
+
+    summary = {
+        'videos': len(videos), 'frames': total_frames, 'windows': total_windows,
+        'window': int(window), 'stride': args.stride, 'batch_size': args.batch_size,
+        'total_s': round(total_time, 3), 'landmark_s': round(landmark_time, 3), 'inference_s': round(inference_time, 3),
+        'frames_per_s': round(total_frames / total_time, 2) if total_time else 0.0,
+        'windows_per_s': round(total_windows / inference_time, 2) if inference_time else 0.0,
+    }
+    save_track(args.output, track, summary)
+    print(f"\nProcessed {total_frames} frames in {total_time:.1f}s ({summary['frames_per_s']} frames/s end to end)")
+    print(f"  landmarks: {landmark_time:.1f}s ({total_frames / max(landmark_time, 1e-9):.1f} frames/s)")
+    print(f"  model:     {inference_time:.2f}s for {total_windows} windows ({summary['windows_per_s']} windows/s)")
+    print(f"Prediction track saved to '{args.output}.json' and '{args.output}.csv'")
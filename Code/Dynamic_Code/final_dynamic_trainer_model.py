@@ -2,10 +2,13 @@
 
 # Import necessary libraries
 import os
+import sys
+import time
+import argparse
 import numpy as np
 import tensorflow as tf
 from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import Dense, LSTM, Dropout
+from tensorflow.keras.layers import Dense, LSTM, Dropout, Masking
 from tensorflow.keras.utils import to_categorical
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import confusion_matrix, classification_report
@@ -13,6 +16,19 @@ from tensorflow.keras.callbacks import EarlyStopping
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from feature_store import iter_npy_samples, iter_store_samples, read_backend
+from npy_loader import load_npy_tree, LOAD_WORKERS
+from training_profiler import TrainingProfiler, PROFILE_SUFFIX
+from tensor_cache import input_files, fingerprint, load_or_build, pack_sequences, unpack_sequences
+from model_export import export_quantized_models, CALIBRATION_SAMPLES
+from model_bundle import write_bundle, add_artifact, BUNDLE_SUFFIX
+from training_pipeline import (SampleIndex, make_dataset, AugmentedBatches, BucketedBatches, FirstStepTimer,
+                               PIPELINE_CHOICES, AUGMENTATION_CHOICES, SHUFFLE_BUFFER)
+from sequence_batching import (bucket_boundaries, resample_sequence, pad_batch, print_padding_report,
+                               SEQUENCE_MODES, NUM_BUCKETS)
+from augmentation import BatchAugmenter, DEFAULT_POLICY
+
 # --- (The Configuration, Augmentation, and Data Loading functions remain exactly the same) ---
 # ...
 # ... (Paste your previous Config, augment_flip, augment_noise, and load_and_prepare_data functions here) ...
@@ -22,6 +38,7 @@ import matplotlib.pyplot as plt
 PROCESSED_DATA_PATH = "/content/drive/MyDrive/Sign Language Data/Data/Processed_Data_Advanced"
 ORIGINAL_DYNAMIC_PATH = "/content/drive/MyDrive/Sign Language Data/Dynamic"
 MODEL_SAVE_PATH = "/content/drive/MyDrive/Sign Language Data/model2"
+TENSOR_CACHE_PATH = os.path.join(MODEL_SAVE_PATH, "tensor_cache")
 os.makedirs(MODEL_SAVE_PATH, exist_ok=True)
 
 def augment_flip(landmarks):
@@ -45,44 +62,36 @@ def augment_flip(landmarks):
 def augment_noise(landmarks, scale=0.003):
     return landmarks + np.random.normal(0, scale, landmarks.shape)
 
-def load_and_prepare_data(data_path, actions):
-    # ... (code from previous version) ...
+def load_and_prepare_data(data_path, actions, store_path=None, augment_copies=True, load_workers=LOAD_WORKERS):
+    # Reads the <split>/<action>/*.npy tree, or zero-copy slices of a packed
+    # feature store (see Common_Code/feature_store.py) when store_path is given.
+    # augment_copies=False skips the stored flip / noise copies (batch augmentation).
+    # load_workers > 0 reads the .npy files on a thread pool (Common_Code/npy_loader.py).
     label_map = {label: num for num, label in enumerate(actions)}
     X, y = {'train': [], 'val': [], 'test': []}, {'train': [], 'val': [], 'test': []}
-    for action in actions:
-        for split in ['train', 'val', 'test']:
-            action_path = os.path.join(data_path, split, action)
-            if not os.path.exists(action_path): continue
-            for file_name in os.listdir(action_path):
-                if file_name.endswith('.npy'):
-                    res = np.load(os.path.join(action_path, file_name))
-                    X[split].append(res)
-                    y[split].append(label_map[action])
-                    if split == 'train':
-                        X['train'].append(augment_flip(res))
-                        y['train'].append(label_map[action])
-                        X['train'].append(augment_noise(res))
-                        y['train'].append(label_map[action])
+    if store_path:
+        samples = iter_store_samples(store_path, actions)
+    elif load_workers:
+        samples = load_npy_tree(data_path, actions, workers=load_workers)
+    else:
+        samples = iter_npy_samples(data_path, actions)
+    for split, action, _, res in samples:
+        X[split].append(res)
+        y[split].append(label_map[action])
+        if split == 'train' and augment_copies:
+            X['train'].append(augment_flip(res))
+            y['train'].append(label_map[action])
+            X['train'].append(augment_noise(res))
+            y['train'].append(label_map[action])
     return X, y
 
-# --- Main Program (DYNAMIC only) ---
-if __name__ == "__main__":
-    print("\n--- Preparing to train DYNAMIC model (Stable Version) ---")
-    model_type = 'dynamic'
-
-    actions = np.array([d for d in os.listdir(ORIGINAL_DYNAMIC_PATH) if os.path.isdir(os.path.join(ORIGINAL_DYNAMIC_PATH, d))])
-    X_dict, y_dict = load_and_prepare_data(PROCESSED_DATA_PATH, actions)
-    max_len = max([len(seq) for seq_list in X_dict.values() for seq in seq_list])
-    X_train = tf.keras.preprocessing.sequence.pad_sequences(X_dict['train'], maxlen=max_len, padding='post', dtype='float32')
-    y_train = to_categorical(y_dict['train']).astype(int)
-    X_val = tf.keras.preprocessing.sequence.pad_sequences(X_dict['val'], maxlen=max_len, padding='post', dtype='float32')
-    y_val = to_categorical(y_dict['val']).astype(int)
-    X_test = tf.keras.preprocessing.sequence.pad_sequences(X_dict['test'], maxlen=max_len, padding='post', dtype='float32')
-    y_test = to_categorical(y_dict['test']).astype(int)
-
-    # --- MODIFICATION 1: Use default (tanh) activation for LSTMs for better stability ---
-    model = Sequential([
-        LSTM(64, return_sequences=True, input_shape=(max_len, X_train.shape[2])), # Removed activation='relu'
+# --- MODIFICATION 1: Use default (tanh) activation for LSTMs for better stability ---
+def build_dynamic_model(sequence_length, num_features, num_classes, masking=True):
+    # sequence_length=None accepts any length (bucketed batches). Masking skips
+    # all-zero steps, i.e. the padding (and frames where nothing was detected).
+    first = [Masking(mask_value=0.0, input_shape=(sequence_length, num_features))] if masking else []
+    return Sequential(first + [
+        LSTM(64, return_sequences=True, input_shape=(sequence_length, num_features)), # Removed activation='relu'
         Dropout(0.5),
         LSTM(128, return_sequences=True), # Removed activation='relu'
         Dropout(0.5),
@@ -90,10 +99,137 @@ if __name__ == "__main__":
         Dropout(0.5),
         Dense(64, activation='relu'),
         Dense(32, activation='relu'),
-        Dense(actions.shape[0], activation='softmax')
+        Dense(num_classes, activation='softmax')
     ])
+
+def resample_length_for(args, train_lengths):
+    # Frames per sequence in --sequence-mode resample, None otherwise
+    if args.sequence_mode != 'resample':
+        return None
+    return args.resample_length or int(np.median(train_lengths))
+
+# --- Main Program (DYNAMIC only) ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the DYNAMIC sign model.")
+    parser.add_argument('--store', default=None,
+                        help="Read features from a packed feature store directory instead of the .npy tree.")
+    parser.add_argument('--export', action='store_true',
+                        help="Also export float16 / int8 TFLite models and a quantization report next to the .h5.")
+    parser.add_argument('--pipeline', choices=PIPELINE_CHOICES, default='memory',
+                        help="'memory' loads every sample up front; 'streaming' reads them lazily through tf.data.")
+    parser.add_argument('--shuffle-buffer', type=int, default=SHUFFLE_BUFFER,
+                        help="Samples held for shuffling by the streaming pipeline.")
+    parser.add_argument('--augmentation', choices=AUGMENTATION_CHOICES, default='batch',
+                        help="'batch' augments every training batch on the fly; 'copies' stores a flipped and a noisy copy of each sample.")
+    parser.add_argument('--augment-policy', default=DEFAULT_POLICY,
+                        help="Per-sample transform probabilities for --augmentation batch, e.g. 'flip=0.33,noise=0.33' or 'none'.")
+    parser.add_argument('--sequence-mode', choices=SEQUENCE_MODES, default='bucket',
+                        help="'pad' to the global max length, 'bucket' by length (padding only to each batch's longest), "
+                             "or 'resample' every sequence to --resample-length frames.")
+    parser.add_argument('--buckets', type=int, default=NUM_BUCKETS, help="Length buckets for --sequence-mode bucket.")
+    parser.add_argument('--resample-length', type=int, default=None,
+                        help="Frames per sequence for --sequence-mode resample (default: median training length).")
+    parser.add_argument('--load-workers', type=int, default=LOAD_WORKERS,
+                        help="Threads reading the .npy files (0 = one file at a time, as before).")
+    parser.add_argument('--cache-dir', default=TENSOR_CACHE_PATH,
+                        help="Where prepared training arrays are cached (memory pipeline).")
+    parser.add_argument('--no-cache', action='store_true', help="Always re-read and re-prepare the data.")
+    args = parser.parse_args()
+    batch_augmentation = args.augmentation == 'batch'
+    load_start = time.perf_counter()
+
+    print("\n--- Preparing to train DYNAMIC model (Stable Version) ---")
+    model_type = 'dynamic'
+
+    actions = np.array(sorted(d for d in os.listdir(ORIGINAL_DYNAMIC_PATH) if os.path.isdir(os.path.join(ORIGINAL_DYNAMIC_PATH, d))))
+    if args.pipeline == 'streaming':
+        # Only the file list and sequence lengths are read here; train/val samples are loaded batch by batch during fit
+        indexes = {split: SampleIndex.open(PROCESSED_DATA_PATH, actions, split, args.store, args.load_workers) for split in ['train', 'val', 'test']}
+        max_len = max(index.max_length() for index in indexes.values())
+        train_lengths = [shape[0] for shape in indexes['train'].shapes]
+        resample_length = resample_length_for(args, train_lengths)
+    else:
+        def prepare_arrays():
+            # Ready-to-train arrays: padded / resampled splits, or packed sequences for bucketing
+            X_dict, y_dict = load_and_prepare_data(PROCESSED_DATA_PATH, actions, args.store, augment_copies=not batch_augmentation,
+                                                   load_workers=args.load_workers)
+            max_len = max([len(seq) for seq_list in X_dict.values() for seq in seq_list])
+            train_lengths = [len(seq) for seq in X_dict['train']]
+            resample_length = resample_length_for(args, train_lengths)
+            if resample_length:
+                X_dict = {split: [resample_sequence(seq, resample_length) for seq in seq_list] for split, seq_list in X_dict.items()}
+            arrays = {'max_len': np.array(max_len), 'resample_length': np.array(resample_length or 0),
+                      'train_lengths': np.array(train_lengths)}
+            for split in ['train', 'val', 'test']:
+                arrays['y_' + split] = to_categorical(y_dict[split], len(actions)).astype(int)
+                if args.sequence_mode == 'bucket' and split != 'test':
+                    # Batches are padded on the fly, so no max_len copy of the training set is built
+                    arrays[split + '_frames'], arrays[split + '_offsets'] = pack_sequences(X_dict[split])
+                else:
+                    arrays['X_' + split] = tf.keras.preprocessing.sequence.pad_sequences(
+                        X_dict[split], maxlen=resample_length or max_len, padding='post', dtype='float32')
+            return arrays
+
+        if args.no_cache:
+            arrays = prepare_arrays()
+        else:
+            # Same feature files, actions and preprocessing -> reuse the arrays of the last run
+            cache_key = fingerprint(input_files(PROCESSED_DATA_PATH, actions, args.store), actions,
+                                    {'trainer': model_type, 'store': bool(args.store), 'augmentation': args.augmentation,
+                                     'sequence_mode': args.sequence_mode, 'resample_length': args.resample_length})
+            arrays = load_or_build(args.cache_dir, model_type, cache_key, prepare_arrays)
+        max_len, train_lengths = int(arrays['max_len']), np.asarray(arrays['train_lengths'])
+        resample_length = int(arrays['resample_length']) or None
+
+    boundaries = bucket_boundaries(train_lengths, args.buckets) if args.sequence_mode == 'bucket' else None
+    print_padding_report(train_lengths, args.sequence_mode, max_len, 32, boundaries, resample_length)
+    # The saved model's window (read by the detectors) stays max_len, or the resample length
+    max_len = resample_length or max_len
+    calibration_indices = np.random.default_rng(0).permutation(len(train_lengths))[:CALIBRATION_SAMPLES]
+
+    if args.pipeline == 'streaming':
+        augmenter = BatchAugmenter(indexes['train'].num_features, args.augment_policy) if batch_augmentation else None
+        train_data = make_dataset(indexes['train'], len(actions), batch_augment=augmenter,
+                                  augment=None if batch_augmentation else lambda x: [augment_flip(x), augment_noise(x)],
+                                  max_len=max_len, shuffle_buffer=args.shuffle_buffer,
+                                  bucket_boundaries=boundaries, resample_length=resample_length)
+        val_data = make_dataset(indexes['val'], len(actions), training=False, max_len=max_len,
+                                bucket_boundaries=boundaries, resample_length=resample_length)
+        num_features = indexes['train'].num_features
+        # The test split (and int8 calibration data) is small enough to hold in memory
+        X_test = indexes['test'].stack(max_len=max_len, resample_length=resample_length)
+        y_test = to_categorical(indexes['test'].labels, len(actions)).astype(int)
+        X_calibration = indexes['train'].stack(calibration_indices, max_len, resample_length) if args.export else None
+        fit_kwargs = {}
+    else:
+        y_train, y_val = arrays['y_train'], arrays['y_val']
+        X_test, y_test = arrays['X_test'], arrays['y_test']
+        num_features = X_test.shape[2]
+        augmenter = BatchAugmenter(num_features, args.augment_policy) if batch_augmentation else None
+        fit_kwargs = {}
+        if args.sequence_mode == 'bucket':
+            train_sequences = unpack_sequences(arrays['train_frames'], arrays['train_offsets'])
+            val_sequences = unpack_sequences(arrays['val_frames'], arrays['val_offsets'])
+            train_data = BucketedBatches(train_sequences, y_train, boundaries, augmenter)
+            val_data = BucketedBatches(val_sequences, y_val, boundaries, shuffle=False)
+            X_calibration = pad_batch([train_sequences[i] for i in calibration_indices], max_len) if args.export else None
+        else:
+            X_train, X_val = arrays['X_train'], arrays['X_val']
+            val_data, X_calibration = (X_val, y_val), X_train
+            if batch_augmentation:
+                train_data = AugmentedBatches(X_train, y_train, augmenter)
+            else:
+                train_data, fit_kwargs = X_train, {'y': y_train, 'batch_size': 32}
+
+    # Bucketed batches vary in length, so the training model takes any length
+    model = build_dynamic_model(None if args.sequence_mode == 'bucket' else max_len, num_features, actions.shape[0],
+                                masking=args.sequence_mode != 'resample')
     model_filename = 'dynamic_model_final.h5'
-    callbacks = [EarlyStopping(monitor='val_categorical_accuracy', patience=25, verbose=1, restore_best_weights=True)]
+    # Step time, samples/s, input wait vs compute, epoch time and peak RSS, saved next to the model
+    profiler = TrainingProfiler(os.path.join(MODEL_SAVE_PATH, 'dynamic_model_final' + PROFILE_SUFFIX))
+    train_data = profiler.instrument(train_data)
+    callbacks = [EarlyStopping(monitor='val_categorical_accuracy', patience=25, verbose=1, restore_best_weights=True),
+                 FirstStepTimer(load_start), profiler]
 
     # --- MODIFICATION 2: Add 'clipnorm' to the Adam optimizer for Gradient Clipping ---
     optimizer = tf.keras.optimizers.Adam(learning_rate=0.0005, clipnorm=1.0)
@@ -103,7 +239,12 @@ if __name__ == "__main__":
     model.summary()
 
     print(f"\n--- Starting Augmented {model_type.upper()} Model Training ---")
-    history = model.fit(X_train, y_train, epochs=200, validation_data=(X_val, y_val), batch_size=32, callbacks=callbacks)
+    history = model.fit(train_data, epochs=200, validation_data=val_data, callbacks=callbacks, **fit_kwargs)
+    if args.sequence_mode == 'bucket':
+        # The detectors read the window length from the model input, so keep a max_len copy
+        trained_model = model
+        model = build_dynamic_model(max_len, num_features, actions.shape[0])
+        model.set_weights(trained_model.get_weights())
 
     # --- Accuracy plot (added) ---
     try:
@@ -134,3 +275,16 @@ if __name__ == "__main__":
 
     model.save(os.path.join(MODEL_SAVE_PATH, model_filename))
     print(f"Training complete. Model saved as '{model_filename}'")
+
+    # Self-contained bundle (weights + label order + schema) so the detectors never list the dataset
+    bundle_path = os.path.join(MODEL_SAVE_PATH, 'dynamic_model_final' + BUNDLE_SUFFIX)
+    write_bundle(bundle_path, model, actions, model_type,
+                 sequence_length=max_len, padding='resample' if resample_length else 'post',
+                 landmark_backend=read_backend(args.store or PROCESSED_DATA_PATH),
+                 # Detectors resample windows of the median sign length, like the training sequences
+                 source_length=int(np.median(train_lengths)) if resample_length else None)
+
+    if args.export:
+        rows = export_quantized_models(model, os.path.join(MODEL_SAVE_PATH, model_filename), X_calibration, X_test, y_true_classes)
+        for row in rows[1:]:
+            add_artifact(bundle_path, 'tflite_' + row['variant'], row['path'])
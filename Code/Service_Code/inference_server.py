@@ -0,0 +1,209 @@
+# inference_server.py
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from inference_engine import load_engine, ENGINE_CHOICES, COMPILED_ENGINE
+from model_bundle import load_model_and_labels, is_bundle, dynamic_window
+from micro_batcher import MicroBatcher, DEFAULT_MAX_BATCH, DEFAULT_MAX_DELAY_MS
+from sequence_window import SlidingWindow
+from sequence_batching import resample_sequence
+
+# --- Configuration ---
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+MODEL_PATH = 'models'
+# Written by the trainers; they carry their own label lists, so the dataset folders are only needed for bare model files
+STATIC_MODEL_BUNDLE = os.path.join(MODEL_PATH, 'static_model_final.bundle')
+DYNAMIC_MODEL_BUNDLE = os.path.join(MODEL_PATH, 'dynamic_model_final.bundle')
+STATIC_MODEL_PATH = STATIC_MODEL_BUNDLE if os.path.isdir(STATIC_MODEL_BUNDLE) else os.path.join(MODEL_PATH, 'static_model_final.h5')
+DYNAMIC_MODEL_PATH = DYNAMIC_MODEL_BUNDLE if os.path.isdir(DYNAMIC_MODEL_BUNDLE) else os.path.join(MODEL_PATH, 'dynamic_model.h5')
+
+# --- Protocol ---
+# One JSON object per line in each direction, answered in order on the same connection:
+#   {"stream": "kiosk-1", "model": "dynamic", "frame": [258 floats]}        -> appended to the stream's window
+#   {"stream": "kiosk-1", "model": "dynamic", "frames": [[...], [...]]}     -> several frames at once
+#   {"stream": "kiosk-1", "model": "static", "frame": [126 floats]}
+#   {"type": "reset", "stream": "kiosk-1"}  /  {"type": "stats"}
+# Prediction replies: {"stream", "model", "ready", "class", "label", "confidence", "server_ms"}
+# ("ready" is false while a dynamic window is still filling).
+
+
+def load_model(model_path, engine, actions_path=None):
+    """
+    (engine, labels or None, manifest or None) for one served model. Bundles
+    carry their labels; a bare model file gets them from `actions_path`, or
+    replies with class indices only when there is none.
+    """
+    if is_bundle(model_path) or actions_path:
+        return load_model_and_labels(model_path, engine, actions_path)
+    return load_engine(model_path, engine), None, None
+
+
+class InferenceServer:
+    """
+    Keeps one sliding window per dynamic stream and sends every model call
+    through a MicroBatcher, so concurrent streams share model invocations.
+    Windows of a model trained on resampled sequences (dynamic_manifest) are
+    resampled to its input length, like in the real-time detectors.
+    """
+
+    def __init__(self, static_engine=None, dynamic_engine=None, static_actions=None, dynamic_actions=None,
+                 max_batch=DEFAULT_MAX_BATCH, max_delay_ms=DEFAULT_MAX_DELAY_MS, dynamic_manifest=None):
+        self.batchers = {}
+        self.actions = {'static': static_actions, 'dynamic': dynamic_actions}
+        if static_engine is not None:
+            self.batchers['static'] = MicroBatcher(static_engine, max_batch, max_delay_ms)
+            self.num_static_features = static_engine.input_shape[1]
+        if dynamic_engine is not None:
+            self.batchers['dynamic'] = MicroBatcher(dynamic_engine, max_batch, max_delay_ms)
+            self.sequence_length, self.resample_length = dynamic_window(dynamic_engine, dynamic_manifest)
+            self.num_dynamic_features = dynamic_engine.input_shape[2]
+        self.windows = {}
+        self.requests = 0
+        self.connections = 0
+
+    # --- Request handling ---
+    def _window(self, stream_id):
+        window = self.windows.get(stream_id)
+        if window is None:
+            window = self.windows[stream_id] = SlidingWindow(self.sequence_length, self.num_dynamic_features)
+        return window
+
+    async def handle_request(self, request):
+        request_type = request.get('type', 'predict')
+        if request_type == 'stats':
+            return self.stats()
+        stream_id = str(request['stream'])
+        if request_type == 'reset':
+            self.windows.pop(stream_id, None)
+            return {'stream': stream_id, 'reset': True}
+        if request_type != 'predict':
+            raise ValueError(f"Unknown request type: '{request_type}'")
+
+        model_name = request.get('model', 'dynamic')
+        if model_name not in self.batchers:
+            raise ValueError(f"Model '{model_name}' is not loaded")
+        start = time.perf_counter()
+        self.requests += 1
+        frames = request['frames'] if 'frames' in request else [request['frame']]
+        batcher = self.batchers[model_name]
+
+        if model_name == 'dynamic':
+            window = self._window(stream_id)
+            for frame in frames:
+                if len(frame) != self.num_dynamic_features:
+                    raise ValueError(f"Expected {self.num_dynamic_features} features per frame, got {len(frame)}")
+                window.append(frame)
+            if not window.is_full():
+                return {'stream': stream_id, 'model': model_name, 'ready': False}
+            sample = window.view()[0]
+            if self.resample_length is not None:
+                sample = resample_sequence(sample, self.resample_length)
+            res = await batcher.predict(sample)
+        else:
+            frame = np.asarray(frames[-1], dtype=np.float32)
+            if frame.shape != (self.num_static_features,):
+                raise ValueError(f"Expected {self.num_static_features} features per frame, got shape {frame.shape}")
+            res = await batcher.predict(frame)
+
+        class_id = int(np.argmax(res))
+        actions = self.actions[model_name]
+        return {'stream': stream_id, 'model': model_name, 'ready': True, 'class': class_id,
+                'label': actions[class_id] if actions else None, 'confidence': float(res[class_id]),
+                'server_ms': round((time.perf_counter() - start) * 1000, 3)}
+
+    async def handle_client(self, reader, writer):
+        self.connections += 1
+        streams = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line: break
+                try:
+                    request = json.loads(line)
+                    if 'stream' in request: streams.add(str(request['stream']))
+                    response = await self.handle_request(request)
+                except (ValueError, KeyError, TypeError) as e:
+                    response = {'error': str(e)}
+                writer.write((json.dumps(response) + '\n').encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            # A stream's window lives as long as the connection that fed it
+            for stream_id in streams:
+                self.windows.pop(stream_id, None)
+            writer.close()
+
+    # --- Stats ---
+    def stats(self):
+        return {
+            'requests': self.requests,
+            'connections': self.connections,
+            'open_streams': len(self.windows),
+            'models': {name: {'batches': b.batches, 'samples': b.samples, 'mean_batch': round(b.mean_batch_size(), 2)}
+                       for name, b in self.batchers.items()},
+        }
+
+    def print_stats(self):
+        print(f"Served {self.requests} requests over {self.connections} connections")
+        for name, batcher in self.batchers.items():
+            print(f"  {name}: {batcher.samples} samples in {batcher.batches} batches (mean batch {batcher.mean_batch_size():.2f})")
+
+    async def serve(self, host, port):
+        for batcher in self.batchers.values():
+            batcher.start()
+        server = await asyncio.start_server(self.handle_client, host, port)
+        print(f"Inference server listening on {host}:{port} (models: {', '.join(self.batchers)})")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for batcher in self.batchers.values():
+                await batcher.stop()
+
+
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local multi-stream inference service with micro-batching.")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--static-model', default=STATIC_MODEL_PATH, help="Static model (bundle, .h5 or .tflite); 'none' to disable.")
+    parser.add_argument('--dynamic-model', default=DYNAMIC_MODEL_PATH, help="Dynamic model (bundle, .h5 or .tflite); 'none' to disable.")
+    parser.add_argument('--static-actions-path', default=None, help="Static dataset folder, to reply with labels (only for a bare model file).")
+    parser.add_argument('--dynamic-actions-path', default=None, help="Dynamic dataset folder, to reply with labels (only for a bare model file).")
+    parser.add_argument('--engine', choices=ENGINE_CHOICES, default=COMPILED_ENGINE, help="Inference engine.")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH, help="Largest micro-batch per model call.")
+    parser.add_argument('--max-delay-ms', type=float, default=DEFAULT_MAX_DELAY_MS,
+                        help="How long the first request of a batch may wait for others.")
+    args = parser.parse_args()
+
+    engines, labels, manifests = {}, {}, {}
+    for name, path, actions_path in [('static', args.static_model, args.static_actions_path),
+                                     ('dynamic', args.dynamic_model, args.dynamic_actions_path)]:
+        if path.lower() == 'none': continue
+        try:
+            engines[name], labels[name], manifests[name] = load_model(path, args.engine, actions_path)
+            print(f"Loaded {name} model '{path}' (input {engines[name].input_shape[1:]})")
+        except Exception as e:
+            print(f"Warning: Could not load {name} model '{path}'. Reason: {e}")
+    if not engines:
+        print("Error: No model could be loaded. Exiting.")
+        sys.exit(1)
+
+    server = InferenceServer(engines.get('static'), engines.get('dynamic'), labels.get('static'), labels.get('dynamic'),
+                             args.max_batch, args.max_delay_ms, manifests.get('dynamic'))
+    if 'dynamic' in engines and server.resample_length is not None:
+        print(f"Resampling each {server.sequence_length}-frame window to {server.resample_length} frames, as in training.")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    server.print_stats()
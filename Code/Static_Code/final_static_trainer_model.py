@@ -2,6 +2,9 @@
 
 # Import necessary libraries
 import os
+import sys
+import time
+import argparse
 import numpy as np
 import tensorflow as tf
 from tensorflow.keras.models import Sequential
@@ -13,6 +16,18 @@ from tensorflow.keras.callbacks import EarlyStopping
 import seaborn as sns
 import matplotlib.pyplot as plt
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from feature_store import iter_npy_samples, iter_store_samples, read_backend
+from npy_loader import load_npy_tree, LOAD_WORKERS
+from training_profiler import TrainingProfiler, PROFILE_SUFFIX
+from tensor_cache import input_files, fingerprint, load_or_build
+from model_export import export_quantized_models, CALIBRATION_SAMPLES
+from model_bundle import write_bundle, add_artifact, BUNDLE_SUFFIX
+from training_pipeline import (SampleIndex, make_dataset, AugmentedBatches, FirstStepTimer,
+                               PIPELINE_CHOICES, AUGMENTATION_CHOICES, SHUFFLE_BUFFER)
+from augmentation import BatchAugmenter, DEFAULT_POLICY
+from numpy_mlp import export_mlp_npz
+
 # --- (The Configuration, Augmentation, and Data Loading functions remain exactly the same) ---
 # ...
 # ... (Paste your previous Config, augment_flip, augment_noise, and load_and_prepare_data functions here) ...
@@ -22,6 +37,7 @@ import matplotlib.pyplot as plt
 PROCESSED_DATA_PATH = '/Users/nahidkhan/Local Drive/Research/New_Model_Train/Feature_Extraction'
 ORIGINAL_STATIC_PATH = '/Users/nahidkhan/Local Drive/Research/Dataset/Static'
 MODEL_SAVE_PATH = '/Users/nahidkhan/Local Drive/Research/New_Model_Train/new model'
+TENSOR_CACHE_PATH = os.path.join(MODEL_SAVE_PATH, 'tensor_cache')
 os.makedirs(MODEL_SAVE_PATH, exist_ok=True)
 
 def augment_flip(landmarks):
@@ -45,39 +61,104 @@ def augment_flip(landmarks):
 def augment_noise(landmarks, scale=0.003):
     return landmarks + np.random.normal(0, scale, landmarks.shape)
 
-def load_and_prepare_data(data_path, actions):
-    # ... (code from previous version) ...
+def load_and_prepare_data(data_path, actions, store_path=None, augment_copies=True, load_workers=LOAD_WORKERS):
+    # Reads the <split>/<action>/*.npy tree, or zero-copy slices of a packed
+    # feature store (see Common_Code/feature_store.py) when store_path is given.
+    # augment_copies=False skips the stored flip / noise copies (batch augmentation).
+    # load_workers > 0 reads the .npy files on a thread pool (Common_Code/npy_loader.py).
     label_map = {label: num for num, label in enumerate(actions)}
     X, y = {'train': [], 'val': [], 'test': []}, {'train': [], 'val': [], 'test': []}
-    for action in actions:
-        for split in ['train', 'val', 'test']:
-            action_path = os.path.join(data_path, split, action)
-            if not os.path.exists(action_path): continue
-            for file_name in os.listdir(action_path):
-                if file_name.endswith('.npy'):
-                    res = np.load(os.path.join(action_path, file_name))
-                    X[split].append(res)
-                    y[split].append(label_map[action])
-                    if split == 'train':
-                        X['train'].append(augment_flip(res))
-                        y['train'].append(label_map[action])
-                        X['train'].append(augment_noise(res))
-                        y['train'].append(label_map[action])
+    if store_path:
+        samples = iter_store_samples(store_path, actions)
+    elif load_workers:
+        samples = load_npy_tree(data_path, actions, workers=load_workers)
+    else:
+        samples = iter_npy_samples(data_path, actions)
+    for split, action, _, res in samples:
+        X[split].append(res)
+        y[split].append(label_map[action])
+        if split == 'train' and augment_copies:
+            X['train'].append(augment_flip(res))
+            y['train'].append(label_map[action])
+            X['train'].append(augment_noise(res))
+            y['train'].append(label_map[action])
     return X, y
 
 # --- Main Program (STATIC only) ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the STATIC sign model.")
+    parser.add_argument('--store', default=None,
+                        help="Read features from a packed feature store directory instead of the .npy tree.")
+    parser.add_argument('--export', action='store_true',
+                        help="Also export float16 / int8 TFLite models and a quantization report next to the .h5.")
+    parser.add_argument('--pipeline', choices=PIPELINE_CHOICES, default='memory',
+                        help="'memory' loads every sample up front; 'streaming' reads them lazily through tf.data.")
+    parser.add_argument('--shuffle-buffer', type=int, default=SHUFFLE_BUFFER,
+                        help="Samples held for shuffling by the streaming pipeline.")
+    parser.add_argument('--augmentation', choices=AUGMENTATION_CHOICES, default='batch',
+                        help="'batch' augments every training batch on the fly; 'copies' stores a flipped and a noisy copy of each sample.")
+    parser.add_argument('--augment-policy', default=DEFAULT_POLICY,
+                        help="Per-sample transform probabilities for --augmentation batch, e.g. 'flip=0.33,noise=0.33' or 'none'.")
+    parser.add_argument('--load-workers', type=int, default=LOAD_WORKERS,
+                        help="Threads reading the .npy files (0 = one file at a time, as before).")
+    parser.add_argument('--cache-dir', default=TENSOR_CACHE_PATH,
+                        help="Where prepared training arrays are cached (memory pipeline).")
+    parser.add_argument('--no-cache', action='store_true', help="Always re-read and re-prepare the data.")
+    args = parser.parse_args()
+    batch_augmentation = args.augmentation == 'batch'
+    load_start = time.perf_counter()
+
     model_type = 'static'
 
     # ... (Static model part remains the same) ...
-    actions = np.array([d for d in os.listdir(ORIGINAL_STATIC_PATH) if os.path.isdir(os.path.join(ORIGINAL_STATIC_PATH, d))])
-    X_dict, y_dict = load_and_prepare_data(PROCESSED_DATA_PATH, actions)
-    X_train, y_train = np.array(X_dict['train']), to_categorical(y_dict['train']).astype(int)
-    X_val, y_val = np.array(X_dict['val']), to_categorical(y_dict['val']).astype(int)
-    X_test, y_test = np.array(X_dict['test']), to_categorical(y_dict['test']).astype(int)
-    model = Sequential([Dense(128, activation='relu', input_shape=(X_train.shape[1],)),Dense(64, activation='relu'),Dense(32, activation='relu'),Dense(actions.shape[0], activation='softmax')])
+    actions = np.array(sorted(d for d in os.listdir(ORIGINAL_STATIC_PATH) if os.path.isdir(os.path.join(ORIGINAL_STATIC_PATH, d))))
+    if args.pipeline == 'streaming':
+        # Only the file list is read here; train/val samples are loaded batch by batch during fit
+        indexes = {split: SampleIndex.open(PROCESSED_DATA_PATH, actions, split, args.store, args.load_workers) for split in ['train', 'val', 'test']}
+        augmenter = BatchAugmenter(indexes['train'].num_features, args.augment_policy) if batch_augmentation else None
+        train_data = make_dataset(indexes['train'], len(actions), batch_augment=augmenter,
+                                  augment=None if batch_augmentation else lambda x: [augment_flip(x), augment_noise(x)],
+                                  shuffle_buffer=args.shuffle_buffer)
+        val_data = make_dataset(indexes['val'], len(actions), training=False)
+        num_features = indexes['train'].num_features
+        # The test split (and int8 calibration data) is small enough to hold in memory
+        X_test, y_test = indexes['test'].stack(), to_categorical(indexes['test'].labels, len(actions)).astype(int)
+        calibration_indices = np.random.default_rng(0).permutation(len(indexes['train']))[:CALIBRATION_SAMPLES]
+        X_calibration = indexes['train'].stack(calibration_indices) if args.export else None
+        fit_kwargs = {}
+    else:
+        def prepare_arrays():
+            X_dict, y_dict = load_and_prepare_data(PROCESSED_DATA_PATH, actions, args.store, augment_copies=not batch_augmentation,
+                                                   load_workers=args.load_workers)
+            arrays = {}
+            for split in ['train', 'val', 'test']:
+                arrays['X_' + split] = np.array(X_dict[split])
+                arrays['y_' + split] = to_categorical(y_dict[split], len(actions)).astype(int)
+            return arrays
+
+        if args.no_cache:
+            arrays = prepare_arrays()
+        else:
+            # Same feature files, actions and preprocessing -> reuse the arrays of the last run
+            cache_key = fingerprint(input_files(PROCESSED_DATA_PATH, actions, args.store), actions,
+                                    {'trainer': model_type, 'store': bool(args.store), 'augmentation': args.augmentation})
+            arrays = load_or_build(args.cache_dir, model_type, cache_key, prepare_arrays)
+        X_train, y_train = arrays['X_train'], arrays['y_train']
+        X_val, y_val = arrays['X_val'], arrays['y_val']
+        X_test, y_test = arrays['X_test'], arrays['y_test']
+        num_features = X_train.shape[1]
+        train_data, val_data, X_calibration = X_train, (X_val, y_val), X_train
+        fit_kwargs = {'y': y_train, 'batch_size': 32}
+        if batch_augmentation:
+            train_data = AugmentedBatches(X_train, y_train, BatchAugmenter(num_features, args.augment_policy))
+            fit_kwargs = {}
+    model = Sequential([Dense(128, activation='relu', input_shape=(num_features,)),Dense(64, activation='relu'),Dense(32, activation='relu'),Dense(actions.shape[0], activation='softmax')])
     model_filename = 'static_model_final.h5'
-    callbacks = [EarlyStopping(monitor='val_categorical_accuracy', patience=15, verbose=1, restore_best_weights=True)]
+    # Step time, samples/s, input wait vs compute, epoch time and peak RSS, saved next to the model
+    profiler = TrainingProfiler(os.path.join(MODEL_SAVE_PATH, 'static_model_final' + PROFILE_SUFFIX))
+    train_data = profiler.instrument(train_data)
+    callbacks = [EarlyStopping(monitor='val_categorical_accuracy', patience=15, verbose=1, restore_best_weights=True),
+                 FirstStepTimer(load_start), profiler]
 
     # --- MODIFICATION 2: Add 'clipnorm' to the Adam optimizer for Gradient Clipping ---
     optimizer = tf.keras.optimizers.Adam(learning_rate=0.0005, clipnorm=1.0)
@@ -87,7 +168,7 @@ if __name__ == "__main__":
     model.summary()
 
     print(f"\n--- Starting Augmented {model_type.upper()} Model Training ---")
-    history = model.fit(X_train, y_train, epochs=100, validation_data=(X_val, y_val), batch_size=32, callbacks=callbacks)
+    history = model.fit(train_data, epochs=100, validation_data=val_data, callbacks=callbacks, **fit_kwargs)
 
     # --- Accuracy plot (added) ---
     try:
@@ -118,3 +199,15 @@ if __name__ == "__main__":
 
     model.save(os.path.join(MODEL_SAVE_PATH, model_filename))
     print(f"Training complete. Model saved as '{model_filename}'")
+    # TensorFlow-free copy for the static detector (see Common_Code/numpy_mlp.py)
+    export_mlp_npz(model, os.path.join(MODEL_SAVE_PATH, 'static_model_final.npz'), actions)
+    print("NumPy runtime weights saved as 'static_model_final.npz'")
+
+    # Self-contained bundle (weights + label order + schema) so the detectors never list the dataset
+    bundle_path = os.path.join(MODEL_SAVE_PATH, 'static_model_final' + BUNDLE_SUFFIX)
+    write_bundle(bundle_path, model, actions, model_type, landmark_backend=read_backend(args.store or PROCESSED_DATA_PATH))
+
+    if args.export:
+        rows = export_quantized_models(model, os.path.join(MODEL_SAVE_PATH, model_filename), X_calibration, X_test, y_true_classes)
+        for row in rows[1:]:
+            add_artifact(bundle_path, 'tflite_' + row['variant'], row['path'])
@@ -1,64 +1,95 @@
 # static_feature_extractor.py
 
-import cv2
 import os
-import numpy as np
-import mediapipe as mp
+import sys
+import time
+import argparse
 
-# Initialize MediaPipe Holistic model
-mp_holistic = mp.solutions.holistic
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from landmark_utils import HANDS_LAYOUT
+from extraction_pool import extract_images
+from landmark_backends import BACKEND_CHOICES, HOLISTIC_BACKEND, resolve_backend
+from feature_store import write_store, record_backend
 
 # --- Configuration ---
 SPLIT_DATA_PATH = '/Users/nahidkhan/Local Drive/Research/New_Model_Train/Split'
 OUTPUT_DATA_PATH = '/Users/nahidkhan/Local Drive/Research/New_Model_Train/Feature_Extraction'
 
-# --- Landmark Extraction Function for STATIC data ---
-def extract_landmarks_static(results):
+# static_image_mode=True: every image is detected on its own, so the features
+# do not depend on processing order and the serial and worker-pool runs match.
+HOLISTIC_KWARGS = dict(static_image_mode=True, min_detection_confidence=0.5, min_tracking_confidence=0.5)
+
+# --- Job Collection ---
+def collect_jobs(split_data_path, output_data_path, create_dirs=True):
     """
-    Extracts landmarks for ONLY left and right hands.
+    Walks train/val/test and returns a list of (split, class_name, image_path,
+    npy_path) jobs, creating the output class folders on the way unless
+    create_dirs is False (nothing is saved as .npy with --store).
     """
-    lh = np.array([[res.x, res.y, res.z] for res in results.left_hand_landmarks.landmark]).flatten() if results.left_hand_landmarks else np.zeros(21*3)
-    rh = np.array([[res.x, res.y, res.z] for res in results.right_hand_landmarks.landmark]).flatten() if results.right_hand_landmarks else np.zeros(21*3)
-    return np.concatenate([lh, rh])
+    jobs = []
+    for split_part in ['train', 'val', 'test']:
+        split_path = os.path.join(split_data_path, split_part)
+        output_split_path = os.path.join(output_data_path, split_part)
+        if create_dirs:
+            os.makedirs(output_split_path, exist_ok=True)
+
+        if not os.path.exists(split_path):
+            print(f"Warning: Directory '{split_path}' not found. Skipping.")
+            continue
+
+        print(f"\n--- Collecting '{split_part}' set for STATIC data ---")
+
+        for class_name in os.listdir(split_path):
+            class_path = os.path.join(split_path, class_name)
+            if not os.path.isdir(class_path):
+                continue
+
+            output_class_path = os.path.join(output_split_path, class_name)
+            if create_dirs:
+                os.makedirs(output_class_path, exist_ok=True)
+
+            # Process only image files
+            class_jobs = [(split_part, class_name, os.path.join(class_path, file_name), os.path.join(output_class_path, file_name.split('.')[0]))
+                          for file_name in os.listdir(class_path) if file_name.endswith('.jpg')]
+            print(f"Static class '{class_name}': {len(class_jobs)} images")
+            jobs.extend(class_jobs)
+    return jobs
 
 # --- Main Execution ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract 126 hand-landmark features from the split static images.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Number of worker processes, each with its own Holistic instance (1 = serial).")
+    parser.add_argument('--backend', choices=BACKEND_CHOICES, default=HOLISTIC_BACKEND,
+                        help="MediaPipe models to run (default Holistic, like the detectors); 'hands' / 'auto' run Hands alone "
+                             "and need a model trained on Hands features.")
+    parser.add_argument('--store', default=None,
+                        help="Write one packed feature store to this directory instead of per-image .npy files.")
+    args = parser.parse_args()
+
     print("Starting the STATIC feature extraction process...")
+    try:
+        record_backend(args.store or OUTPUT_DATA_PATH, resolve_backend(HANDS_LAYOUT, args.backend))
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    # The .npy tree is only created when the features are saved there
+    if not args.store:
+        os.makedirs(OUTPUT_DATA_PATH, exist_ok=True)
 
-    os.makedirs(OUTPUT_DATA_PATH, exist_ok=True)
-    
-    with mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5) as holistic:
-        
-        for split_part in ['train', 'val', 'test']:
-            split_path = os.path.join(SPLIT_DATA_PATH, split_part)
-            output_split_path = os.path.join(OUTPUT_DATA_PATH, split_part)
-            os.makedirs(output_split_path, exist_ok=True)
-            
-            if not os.path.exists(split_path):
-                print(f"Warning: Directory '{split_path}' not found. Skipping.")
-                continue
+    jobs = collect_jobs(SPLIT_DATA_PATH, OUTPUT_DATA_PATH, create_dirs=not args.store)
+    print(f"\nExtracting features for {len(jobs)} images with {max(args.workers, 1)} worker(s)...")
 
-            print(f"\n--- Processing '{split_part}' set for STATIC data ---")
-            
-            for class_name in os.listdir(split_path):
-                class_path = os.path.join(split_path, class_name)
-                if not os.path.isdir(class_path):
-                    continue
+    start_time = time.time()
+    # With --store the vectors come back to this process instead of being saved one file each
+    image_jobs = [(image_path, None if args.store else npy_path) for _, _, image_path, npy_path in jobs]
+    processed, failed, features = extract_images(image_jobs, args.workers, HOLISTIC_KWARGS, HANDS_LAYOUT, args.backend)
+    for image_path in failed:
+        print(f"Warning: Could not read image {image_path}. Skipped.")
 
-                print(f"Processing static class: '{class_name}'")
-                
-                output_class_path = os.path.join(output_split_path, class_name)
-                os.makedirs(output_class_path, exist_ok=True)
+    if args.store:
+        write_store(args.store, ((split_part, class_name, os.path.splitext(os.path.basename(image_path))[0], features[image_path])
+                                 for split_part, class_name, image_path, _ in jobs if image_path in features))
 
-                # Process only image files
-                for file_name in os.listdir(class_path):
-                    if file_name.endswith('.jpg'):
-                        file_path = os.path.join(class_path, file_name)
-                        frame = cv2.imread(file_path)
-                        image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                        results = holistic.process(image)
-                        keypoints = extract_landmarks_static(results)
-                        npy_path = os.path.join(output_class_path, file_name.split('.')[0])
-                        np.save(npy_path, keypoints)
-
-    print("\nStatic feature extraction completed successfully!")
\ No newline at end of file
+    print(f"\nStatic feature extraction completed successfully! "
+          f"{processed} images in {time.time() - start_time:.1f}s.")
@@ -3,73 +3,166 @@
 import cv2
 import numpy as np
 import os
+import sys
+import argparse
 import mediapipe as mp
-from tensorflow.keras.models import load_model
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from landmark_utils import extract_landmarks, new_landmark_buffer, HANDS_LAYOUT
+from latency_profiler import LatencyProfiler
+from inference_engine import ENGINE_CHOICES
+from model_bundle import load_model_and_labels
+from landmark_backends import HOLISTIC_BACKEND
+from inference_scheduler import InferenceScheduler
+from camera_capture import LatestFrameCapture
+from startup import StartupTimeline, run_startup, warm_up_engine, warm_up_holistic
 
 # --- Configuration ---
 MODEL_PATH = '/Users/nahidkhan/Local Drive/Research/New_Model_Train/new model'
 ORIGINAL_STATIC_PATH = '/Users/nahidkhan/Local Drive/Research/Dataset/Static'
+# Written by the trainer; carries its own label list, so the dataset folder is only needed for a bare .h5
+MODEL_BUNDLE = os.path.join(MODEL_PATH, 'static_model_final.bundle')
 CONFIDENCE_THRESHOLD = 0.8
-
-# --- Helper Function for Static Signs ---
-def extract_landmarks_static(results):
-    lh = np.array([[res.x, res.y, res.z] for res in results.left_hand_landmarks.landmark]).flatten() if results.left_hand_landmarks else np.zeros(21*3)
-    rh = np.array([[res.x, res.y, res.z] for res in results.right_hand_landmarks.landmark]).flatten() if results.right_hand_landmarks else np.zeros(21*3)
-    return np.concatenate([lh, rh])
+# 'compiled' traces the model once instead of going through model.predict every frame
+INFERENCE_ENGINE = 'compiled'
+# Re-run the MLP only when a keypoint moved more than this (normalized coordinates); None = every frame
+MOTION_THRESHOLD = 0.01
 
 # --- Main Program ---
 if __name__ == "__main__":
-    # --- Load the Static Model ---
+    parser = argparse.ArgumentParser(description="Real-time static sign detection.")
+    parser.add_argument('--model', default=MODEL_BUNDLE if os.path.isdir(MODEL_BUNDLE) else os.path.join(MODEL_PATH, 'static_model_final.h5'),
+                        help="Model to load: a model bundle, the trained .h5, an exported .tflite (float16 / int8) or a NumPy .npz (no TensorFlow import).")
+    parser.add_argument('--engine', choices=ENGINE_CHOICES, default=INFERENCE_ENGINE,
+                        help="Inference engine; with a bundle it picks the artifact ('numpy' = the TensorFlow-free .npz, "
+                             "'tflite' = an exported .tflite). A '.tflite' model path always uses the TFLite interpreter.")
+    parser.add_argument('--no-hand-gating', action='store_true', help="Run the model even when no hand is visible.")
+    parser.add_argument('--motion-threshold', type=float, default=MOTION_THRESHOLD,
+                        help="Skip the model while no keypoint moved more than this since the last call (negative = never skip).")
+    parser.add_argument('--direct-capture', action='store_true',
+                        help="Read the camera in the processing loop instead of a latest-frame capture thread.")
+    parser.add_argument('--sequential-startup', action='store_true',
+                        help="Load the model, Holistic and the camera one after another instead of in parallel.")
+    parser.add_argument('--no-warmup', action='store_true', help="Skip the warm-up inference before the loop.")
+    parser.add_argument('--startup-report', default=None, help="Write the startup timeline to this JSON file.")
+    parser.add_argument('--profile', action='store_true', help="Time every pipeline stage and print a report on exit.")
+    parser.add_argument('--overlay', action='store_true', help="Show rolling per-stage latency on the video (implies --profile).")
+    parser.add_argument('--report', default=None, help="Also write the latency report to <REPORT>.json and <REPORT>.csv.")
+    args = parser.parse_args()
+
+    # Initialize MediaPipe Holistic
+    mp_holistic = mp.solutions.holistic
+    mp_drawing = mp.solutions.drawing_utils
+
+    # --- Startup: model, Holistic and camera load in parallel, each warmed up ---
+    timeline = StartupTimeline()
+
+    def load_static_model():
+        model, labels, _ = load_model_and_labels(args.model, args.engine, ORIGINAL_STATIC_PATH, HOLISTIC_BACKEND)
+        if not args.no_warmup:
+            with timeline.phase('model warm-up'):
+                warm_up_engine(model)
+        return model, labels
+
+    def create_holistic():
+        holistic = mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5)
+        if not args.no_warmup:
+            with timeline.phase('holistic warm-up'):
+                warm_up_holistic(holistic)
+        return holistic
+
+    # The capture thread always hands over the newest frame and counts the stale ones it
+    # drops; in direct mode the profiler estimates missed frames from the camera FPS instead.
+    def open_camera():
+        return LatestFrameCapture(0, threaded=not args.direct_capture)
+
     try:
-        static_model = load_model(os.path.join(MODEL_PATH, 'static_model_final.h5'))
-        STATIC_ACTIONS = np.array([d for d in os.listdir(ORIGINAL_STATIC_PATH) if os.path.isdir(os.path.join(ORIGINAL_STATIC_PATH, d))])
+        started = run_startup([('model', load_static_model), ('holistic', create_holistic), ('camera', open_camera)],
+                              timeline, parallel=not args.sequential_startup, main_thread=['camera'])
+        static_model, static_labels = started['model']
+        STATIC_ACTIONS = np.array(static_labels)
         print(f"Successfully loaded Static Model. Actions: {STATIC_ACTIONS}")
     except Exception as e:
-        print(f"\nError: Could not load static_model.h5. Reason: {e}")
+        print(f"\nError: Startup failed. Reason: {e}")
         print("Please ensure the model is in the 'models' directory. Exiting.")
         exit()
 
     # --- Initialize Real-time Variables ---
     prediction_text = "..."
-
-    # Initialize MediaPipe Holistic
-    mp_holistic = mp.solutions.holistic
-    mp_drawing = mp.solutions.drawing_utils
+    static_keypoints = new_landmark_buffer(HANDS_LAYOUT)  # reused every frame
+    scheduler = InferenceScheduler(hand_gating=not args.no_hand_gating,
+                                   motion_threshold=args.motion_threshold if args.motion_threshold >= 0 else None)
 
     # --- Start Real-time Detection Loop ---
-    cap = cv2.VideoCapture(0)
-    with mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5) as holistic:
+    cap = started['camera']
+    camera_fps = cap.get(cv2.CAP_PROP_FPS)
+    profiler = LatencyProfiler(enabled=args.profile or args.overlay or bool(args.report),
+                               frame_interval_ms=1000.0 / camera_fps if args.direct_capture and camera_fps > 0 else None)
+    with started['holistic'] as holistic:
         while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret: break
+            profiler.start_frame()
+            with profiler.stage('capture'):
+                ret, frame = cap.read()
+            if not ret:
+                profiler.count_dropped()
+                break
+            profiler.count_dropped(cap.take_dropped())
+            timeline.mark('first frame')
+
+            with profiler.stage('convert'):
+                image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            with profiler.stage('holistic'):
+                results = holistic.process(image)
+            with profiler.stage('convert'):
+                image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
 
-            image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = holistic.process(image)
-            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-            
             # Draw landmarks
-            mp_drawing.draw_landmarks(image, results.pose_landmarks, mp_holistic.POSE_CONNECTIONS)
-            mp_drawing.draw_landmarks(image, results.left_hand_landmarks, mp_holistic.HAND_CONNECTIONS)
-            mp_drawing.draw_landmarks(image, results.right_hand_landmarks, mp_holistic.HAND_CONNECTIONS)
-            
+            with profiler.stage('draw'):
+                mp_drawing.draw_landmarks(image, results.pose_landmarks, mp_holistic.POSE_CONNECTIONS)
+                mp_drawing.draw_landmarks(image, results.left_hand_landmarks, mp_holistic.HAND_CONNECTIONS)
+                mp_drawing.draw_landmarks(image, results.right_hand_landmarks, mp_holistic.HAND_CONNECTIONS)
+
             # --- Static Prediction Logic ---
-            static_keypoints = extract_landmarks_static(results)
-            static_res = static_model.predict(np.expand_dims(static_keypoints, axis=0), verbose=0)[0]
+            with profiler.stage('extract'):
+                static_keypoints = extract_landmarks(results, HANDS_LAYOUT, out=static_keypoints)
+            hands_present = bool(results.left_hand_landmarks or results.right_hand_landmarks)
+            if scheduler.step(hands_present, static_keypoints):
+                with profiler.stage('predict'):
+                    scheduler.record(static_model.predict_one(static_keypoints))
+                timeline.mark('first prediction')
+            static_res = scheduler.result
 
-            if np.max(static_res) > CONFIDENCE_THRESHOLD:
+            if static_res is not None and np.max(static_res) > CONFIDENCE_THRESHOLD:
                 prediction_text = STATIC_ACTIONS[np.argmax(static_res)]
             else:
                 prediction_text = "..."
 
             # Display the result
-            (text_width, text_height), baseline = cv2.getTextSize(prediction_text, cv2.FONT_HERSHEY_SIMPLEX, 1, 2)
-            cv2.rectangle(image, (0, 0), (text_width + 20, text_height + 20), (0, 0, 0), -1)
-            cv2.putText(image, prediction_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2, cv2.LINE_AA)
-            
-            cv2.imshow('Static Sign Language Detection', image)
+            with profiler.stage('draw'):
+                (text_width, text_height), baseline = cv2.getTextSize(prediction_text, cv2.FONT_HERSHEY_SIMPLEX, 1, 2)
+                cv2.rectangle(image, (0, 0), (text_width + 20, text_height + 20), (0, 0, 0), -1)
+                cv2.putText(image, prediction_text, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2, cv2.LINE_AA)
+                if args.overlay:
+                    profiler.draw_overlay(image)
+
+            with profiler.stage('display'):
+                cv2.imshow('Static Sign Language Detection', image)
+                key = cv2.waitKey(10)
+            profiler.end_frame()
 
-            if cv2.waitKey(10) & 0xFF == ord('q'):
+            if key & 0xFF == ord('q'):
                 break
-                
+
         cap.release()
-        cv2.destroyAllWindows()
\ No newline at end of file
+        cv2.destroyAllWindows()
+        cap.print_stats()
+        scheduler.print_stats('Static model')
+        timeline.print_timeline()
+        if args.startup_report:
+            timeline.save(args.startup_report)
+
+    if profiler.enabled:
+        profiler.print_summary()
+        if args.report:
+            profiler.save_report(args.report)
+            print(f"Latency report saved to '{args.report}.json' and '{args.report}.csv'")
@@ -0,0 +1,49 @@
+# test_combined_policy.py
+
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Combined_Code'))
+from landmark_utils import HAND_SIZE
+from combined_policy import choose_prediction, update_hand_motion, HAND_MOTION_THRESHOLD
+
+SURE = np.array([0.05, 0.95])
+UNSURE = np.array([0.5, 0.5])
+BOTH = np.array([True, True])
+LEFT_ONLY = np.array([True, False])
+NONE = np.array([False, False])
+
+
+def hands(left, right):
+    return np.concatenate([np.full(HAND_SIZE, left, dtype=np.float32), np.full(HAND_SIZE, right, dtype=np.float32)])
+
+
+def test_motion_policy_picks_dynamic_when_moving_and_static_when_still():
+    assert choose_prediction('motion', SURE, SURE, HAND_MOTION_THRESHOLD * 2)[0] == 'dynamic'
+    assert choose_prediction('motion', SURE, SURE, 0.0)[0] == 'static'
+
+
+def test_only_confident_models_are_eligible():
+    assert choose_prediction('static', UNSURE, SURE, 0.0)[0] == 'dynamic'
+    assert choose_prediction('motion', UNSURE, None, 1.0) == (None, None)
+
+
+def test_hand_disappearing_is_not_motion():
+    previous = hands(0.5, 0.5)
+    # The right hand vanishes: its coordinates drop to zero, the left hand stays put
+    motion = update_hand_motion(0.0, hands(0.5, 0.0), previous, LEFT_ONLY, BOTH)
+    assert motion == 0.0
+    assert choose_prediction('motion', SURE, SURE, motion)[0] == 'static'
+
+
+def test_hand_appearing_is_not_motion():
+    motion = update_hand_motion(0.0, hands(0.5, 0.5), hands(0.5, 0.0), BOTH, LEFT_ONLY)
+    assert motion == 0.0
+
+
+def test_visible_hand_movement_counts_and_no_hands_resets():
+    motion = update_hand_motion(0.0, hands(0.6, 0.0), hands(0.5, 0.0), LEFT_ONLY, LEFT_ONLY)
+    assert motion > HAND_MOTION_THRESHOLD
+    assert update_hand_motion(motion, hands(0.0, 0.0), hands(0.6, 0.0), NONE, LEFT_ONLY) == 0.0
@@ -0,0 +1,86 @@
+# test_inference_server.py
+
+import os
+import sys
+import asyncio
+import numpy as np
+import pytest
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Service_Code'))
+from micro_batcher import MicroBatcher
+from inference_server import InferenceServer
+
+
+class FakeEngine:
+    """
+    Engine stand-in: a 126-feature static model with 3 classes (or a
+    dynamic one, given a window length). Keeps the last batch it ran.
+    """
+
+    def __init__(self, num_features=126, num_classes=3, window=None):
+        self.input_shape = (None, num_features) if window is None else (None, window, num_features)
+        self.num_classes = num_classes
+        self.last_batch = None
+
+    def predict(self, batch):
+        self.last_batch = np.array(batch)
+        probs = np.zeros((len(batch), self.num_classes), dtype=np.float32)
+        probs[:, 1] = 1.0
+        return probs
+
+
+def test_bad_static_frame_is_an_error_and_server_keeps_answering():
+    async def run():
+        server = InferenceServer(static_engine=FakeEngine(), static_actions=['a', 'b', 'c'])
+        server.batchers['static'].start()
+        try:
+            with pytest.raises(ValueError):
+                await server.handle_request({'stream': 's', 'model': 'static', 'frame': [0.0] * 258})
+            return await asyncio.wait_for(
+                server.handle_request({'stream': 's', 'model': 'static', 'frame': [0.0] * 126}), timeout=2.0)
+        finally:
+            await server.batchers['static'].stop()
+
+    response = asyncio.run(run())
+    assert response['ready'] and response['label'] == 'b'
+
+
+def test_bad_sample_fails_only_its_own_request():
+    async def run():
+        batcher = MicroBatcher(FakeEngine(), max_batch=4, max_delay_ms=20.0)
+        batcher.start()
+        try:
+            bad = asyncio.ensure_future(batcher.predict(np.zeros(258)))
+            good = asyncio.ensure_future(batcher.predict(np.zeros(126)))
+            results = await asyncio.wait_for(asyncio.gather(bad, good, return_exceptions=True), timeout=2.0)
+            # The loop is still alive for the next batch
+            later = await asyncio.wait_for(batcher.predict(np.zeros(126)), timeout=2.0)
+            return results, later
+        finally:
+            await batcher.stop()
+
+    (bad, good), later = asyncio.run(run())
+    assert isinstance(bad, ValueError)
+    assert int(np.argmax(good)) == 1 and int(np.argmax(later)) == 1
+
+
+def test_resampled_model_gets_resampled_windows():
+    engine = FakeEngine(num_features=2, window=3)
+    manifest = {'padding': 'resample', 'source_length': 5}
+
+    async def run():
+        server = InferenceServer(dynamic_engine=engine, dynamic_actions=['a', 'b', 'c'], dynamic_manifest=manifest)
+        server.batchers['dynamic'].start()
+        try:
+            frames = [[float(t), 10.0 * t] for t in range(5)]
+            filling = await server.handle_request({'stream': 's', 'frames': frames[:4]})
+            ready = await asyncio.wait_for(server.handle_request({'stream': 's', 'frame': frames[4]}), timeout=2.0)
+            return filling, ready
+        finally:
+            await server.batchers['dynamic'].stop()
+
+    filling, ready = asyncio.run(run())
+    # The window holds source_length raw frames and the model sees them resampled to its 3 steps
+    assert not filling['ready'] and ready['label'] == 'b'
+    assert np.allclose(engine.last_batch[0], [[0.0, 0.0], [2.0, 20.0], [4.0, 40.0]])
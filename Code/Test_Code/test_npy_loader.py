@@ -0,0 +1,34 @@
+# test_npy_loader.py
+
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from npy_loader import load_npy_tree
+
+
+def save(tmp_path, action, name, array):
+    folder = os.path.join(tmp_path, 'train', action)
+    os.makedirs(folder, exist_ok=True)
+    np.save(os.path.join(folder, name), array)
+
+
+def test_empty_video_first_in_dynamic_tree_loads_as_empty_sequence(tmp_path):
+    # '0.npy' sorts first: a video that produced no frames
+    save(tmp_path, 'hello', '0.npy', np.array([]))
+    save(tmp_path, 'hello', '1.npy', np.full((5, 258), 0.5, dtype=np.float32))
+    save(tmp_path, 'thanks', '0.npy', np.full((3, 258), 0.25, dtype=np.float32))
+    samples = load_npy_tree(str(tmp_path), ['hello', 'thanks'], splits=['train'], workers=2)
+    assert [(action, name) for _, action, name, _ in samples] == [('hello', '0.npy'), ('hello', '1.npy'), ('thanks', '0.npy')]
+    shapes = [array.shape for _, _, _, array in samples]
+    assert shapes == [(0, 258), (5, 258), (3, 258)]
+    assert np.all(samples[1][3] == 0.5) and np.all(samples[2][3] == 0.25)
+
+
+def test_static_tree_loads_rows(tmp_path):
+    save(tmp_path, 'a', '0.npy', np.ones(126, dtype=np.float32))
+    save(tmp_path, 'b', '0.npy', np.zeros(126, dtype=np.float32))
+    samples = load_npy_tree(str(tmp_path), ['a', 'b'], splits=['train'], workers=2)
+    assert [array.shape for _, _, _, array in samples] == [(126,), (126,)]
+    assert np.all(samples[0][3] == 1.0)
@@ -0,0 +1,27 @@
+# test_sequence_batching.py
+
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from sequence_batching import resample_sequence
+from model_bundle import dynamic_window
+
+
+class FakeModel:
+    input_shape = (None, 20, 258)
+
+
+def test_batch_of_windows_resamples_like_single_sequences():
+    windows = np.random.rand(3, 45, 258).astype(np.float32)
+    batch = resample_sequence(windows, 20)
+    assert batch.shape == (3, 20, 258)
+    for window, resampled in zip(windows, batch):
+        assert np.allclose(resampled, resample_sequence(window, 20))
+
+
+def test_resampled_bundle_windows_span_the_source_length():
+    assert dynamic_window(FakeModel(), {'padding': 'post', 'source_length': None}) == (20, None)
+    assert dynamic_window(FakeModel(), {'padding': 'resample', 'source_length': 45}) == (45, 20)
+    assert dynamic_window(FakeModel()) == (20, None)
@@ -0,0 +1,18 @@
+# test_tensor_cache.py
+
+import os
+import sys
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Common_Code'))
+from tensor_cache import pack_sequences, unpack_sequences
+
+
+def test_empty_videos_pack_as_zero_frame_sequences():
+    sequences = [np.array([]), np.ones((4, 258)), np.array([]), np.full((2, 258), 0.5)]
+    frames, offsets = pack_sequences(sequences)
+    assert frames.shape == (6, 258) and frames.dtype == np.float32
+    assert list(offsets) == [0, 0, 4, 4, 6]
+    unpacked = unpack_sequences(frames, offsets)
+    assert [s.shape for s in unpacked] == [(0, 258), (4, 258), (0, 258), (2, 258)]
+    assert np.all(unpacked[3] == 0.5)
@@ -1,11 +1,14 @@
 # static_feature_extractor.py
-import cv2
 import os
-import numpy as np
-import mediapipe as mp
+import sys
+import time
+import argparse
 
-# Initialize MediaPipe Holistic model
-mp_holistic = mp.solutions.holistic
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Code', 'Common_Code'))
+from landmark_utils import HANDS_LAYOUT
+from extraction_pool import extract_images
+from landmark_backends import BACKEND_CHOICES, HOLISTIC_BACKEND, resolve_backend
+from feature_store import write_store, record_backend
 
 # --- Configuration ---
 # Input directory: Where the split IMAGE files are
@@ -14,79 +17,85 @@ SPLIT_IMAGE_DATA_PATH = '/Users/nahidkhan/Local Drive/Research/Dataset/Split_Ima
 # Output directory: Where the split FEATURE (.npy) files will be saved
 OUTPUT_FEATURE_DATA_PATH = '/Users/nahidkhan/Local Drive/Research/Dataset/02_Processed_Features_NPY'
 
-# --- Landmark Extraction Function for STATIC data ---
-def extract_landmarks_static(results):
+# Use MediaPipe Holistic
+# static_image_mode=True is better for processing individual image files
+HOLISTIC_KWARGS = dict(static_image_mode=True, min_detection_confidence=0.5)
+
+# --- Job Collection ---
+def collect_jobs(split_image_data_path, output_feature_data_path):
     """
-    Extracts landmarks ONLY for left and right hands (126 features total).
-    Fills with zeros if a hand is not detected.
+    Lists every (split, class_name, image_path, npy_path) job in the
+    train/val/test image splits and creates the matching output folders.
     """
-    lh = np.array([[res.x, res.y, res.z] for res in results.left_hand_landmarks.landmark]).flatten() if results.left_hand_landmarks else np.zeros(21*3)
-    rh = np.array([[res.x, res.y, res.z] for res in results.right_hand_landmarks.landmark]).flatten() if results.right_hand_landmarks else np.zeros(21*3)
-    return np.concatenate([lh, rh]) # Total 63 + 63 = 126 features
-
-# --- Main Execution ---
-if __name__ == "__main__":
-    print("Starting STATIC feature extraction process...")
-
-    os.makedirs(OUTPUT_FEATURE_DATA_PATH, exist_ok=True)
-
-    # Use MediaPipe Holistic
-    # static_image_mode=True is better for processing individual image files
-    with mp_holistic.Holistic(static_image_mode=True, min_detection_confidence=0.5) as holistic:
-
-        # Loop through train, val, test splits in the image directory
-        for split_part in ['train', 'val', 'test']:
-            split_image_path = os.path.join(SPLIT_IMAGE_DATA_PATH, split_part)
-            output_feature_split_path = os.path.join(OUTPUT_FEATURE_DATA_PATH, split_part)
-            os.makedirs(output_feature_split_path, exist_ok=True)
-
-            if not os.path.exists(split_image_path):
-                print(f"Warning: Split image directory '{split_image_path}' not found. Skipping.")
+    jobs = []
+    # Loop through train, val, test splits in the image directory
+    for split_part in ['train', 'val', 'test']:
+        split_image_path = os.path.join(split_image_data_path, split_part)
+        output_feature_split_path = os.path.join(output_feature_data_path, split_part)
+        os.makedirs(output_feature_split_path, exist_ok=True)
+
+        if not os.path.exists(split_image_path):
+            print(f"Warning: Split image directory '{split_image_path}' not found. Skipping.")
+            continue
+
+        print(f"\n--- Collecting '{split_part}' image set ---")
+
+        # Loop through each class in the split
+        for class_name in os.listdir(split_image_path):
+            class_image_path = os.path.join(split_image_path, class_name)
+            if not os.path.isdir(class_image_path):
                 continue
 
-            print(f"\n--- Processing '{split_part}' image set ---")
-
-            # Loop through each class in the split
-            for class_name in os.listdir(split_image_path):
-                class_image_path = os.path.join(split_image_path, class_name)
-                if not os.path.isdir(class_image_path):
-                    continue
-
-                print(f"  Processing class: '{class_name}'")
-
-                output_feature_class_path = os.path.join(output_feature_split_path, class_name)
-                os.makedirs(output_feature_class_path, exist_ok=True)
+            output_feature_class_path = os.path.join(output_feature_split_path, class_name)
+            os.makedirs(output_feature_class_path, exist_ok=True)
 
-                # Process each image file in the class folder
-                processed_count = 0
-                for file_name in os.listdir(class_image_path):
-                    if file_name.lower().endswith(('.png', '.jpg', '.jpeg')):
-                        image_file_path = os.path.join(class_image_path, file_name)
+            # Each image file maps to '<name>.npy' in the output class folder
+            class_jobs = []
+            for file_name in os.listdir(class_image_path):
+                if file_name.lower().endswith(('.png', '.jpg', '.jpeg')):
+                    npy_file_name = os.path.splitext(file_name)[0] + '.npy'
+                    class_jobs.append((split_part, class_name, os.path.join(class_image_path, file_name),
+                                       os.path.join(output_feature_class_path, npy_file_name)))
 
-                        # Read image
-                        frame = cv2.imread(image_file_path)
-                        if frame is None:
-                            print(f"    Warning: Could not read image {image_file_path}. Skipping.")
-                            continue
+            print(f"  Class '{class_name}': {len(class_jobs)} images")
+            jobs.extend(class_jobs)
+    return jobs
 
-                        # Convert BGR to RGB for MediaPipe
-                        image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+# --- Main Execution ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract 126 hand-landmark features from the split images.")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Number of worker processes, each with its own Holistic instance (1 = serial).")
+    parser.add_argument('--backend', choices=BACKEND_CHOICES, default=HOLISTIC_BACKEND,
+                        help="MediaPipe models to run (default Holistic, like the detectors); 'hands' / 'auto' run Hands alone "
+                             "and need a model trained on Hands features.")
+    parser.add_argument('--store', default=None,
+                        help="Write one packed feature store to this directory instead of per-image .npy files.")
+    args = parser.parse_args()
 
-                        # Process image to get landmarks
-                        results = holistic.process(image_rgb)
+    print("Starting STATIC feature extraction process...")
+    try:
+        record_backend(args.store or OUTPUT_FEATURE_DATA_PATH, resolve_backend(HANDS_LAYOUT, args.backend))
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
-                        # Extract only hand landmarks (126 features)
-                        keypoints = extract_landmarks_static(results)
+    os.makedirs(OUTPUT_FEATURE_DATA_PATH, exist_ok=True)
 
-                        # Define path to save .npy file
-                        npy_file_name = os.path.splitext(file_name)[0] + '.npy'
-                        npy_path = os.path.join(output_feature_class_path, npy_file_name)
+    jobs = collect_jobs(SPLIT_IMAGE_DATA_PATH, OUTPUT_FEATURE_DATA_PATH)
+    print(f"\nExtracting features for {len(jobs)} images with {max(args.workers, 1)} worker(s)...")
 
-                        # Save the features as .npy file
-                        np.save(npy_path, keypoints)
-                        processed_count += 1
+    start_time = time.time()
+    # With --store the vectors come back to this process instead of being saved one file each
+    image_jobs = [(image_path, None if args.store else npy_path) for _, _, image_path, npy_path in jobs]
+    processed_count, failed, features = extract_images(image_jobs, args.workers, HOLISTIC_KWARGS, HANDS_LAYOUT, args.backend)
+    for image_file_path in failed:
+        print(f"    Warning: Could not read image {image_file_path}. Skipping.")
 
-                print(f"    Extracted features for {processed_count} images.")
+    if args.store:
+        write_store(args.store, ((split_part, class_name, os.path.splitext(os.path.basename(image_path))[0], features[image_path])
+                                 for split_part, class_name, image_path, _ in jobs if image_path in features))
+    print(f"    Extracted features for {processed_count} images in {time.time() - start_time:.1f}s.")
 
     print("\nStatic feature extraction completed successfully!")
-    print(f"Feature files (.npy) are available in '{OUTPUT_FEATURE_DATA_PATH}'.")
\ No newline at end of file
+    print(f"Features are available in '{args.store or OUTPUT_FEATURE_DATA_PATH}'.")